@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Expense, Category, Budget
+from .models import Expense, ExpenseArchive, ExportJob, Category, Budget
+from .snapshots import refresh_category_snapshots
 
 
 @admin.register(Category)
@@ -8,6 +9,11 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ['user', 'created_at']
     search_fields = ['name', 'description']
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and {'name', 'color_code'} & set(form.changed_data):
+            refresh_category_snapshots(obj)
+
 
 @admin.register(Expense)
 class ExpenseAdmin(admin.ModelAdmin):
@@ -28,8 +34,38 @@ class ExpenseAdmin(admin.ModelAdmin):
         }),
     )
 
+@admin.register(ExpenseArchive)
+class ExpenseArchiveAdmin(admin.ModelAdmin):
+    list_display = ['title', 'user', 'category_name', 'amount', 'date', 'archived_at']
+    list_filter = ['date', 'archived_at']
+    search_fields = ['title', 'description', 'user__username', 'user__email']
+    date_hierarchy = 'date'
+
+    # Rows are moved by the archive_expenses / restore_archived_expenses
+    # commands, which keep the spending rollups consistent
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Budget)
 class BudgetAdmin(admin.ModelAdmin):
     list_display = ['user', 'month', 'budget_amount']
     list_filter = ['month']
     search_fields = ['user__username', 'user__email']
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'export_format', 'status', 'rows_written', 'created_at', 'finished_at']
+    list_filter = ['status', 'export_format', 'created_at']
+    search_fields = ['user__username', 'user__email']
+
+    # Jobs are queued through the API and run by the export worker
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,516 @@
+"""
+Shared aggregation layer for the dashboard and analytics views.
+Computes totals and counts for several date windows in a single SQL statement.
+
+The views read spending through a "spending source":
+
+- DatabaseSpendingSource answers every question with its own query against
+  the rollup tables (used by the standalone endpoints)
+- SpendingWindow loads a user's daily rollups and budgets for one window
+  once and answers every question in memory (used by the dashboard bundle)
+
+Both sources sum the integer-cents columns and return totals as ``int``
+cents (``total_cents`` / ``spent_cents``), so no Decimal is built or added
+per row; the views turn them into amounts with helpers.cents_to_float when
+building the response.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Count, DateField, Max, Min, Q, QuerySet, Sum
+from django.db.models.functions import Trunc
+
+from .helpers import month_end
+from .models import Budget, DailySpendingRollup, MonthlySpendingRollup
+
+
+# (start_date, end_date) - end_date of None means "no upper bound"
+Period = Tuple[date, Optional[date]]
+
+
+# =============================================================================
+# PERIOD AGGREGATION
+# =============================================================================
+
+def aggregate_periods(
+    queryset: QuerySet,
+    periods: Dict[str, Period],
+    date_field: str = 'date',
+    amount_field: str = 'amount',
+    count_field: Optional[str] = None,
+    empty_total: Any = Decimal('0'),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate totals and row counts for several date periods at once.
+
+    Every period becomes a filtered aggregate (SUM/COUNT ... FILTER (WHERE ...))
+    of the same statement, so the number of queries stays at one no matter
+    how many periods are requested. The queryset is narrowed to the widest
+    window first so the database only reads rows that can match a period.
+
+    Args:
+        queryset: Base queryset (already scoped to the user)
+        periods: Mapping of period name to (start_date, end_date), inclusive
+        date_field: Name of the date field to bucket on
+        amount_field: Name of the field to sum
+        count_field: Field holding pre-aggregated counts (e.g. on a rollup
+            table) - rows are counted when omitted
+        empty_total: Total of a period without rows (0 for cents fields)
+
+    Returns:
+        Dict mapping each period name to {"total": sum of amount_field, "count": int}
+    """
+    if not periods:
+        return {}
+
+    window, aggregates = _period_aggregates(queryset, periods, date_field, amount_field, count_field)
+    return _period_results(window.aggregate(**aggregates), periods, empty_total)
+
+
+def aggregate_periods_by(
+    queryset: QuerySet,
+    periods: Dict[str, Period],
+    group_by: Tuple[str, ...],
+    date_field: str = 'date',
+    amount_field: str = 'amount',
+    count_field: Optional[str] = None,
+    max_field: Optional[str] = None,
+    empty_total: Any = Decimal('0'),
+) -> List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]:
+    """
+    Like aggregate_periods, but per group (e.g. per category) - still one statement.
+
+    Args:
+        queryset: Base queryset (already scoped to the user)
+        periods: Mapping of period name to (start_date, end_date), inclusive
+        group_by: Fields to group on
+        date_field: Name of the date field to bucket on
+        amount_field: Name of the field to sum
+        count_field: Field holding pre-aggregated counts - rows are counted when omitted
+        max_field: Field whose maximum per period is reported as "max"
+        empty_total: Total of a period without rows (0 for cents fields)
+
+    Returns:
+        List of (group values, {period name: {"total", "count"[, "max"]}})
+        pairs, one per group with rows in the widest window
+    """
+    if not periods:
+        return []
+
+    window, aggregates = _period_aggregates(queryset, periods, date_field, amount_field, count_field, max_field)
+    rows = window.values(*group_by).annotate(**aggregates).order_by()
+
+    return [
+        ({field: row[field] for field in group_by}, _period_results(row, periods, empty_total, max_field))
+        for row in rows
+    ]
+
+
+def _period_aggregates(queryset, periods, date_field, amount_field, count_field, max_field=None):
+    """The queryset narrowed to the periods' widest window, and one filtered aggregate per period."""
+    window_start = min(start for start, _ in periods.values())
+    ends = [end for _, end in periods.values()]
+    window_end = None if any(end is None for end in ends) else max(ends)
+
+    window = {f'{date_field}__gte': window_start}
+    if window_end is not None:
+        window[f'{date_field}__lte'] = window_end
+
+    aggregates = {}
+    for name, (start, end) in periods.items():
+        bounds = {f'{date_field}__gte': start}
+        if end is not None:
+            bounds[f'{date_field}__lte'] = end
+        condition = Q(**bounds)
+        aggregates[f'{name}_total'] = Sum(amount_field, filter=condition)
+        if count_field:
+            aggregates[f'{name}_count'] = Sum(count_field, filter=condition)
+        else:
+            aggregates[f'{name}_count'] = Count('pk', filter=condition)
+        if max_field:
+            aggregates[f'{name}_max'] = Max(max_field, filter=condition)
+
+    return queryset.filter(**window), aggregates
+
+
+def _period_results(row, periods, empty_total, max_field=None):
+    """Per-period totals and counts from a row of filtered aggregates."""
+    results = {}
+    for name in periods:
+        results[name] = {
+            "total": row[f'{name}_total'] if row[f'{name}_total'] is not None else empty_total,
+            "count": row[f'{name}_count'] or 0,
+        }
+        if max_field:
+            results[name]["max"] = row[f'{name}_max']
+    return results
+
+
+def _cents_periods(totals: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Rename the "total" of aggregate_periods results summed over a cents field."""
+    return {
+        name: {"total_cents": period["total"], "count": period["count"]}
+        for name, period in totals.items()
+    }
+
+
+def aggregate_spending_periods(user, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate a user's spending per period from the daily rollup table.
+
+    Args:
+        user: The requesting user (anonymous users get empty totals)
+        periods: Mapping of period name to (start_date, end_date), inclusive
+
+    Returns:
+        Dict mapping each period name to {"total_cents": int, "count": int}
+    """
+    return _cents_periods(aggregate_periods(
+        daily_rollups_for(user), periods,
+        amount_field='total_cents', count_field='count', empty_total=0,
+    ))
+
+
+def aggregate_monthly_spending_periods(user, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate a user's spending per period from the monthly rollup table.
+
+    Periods are matched against the first day of each month, so they should
+    start on a month boundary.
+
+    Args:
+        user: The requesting user (anonymous users get empty totals)
+        periods: Mapping of period name to (start_month, end_month), inclusive
+
+    Returns:
+        Dict mapping each period name to {"total_cents": int, "count": int}
+    """
+    return _cents_periods(aggregate_periods(
+        monthly_rollups_for(user), periods,
+        date_field='month', amount_field='total_cents', count_field='count', empty_total=0,
+    ))
+
+
+def aggregate_spending_buckets(user, start: date, end: date, bucket: str) -> Dict[date, Dict[str, Any]]:
+    """
+    Aggregate a user's spending per bucket (day, week, month, quarter, year).
+
+    Buckets are formed in SQL with date truncation, so a multi-year range
+    returns one row per non-empty bucket. Month, quarter and year buckets
+    of a month-aligned range are summed from the monthly rollups; anything
+    else from the daily rollups. Empty buckets are not returned.
+
+    Args:
+        user: The requesting user (anonymous users get no buckets)
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: One of helpers.TREND_BUCKETS
+
+    Returns:
+        Dict mapping each non-empty bucket's first day to {"total_cents",
+        "count", "max_amount", "min_amount"}
+    """
+    month_aligned = start.day == 1 and end == month_end(end)
+    if bucket in ('month', 'quarter', 'year') and month_aligned:
+        rollups = monthly_rollups_for(user).filter(month__gte=start, month__lte=end)
+        date_field = 'month'
+    else:
+        rollups = daily_rollups_for(user).filter(date__gte=start, date__lte=end)
+        date_field = 'date'
+
+    rows = rollups.annotate(
+        bucket=Trunc(date_field, bucket, output_field=DateField())
+    ).values('bucket').annotate(
+        bucket_cents=Sum('total_cents'),
+        bucket_count=Sum('count'),
+        bucket_max=Max('max_amount'),
+        bucket_min=Min('min_amount'),
+    ).order_by('bucket')
+
+    return {
+        row['bucket']: {
+            "total_cents": row['bucket_cents'],
+            "count": row['bucket_count'],
+            "max_amount": row['bucket_max'],
+            "min_amount": row['bucket_min'],
+        }
+        for row in rows
+    }
+
+
+def daily_rollups_for(user) -> QuerySet:
+    """Daily rollup rows of a user (none for anonymous users)."""
+    if user.is_authenticated:
+        return DailySpendingRollup.objects.filter(user=user)
+    return DailySpendingRollup.objects.none()
+
+
+def monthly_rollups_for(user) -> QuerySet:
+    """Monthly rollup rows of a user (none for anonymous users)."""
+    if user.is_authenticated:
+        return MonthlySpendingRollup.objects.filter(user=user)
+    return MonthlySpendingRollup.objects.none()
+
+
+def budgets_for(user) -> QuerySet:
+    """Budgets of a user (none for anonymous users)."""
+    if user.is_authenticated:
+        return Budget.objects.filter(user=user)
+    return Budget.objects.none()
+
+
+# =============================================================================
+# SPENDING SOURCES
+# =============================================================================
+
+class DatabaseSpendingSource:
+    """Spending source that runs one rollup query per question."""
+
+    def __init__(self, user):
+        self.user = user
+
+    def period_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Totals and counts per period, from the daily rollups."""
+        return aggregate_spending_periods(self.user, periods)
+
+    def month_period_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Totals and counts per month-aligned period, from the monthly rollups."""
+        return aggregate_monthly_spending_periods(self.user, periods)
+
+    def budget_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Budget totals and counts per month-aligned period."""
+        return _cents_periods(aggregate_periods(
+            budgets_for(self.user), periods,
+            date_field='month', amount_field='budget_amount_cents', empty_total=0,
+        ))
+
+    def category_totals(self, start: date, end: Optional[date], limit: int) -> List[Dict[str, Any]]:
+        """Spending per category between two dates, largest first."""
+        rollups = daily_rollups_for(self.user).filter(date__gte=start)
+        if end is not None:
+            rollups = rollups.filter(date__lte=end)
+
+        return list(rollups.values(
+            'category__id', 'category__name', 'category__color_code'
+        ).annotate(
+            spent_cents=Sum('total_cents'),
+            transactions=Sum('count'),
+            largest=Max('max_amount')
+        ).order_by('-spent_cents')[:limit])
+
+    def period_category_totals(
+        self, periods: Dict[str, Period], category_period: str, limit: int
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Totals per period and the largest categories of one of them, in one query.
+
+        The rollups are grouped by category with a filtered total per
+        period; the period totals are the sums over the categories.
+        """
+        groups = aggregate_periods_by(
+            daily_rollups_for(self.user), periods,
+            group_by=('category__id', 'category__name', 'category__color_code'),
+            amount_field='total_cents', count_field='count', max_field='max_amount', empty_total=0,
+        )
+
+        totals = {
+            name: {
+                "total_cents": sum(results[name]["total"] for _, results in groups),
+                "count": sum(results[name]["count"] for _, results in groups),
+            }
+            for name in periods
+        }
+        categories = sorted(
+            (
+                {
+                    **category,
+                    "spent_cents": results[category_period]["total"],
+                    "transactions": results[category_period]["count"],
+                    "largest": results[category_period]["max"],
+                }
+                for category, results in groups if results[category_period]["count"]
+            ),
+            key=lambda category: category['spent_cents'],
+            reverse=True,
+        )
+        return totals, categories[:limit]
+
+    def day_totals(self, start: date, end: date) -> Dict[date, Dict[str, Any]]:
+        """Spending per day with any spending between two dates."""
+        rows = daily_rollups_for(self.user).filter(
+            date__gte=start, date__lte=end,
+        ).values('date').annotate(
+            spent_cents=Sum('total_cents'),
+            transactions=Sum('count'),
+        ).order_by('date')
+        return {
+            row['date']: {"total_cents": row['spent_cents'], "count": row['transactions']}
+            for row in rows
+        }
+
+    def category_month_totals(self, start_month: date, end_month: date) -> List[Dict[str, Any]]:
+        """Spending per (category, month) between two months, from the monthly rollups."""
+        return list(monthly_rollups_for(self.user).filter(
+            month__gte=start_month, month__lte=end_month,
+        ).values(
+            'category__id', 'category__name', 'category__color_code', 'month'
+        ).annotate(
+            spent_cents=Sum('total_cents'),
+        ).order_by())
+
+    def month_totals(self, start_month: date) -> List[Dict[str, Any]]:
+        """Spending per month from a month onwards, oldest first."""
+        return list(monthly_rollups_for(self.user).filter(
+            month__gte=start_month,
+        ).values('month').annotate(
+            spent_cents=Sum('total_cents'),
+            transactions=Sum('count'),
+            max_expense=Max('max_amount'),
+            min_expense=Min('min_amount')
+        ).order_by('month'))
+
+
+class SpendingWindow:
+    """
+    Spending source backed by one pass over a user's data.
+
+    The daily rollups and budgets from ``start`` onwards are loaded with one
+    query each, the first time they are needed. Every question is then
+    answered in memory, so any number of dashboard sections costs the same
+    two queries. Questions about dates before ``start`` are a programming
+    error and raise ValueError.
+    """
+
+    def __init__(self, user, start: date):
+        self.user = user
+        self.start = start
+        self._rows = None
+        self._budgets = None
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        if self._rows is None:
+            self._rows = list(daily_rollups_for(self.user).filter(date__gte=self.start).values(
+                'date', 'category__id', 'category__name', 'category__color_code',
+                'total_cents', 'count', 'min_amount', 'max_amount',
+            ))
+        return self._rows
+
+    @property
+    def budgets(self) -> List[Dict[str, Any]]:
+        if self._budgets is None:
+            self._budgets = list(budgets_for(self.user).filter(
+                month__gte=self.start.replace(day=1)
+            ).values('month', 'budget_amount_cents'))
+        return self._budgets
+
+    def _check(self, start: date) -> None:
+        if start < self.start:
+            raise ValueError(f"{start} is outside the loaded window starting {self.start}")
+
+    @staticmethod
+    def _in_period(day: date, start: date, end: Optional[date]) -> bool:
+        return start <= day and (end is None or day <= end)
+
+    def _totals(self, items, periods, date_key, amount_key, count_key=None):
+        result = {}
+        for name, (start, end) in periods.items():
+            self._check(start)
+            matching = [item for item in items if self._in_period(item[date_key], start, end)]
+            result[name] = {
+                "total_cents": sum(item[amount_key] for item in matching),
+                "count": sum(item[count_key] for item in matching) if count_key else len(matching),
+            }
+        return result
+
+    def period_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Totals and counts per period."""
+        return self._totals(self.rows, periods, 'date', 'total_cents', 'count')
+
+    def month_period_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Totals and counts per month-aligned period."""
+        return self.period_totals(periods)
+
+    def period_category_totals(
+        self, periods: Dict[str, Period], category_period: str, limit: int
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """Totals per period and the largest categories of one of them."""
+        start, end = periods[category_period]
+        return self.period_totals(periods), self.category_totals(start, end, limit)
+
+    def budget_totals(self, periods: Dict[str, Period]) -> Dict[str, Dict[str, Any]]:
+        """Budget totals and counts per month-aligned period."""
+        for start, _ in periods.values():
+            self._check(start.replace(day=1))
+        return self._totals(self.budgets, periods, 'month', 'budget_amount_cents')
+
+    def category_totals(self, start: date, end: Optional[date], limit: int) -> List[Dict[str, Any]]:
+        """Spending per category between two dates, largest first."""
+        self._check(start)
+        groups = {}
+        for row in self.rows:
+            if not self._in_period(row['date'], start, end):
+                continue
+            group = groups.setdefault(row['category__id'], {
+                "category__id": row['category__id'],
+                "category__name": row['category__name'],
+                "category__color_code": row['category__color_code'],
+                "spent_cents": 0,
+                "transactions": 0,
+                "largest": row['max_amount'],
+            })
+            group['spent_cents'] += row['total_cents']
+            group['transactions'] += row['count']
+            group['largest'] = max(group['largest'], row['max_amount'])
+
+        return sorted(groups.values(), key=lambda group: group['spent_cents'], reverse=True)[:limit]
+
+    def day_totals(self, start: date, end: date) -> Dict[date, Dict[str, Any]]:
+        """Spending per day with any spending between two dates."""
+        self._check(start)
+        days = {}
+        for row in self.rows:
+            if self._in_period(row['date'], start, end):
+                day = days.setdefault(row['date'], {"total_cents": 0, "count": 0})
+                day['total_cents'] += row['total_cents']
+                day['count'] += row['count']
+        return dict(sorted(days.items()))
+
+    def category_month_totals(self, start_month: date, end_month: date) -> List[Dict[str, Any]]:
+        """Spending per (category, month) between two months."""
+        self._check(start_month)
+        cells = {}
+        for row in self.rows:
+            month = row['date'].replace(day=1)
+            if not self._in_period(month, start_month, end_month):
+                continue
+            cell = cells.setdefault((row['category__id'], month), {
+                "category__id": row['category__id'],
+                "category__name": row['category__name'],
+                "category__color_code": row['category__color_code'],
+                "month": month,
+                "spent_cents": 0,
+            })
+            cell['spent_cents'] += row['total_cents']
+        return list(cells.values())
+
+    def month_totals(self, start_month: date) -> List[Dict[str, Any]]:
+        """Spending per month from a month onwards, oldest first."""
+        self._check(start_month)
+        months = defaultdict(list)
+        for row in self.rows:
+            if row['date'] >= start_month:
+                months[row['date'].replace(day=1)].append(row)
+
+        return [
+            {
+                "month": month,
+                "spent_cents": sum(row['total_cents'] for row in rows),
+                "transactions": sum(row['count'] for row in rows),
+                "max_expense": max(row['max_amount'] for row in rows),
+                "min_expense": min(row['min_amount'] for row in rows),
+            }
+            for month, rows in sorted(months.items())
+        ]
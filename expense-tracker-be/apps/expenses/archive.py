@@ -0,0 +1,168 @@
+"""
+Cold-storage archive of old expenses.
+
+Expenses dated before a cutoff (settings.EXPENSE_ARCHIVE_AFTER_DAYS, applied
+by the archive_expenses command) are moved in batches from expenses_expense
+to expenses_expensearchive, so the live table and its indexes only hold the
+years that are still read day to day. Rows keep their ID and timestamps.
+
+The move bypasses the model signals: the spending rollups keep counting
+archived expenses, so dashboards, analytics and budget alerts don't change.
+Exports reaching into an archived date range read both tables (see
+export_rows.py), and restore_expenses moves rows back.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .db_routing import pin_reads_to_primary
+from .models import Expense, ExpenseArchive
+from .search import refresh_search_vectors
+
+
+# Fields copied between the live and the archive table
+ARCHIVED_FIELDS = [
+    'id', 'user', 'category', 'category_name', 'category_color',
+    'title', 'normalized_title', 'amount', 'amount_cents', 'date',
+    'description', 'is_recurring', 'recurring_frequency', 'created_at', 'updated_at',
+]
+
+
+def archive_cutoff(today: Optional[date] = None) -> date:
+    """First date that stays live; expenses dated before it can be archived."""
+    return (today or date.today()) - timedelta(days=settings.EXPENSE_ARCHIVE_AFTER_DAYS)
+
+
+# =============================================================================
+# MOVING ROWS
+# =============================================================================
+
+def _copy_rows(source_model, target_model, ids: List[int], extra: Optional[Dict[str, object]] = None) -> None:
+    """INSERT ... SELECT rows between the tables, so nothing is re-read into Python."""
+    quote = connection.ops.quote_name
+    columns = [source_model._meta.get_field(name).column for name in ARCHIVED_FIELDS]
+    extra = extra or {}
+    target_columns = columns + [target_model._meta.get_field(name).column for name in extra]
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    sql = (
+        f"INSERT INTO {quote(target_model._meta.db_table)} "
+        f"({', '.join(quote(column) for column in target_columns)}) "
+        f"SELECT {', '.join([quote(column) for column in columns] + ['%s'] * len(extra))} "
+        f"FROM {quote(source_model._meta.db_table)} "
+        f"WHERE {quote(source_model._meta.pk.column)} IN ({placeholders})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*extra.values(), *ids])
+
+
+def _delete_rows(model, ids: List[int]) -> None:
+    """DELETE the moved rows by primary key with a plain statement."""
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} "
+            f"WHERE {quote(model._meta.pk.column)} IN ({placeholders})",
+            ids,
+        )
+
+
+def _move_rows(source_model, target_model, rows: QuerySet, batch_size: int, extra=None) -> int:
+    """
+    Move rows to the other table in batches, one transaction per batch.
+
+    Args:
+        source_model: Model the rows are in (Expense or ExpenseArchive)
+        target_model: Model the rows move to
+        rows: Queryset of source_model selecting the rows
+        batch_size: Rows per batch
+        extra: Additional target column values (e.g. archived_at)
+
+    Returns:
+        int: Number of rows moved
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                rows.order_by('id').select_for_update().values_list('id', 'user_id')[:batch_size]
+            )
+            if not batch:
+                break
+            ids = [expense_id for expense_id, _ in batch]
+            # Copy and delete commit together. Neither sends model signals,
+            # which is intended: the rollups must keep counting the moved
+            # rows (an expense changes tables, not totals), and the
+            # delete-time cache invalidation is done once per user below
+            _copy_rows(source_model, target_model, ids, extra)
+            _delete_rows(source_model, ids)
+
+        # Recent and top expense lists read the live table, so cached
+        # payloads of the owners are stale
+        for user_id in {user_id for _, user_id in batch}:
+            bump_data_version(user_id)
+            pin_reads_to_primary(user_id)
+        moved += len(batch)
+
+    return moved
+
+
+def archive_expenses(before: date, user_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """
+    Move expenses dated before a cutoff to the archive table.
+
+    Args:
+        before: Expenses dated before this date are archived
+        user_id: Only archive this user's expenses (all users if None)
+        batch_size: Rows per batch
+
+    Returns:
+        int: Number of expenses archived
+    """
+    rows = Expense.objects.filter(date__lt=before)
+    if user_id is not None:
+        rows = rows.filter(user_id=user_id)
+    return _move_rows(Expense, ExpenseArchive, rows, batch_size, extra={'archived_at': timezone.now()})
+
+
+def restore_expenses(
+    user_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Move archived expenses back to the live table.
+
+    Args:
+        user_id: Only restore this user's expenses (all users if None)
+        start: Only restore expenses dated on or after this date
+        end: Only restore expenses dated on or before this date
+        batch_size: Rows per batch
+
+    Returns:
+        int: Number of expenses restored
+    """
+    rows = ExpenseArchive.objects.all()
+    if user_id is not None:
+        rows = rows.filter(user_id=user_id)
+    if start is not None:
+        rows = rows.filter(date__gte=start)
+    if end is not None:
+        rows = rows.filter(date__lte=end)
+    restored = _move_rows(ExpenseArchive, Expense, rows, batch_size)
+
+    # The archive doesn't store search vectors
+    if restored:
+        live = Expense.objects.filter(search_vector__isnull=True)
+        if user_id is not None:
+            live = live.filter(user_id=user_id)
+        refresh_search_vectors(live)
+    return restored
+
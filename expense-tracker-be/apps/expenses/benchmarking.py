@@ -0,0 +1,211 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks run against a throwaway user seeded with synthetic expenses, so
+they can be pointed at any database (including a copy of production) and
+clean up after themselves.
+"""
+import glob
+import os
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from django.contrib.auth import get_user_model
+
+from .helpers import normalize_title
+from .models import Budget, Category, Expense
+from .rollups import rebuild_rollups
+from .search import refresh_search_vectors
+from .snapshots import snapshot_of
+
+User = get_user_model()
+
+BENCHMARK_CATEGORIES = ['Housing', 'Food', 'Transport', 'Utilities', 'Health', 'Leisure']
+BENCHMARK_TITLES = ['Groceries', 'Coffee', 'Rent', 'Fuel', 'Electricity', 'Pharmacy', 'Cinema', 'Lunch']
+# Description words; the rarer ones make selective search terms
+BENCHMARK_WORDS = (
+    ['weekly', 'monthly', 'shared', 'office', 'family', 'online', 'cash', 'card'] * 20
+    + ['anniversary', 'conference', 'plumber', 'veterinary', 'birthday', 'souvenir']
+)
+
+
+def seed_benchmark_user(expenses: int, days: int = 365, seed: int = 0):
+    """
+    Create a user with synthetic categories, budgets and expenses.
+
+    Expenses are bulk inserted (no save() or signals), so their normalized
+    titles, cents and category snapshots are set here, and the spending rollups and search
+    vectors are rebuilt afterwards.
+
+    Args:
+        expenses: Number of expenses to create
+        days: Spread the expenses over this many days up to today
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        User: The seeded user (delete it to clean up)
+    """
+    rng = random.Random(seed)
+    suffix = uuid.uuid4().hex[:8]
+    user = User.objects.create_user(
+        username=f'benchmark-{suffix}',
+        email=f'benchmark-{suffix}@example.com',
+        password=uuid.uuid4().hex,
+    )
+
+    categories = [
+        Category.objects.create(user=user, name=name)
+        for name in BENCHMARK_CATEGORIES
+    ]
+
+    today = date.today()
+    month = today.replace(day=1)
+    for _ in range(max(days // 30, 1)):
+        Budget.objects.create(user=user, month=month, budget_amount=Decimal('3000.00'))
+        month = (month - timedelta(days=1)).replace(day=1)
+
+    titles = [(title, normalize_title(title)) for title in BENCHMARK_TITLES]
+    Expense.objects.bulk_create(
+        (
+            Expense(
+                user=user,
+                category=category,
+                **snapshot_of(category),
+                title=title,
+                normalized_title=normalized_title,
+                description=' '.join(rng.sample(BENCHMARK_WORDS, 3)),
+                amount=Decimal(cents) / 100,
+                amount_cents=cents,
+                date=today - timedelta(days=rng.randrange(days)),
+                is_recurring=rng.random() < 0.05,
+                recurring_frequency='monthly',
+            )
+            for (title, normalized_title), cents, category in (
+                (rng.choice(titles), rng.randint(100, 50000), rng.choice(categories + [None]))
+                for _ in range(expenses)
+            )
+        ),
+        batch_size=1000,
+    )
+    rebuild_rollups(user_id=user.pk)
+    refresh_search_vectors(Expense.objects.filter(user=user))
+    return user
+
+
+def time_call(
+    func: Callable[[], Any],
+    iterations: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, float]:
+    """
+    Time repeated calls of a function.
+
+    Args:
+        func: Callable taking no arguments
+        iterations: Number of timed calls
+        warmup: Untimed calls made first
+        setup: Optional callable run (untimed) before every call
+
+    Returns:
+        Dict with the median, p95, p99, min and max call time in milliseconds
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "median": statistics.median(timings),
+        "p95": _percentile(timings, 0.95),
+        "p99": _percentile(timings, 0.99),
+        "min": timings[0],
+        "max": timings[-1],
+    }
+
+
+def _percentile(timings, fraction: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def format_timing(label: str, timing: Dict[str, float]) -> str:
+    """One aligned report line for a time_call result."""
+    return (
+        f"{label:<32} median {timing['median']:8.2f} ms   p95 {timing['p95']:8.2f} ms   "
+        f"p99 {timing['p99']:8.2f} ms   min {timing['min']:8.2f} ms   max {timing['max']:8.2f} ms"
+    )
+
+
+def _rss_bytes(pid) -> int:
+    with open(f'/proc/{pid}/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _process_tree_rss() -> int:
+    """Resident memory of this process and its child processes (e.g. render workers)."""
+    pids = [os.getpid()]
+    for path in glob.glob(f'/proc/{os.getpid()}/task/*/children'):
+        with open(path) as children:
+            pids.extend(children.read().split())
+
+    total = 0
+    for pid in pids:
+        try:
+            total += _rss_bytes(pid)
+        except (FileNotFoundError, ProcessLookupError):
+            pass  # Exited in the meantime
+    return total
+
+
+class PeakRss:
+    """
+    Sample the resident memory of this process tree while the block runs.
+
+    ru_maxrss only reports the lifetime high-water mark, which says nothing
+    about the second of several runs, so RSS is polled from /proc instead.
+    `peak` is the highest RSS seen, `growth` how far it rose above the RSS
+    at the start; both stay None where /proc isn't available.
+
+    Args:
+        interval: Seconds between samples
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = self.growth = None
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _process_tree_rss())
+
+    def __enter__(self):
+        if not os.path.exists(f'/proc/{os.getpid()}/statm'):
+            return self
+        self._start = self.peak = _process_tree_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.peak is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _process_tree_rss())
+        self.growth = self.peak - self._start
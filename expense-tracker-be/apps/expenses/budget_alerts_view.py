@@ -1,124 +1,127 @@
 from datetime import date, timedelta
 from calendar import monthrange
+from typing import Optional
 
-from django.db.models import Sum
 from rest_framework.views import APIView
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework import status
 
-from .models import Expense, Budget
-from .helpers import success_response, error_response, safe_float, safe_round, calculate_percentage
+from .aggregations import DatabaseSpendingSource
+from .cache import cached_analytics
+from .concurrency import run_concurrently
+from .db_routing import ReplicaReadMixin
+from .helpers import success_payload, error_response, safe_float, safe_round, calculate_percentage, cents_to_float
 from .budget_alert_serializers import BudgetAlertResponseSerializer
 
 
-class BudgetAlertsView(APIView):
+def build_budget_alerts(
+    source,
+    today: Optional[date] = None,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    Build the budget alerts payload.
+
+    Args:
+        source: Spending source covering at least the current year
+        today: Reference date (defaults to today)
+        max_workers: Pool size for the concurrent fetch (see run_concurrently)
+
+    Returns:
+        dict: Response body of the budget alerts endpoint
+    """
+    today = today or date.today()
+
+    # === DATE RANGES ===
+    # Month
+    start_of_month = today.replace(day=1)
+    days_in_month = monthrange(today.year, today.month)[1]
+    
+    # Week (Start Monday)
+    start_of_week = today - timedelta(days=today.weekday())
+    
+    # Year
+    start_of_year = today.replace(month=1, day=1)
+    end_of_year = today.replace(month=12, day=31)
+
+    # === FETCH EXPENSES & BUDGET (concurrently) ===
+    # Today and this week come from the daily rollups, this month and
+    # this year from the (at most 12 rows per category) monthly rollups.
+    # The current month's budget and the sum of this year's budgets
+    # share one query as well (Budget.month is the first day of a month)
+    fetched = run_concurrently({
+        "daily": lambda: source.period_totals({
+            "today": (today, today),
+            "week": (start_of_week, None),
+        }),
+        "monthly": lambda: source.month_period_totals({
+            "month": (start_of_month, None),
+            "year": (start_of_year, None),
+        }),
+        "budget": lambda: source.budget_totals({
+            "month": (start_of_month, start_of_month),
+            "year": (start_of_year, end_of_year),
+        }),
+    }, max_workers=max_workers)
+    daily_totals = fetched["daily"]
+    monthly_totals = fetched["monthly"]
+    budget_totals = fetched["budget"]
+    exp_today = cents_to_float(daily_totals["today"]["total_cents"])
+    exp_week = cents_to_float(daily_totals["week"]["total_cents"])
+    exp_month = cents_to_float(monthly_totals["month"]["total_cents"])
+    exp_year = cents_to_float(monthly_totals["year"]["total_cents"])
+
+    monthly_budget_val = cents_to_float(budget_totals["month"]["total_cents"])
+
+    # === CALCULATE BUDGETS ===
+    # Daily: Month / Days in month
+    daily_budget = monthly_budget_val / days_in_month if days_in_month else 0
+    
+    # Weekly: Month / 4.3 (approx weeks in month)
+    weekly_budget = monthly_budget_val / 4.3
+    
+    # Yearly: sum of the actual monthly budgets set for this year
+    yearly_budget_val = cents_to_float(budget_totals["year"]["total_cents"])
+
+
+    # === CONSTRUCT RESPONSE DATA ===
+    def build_period_data(label, expense, budget):
+        exp_val = safe_float(expense)
+        bud_val = safe_float(budget)
+        return {
+            "period": label,
+            "expense": safe_round(exp_val),
+            "budget": safe_round(bud_val),
+            "percentage_consumed": calculate_percentage(exp_val, bud_val),
+            "status": "over_budget" if exp_val > bud_val else "within_budget"
+        }
+
+    data = {
+        "day": build_period_data("Today", exp_today, daily_budget),
+        "week": build_period_data("This Week", exp_week, weekly_budget),
+        "month": build_period_data("This Month", exp_month, monthly_budget_val),
+        "year": build_period_data("This Year", exp_year, yearly_budget_val)
+    }
+
+    # Use Serializer to validate/format the response structure
+    serializer = BudgetAlertResponseSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    
+    return success_payload(data=serializer.data)
+
+
+class BudgetAlertsView(ReplicaReadMixin, APIView):
     """
     Budget Alerts & Usage View
     Returns expense vs budget analysis for Day, Week, Month, and Year.
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    @cached_analytics
     def get(self, request):
         try:
-            today = date.today()
-            user = request.user if request.user.is_authenticated else None
-
-            # === DATE RANGES ===
-            # Month
-            start_of_month = today.replace(day=1)
-            days_in_month = monthrange(today.year, today.month)[1]
-            
-            # Week (Start Monday)
-            start_of_week = today - timedelta(days=today.weekday())
-            
-            # Year
-            start_of_year = today.replace(month=1, day=1)
-
-            # === FETCH EXPENSES ===
-            # We fetch all expenses for the year to filter in memory or DB
-            # Use filter(user=user) if you want to restrict to logged-in user only
-            # but per current pattern in views.py, we might show all for demo unless auth
-            
-            if user:
-                base_qs = Expense.objects.filter(user=user)
-            else:
-                base_qs = Expense.objects.none()
-
-            # Aggregates
-            # 1. Today
-            exp_today = base_qs.filter(date=today).aggregate(t=Sum('amount'))['t'] or 0
-            
-            # 2. This Week
-            exp_week = base_qs.filter(date__gte=start_of_week).aggregate(t=Sum('amount'))['t'] or 0
-            
-            # 3. This Month
-            exp_month = base_qs.filter(date__gte=start_of_month).aggregate(t=Sum('amount'))['t'] or 0
-            
-            # 4. This Year
-            exp_year = base_qs.filter(date__gte=start_of_year).aggregate(t=Sum('amount'))['t'] or 0
-
-            # === FETCH BUDGET ===
-            # We get the budget for the CURRENT month to derive others
-            if user:
-                budget_qs = Budget.objects.filter(month=start_of_month, user=user)
-            else:
-                budget_qs = Budget.objects.none()
-            
-            # If multiple budgets exist (e.g. multiple users), for demo we just sum them 
-            # or take the first if specific user. 
-            # Assuming one budget per user per month.
-            total_monthly_budget = budget_qs.aggregate(t=Sum('budget_amount'))['t'] or 0
-            monthly_budget_val = safe_float(total_monthly_budget)
-
-            # === CALCULATE BUDGETS ===
-            # Daily: Month / Days in month
-            daily_budget = monthly_budget_val / days_in_month if days_in_month else 0
-            
-            # Weekly: Month / 4.3 (approx weeks in month)
-            weekly_budget = monthly_budget_val / 4.3
-            
-            # Yearly: We can either try to sum all monthly budgets for the year 
-            # OR project the current one * 12. 
-            # Let's try to fetch actual budgets for the year for accuracy.
-            year_budgets_qs = Budget.objects.filter(month__year=today.year)
-            if user:
-                year_budgets_qs = year_budgets_qs.filter(user=user)
-            total_yearly_budget = year_budgets_qs.aggregate(t=Sum('budget_amount'))['t'] or 0
-            
-            # If no yearly budget found yet (maybe only current month set), project it?
-            # User asked for "percentage consumed response". 
-            # If yearly budget is 0, we can't calc percentage. 
-            # Fallback: if total_yearly_budget is 0 but we have monthly, project it? 
-            # Let's stick to actual data first.
-            yearly_budget_val = safe_float(total_yearly_budget)
-
-
-            # === CONSTRUCT RESPONSE DATA ===
-            def build_period_data(label, expense, budget):
-                exp_val = safe_float(expense)
-                bud_val = safe_float(budget)
-                return {
-                    "period": label,
-                    "expense": safe_round(exp_val),
-                    "budget": safe_round(bud_val),
-                    "percentage_consumed": calculate_percentage(exp_val, bud_val),
-                    "status": "over_budget" if exp_val > bud_val else "within_budget"
-                }
-
-            data = {
-                "day": build_period_data("Today", exp_today, daily_budget),
-                "week": build_period_data("This Week", exp_week, weekly_budget),
-                "month": build_period_data("This Month", exp_month, monthly_budget_val),
-                "year": build_period_data("This Year", exp_year, yearly_budget_val)
-            }
-
-            # Use Serializer to validate/format the response structure
-            serializer = BudgetAlertResponseSerializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            
-            return success_response(
-                data=serializer.data
-            )
+            return Response(build_budget_alerts(DatabaseSpendingSource(request.user)))
 
         except Exception as e:
             return error_response(
@@ -0,0 +1,218 @@
+"""
+Per-user analytics response cache.
+
+Cached payloads are keyed on a per-user data version. The version is bumped
+(see signals.py) once a write of one of the user's expenses, budgets or
+categories commits, so a cached payload is never served after the data it
+was computed from has changed.
+
+Payloads can live in a process-local LRU cache, since their keys embed the
+version. The versions (and the replica pins of db_routing.py) live in a
+separate state cache that every API process shares and that never evicts.
+With a process-local state cache and several workers
+(settings.ANALYTICS_CACHE_ENABLED is False) responses are not cached.
+"""
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# =============================================================================
+# DATA VERSION
+# =============================================================================
+
+def get_analytics_cache():
+    """Return the cache backend used for analytics payloads."""
+    return caches[settings.ANALYTICS_CACHE_ALIAS]
+
+
+def get_state_cache():
+    """Return the shared, non-evicting cache holding data versions and replica pins."""
+    return caches[settings.ANALYTICS_STATE_CACHE_ALIAS]
+
+
+def clear_analytics_cache() -> None:
+    """Forget every cached payload, data version and replica pin."""
+    get_analytics_cache().clear()
+    get_state_cache().clear()
+
+
+def _version_key(user_id: int) -> str:
+    return f'analytics:version:{user_id}'
+
+
+def get_data_version(user_id: int) -> int:
+    """
+    Get the current data version for a user.
+
+    A missing version (never set, or lost with the state cache) is seeded
+    with a nanosecond timestamp, so it can never collide with a version that older
+    cached payloads were stored under.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        int: Current data version
+    """
+    cache = get_state_cache()
+    key = _version_key(user_id)
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id: int) -> None:
+    """
+    Invalidate every cached analytics payload of a user.
+
+    Args:
+        user_id: ID of the user whose data changed
+    """
+    cache = get_state_cache()
+    key = _version_key(user_id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Version not in cache - seeding a fresh one invalidates just the same
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+# =============================================================================
+# RESPONSE CACHING
+# =============================================================================
+
+def analytics_cache_key(request) -> str:
+    """
+    Build the cache key for an analytics request.
+
+    The key covers the user, their data version, the current date (periods
+    such as "today" and "this week" move at midnight) and the request path
+    with its sorted query parameters.
+
+    Args:
+        request: DRF request of an authenticated user
+
+    Returns:
+        str: Cache key
+    """
+    user_id = request.user.pk
+    params = sorted(request.query_params.lists())
+    fingerprint = hashlib.sha1(f'{request.path}?{params}'.encode()).hexdigest()
+    return f'analytics:{user_id}:{get_data_version(user_id)}:{date.today()}:{fingerprint}'
+
+
+def user_data_etag(request) -> str:
+    """
+    Strong ETag for a request, derived from the same inputs as the cache key.
+
+    Args:
+        request: DRF request of an authenticated user
+
+    Returns:
+        str: Quoted ETag value
+    """
+    return _etag_for_key(analytics_cache_key(request))
+
+
+def _etag_for_key(key: str) -> str:
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    return '*' in candidates or etag in (tag.removeprefix('W/') for tag in candidates)
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+def conditional_on_user_data(view_method: Callable) -> Callable:
+    """
+    Answer conditional GETs of an APIView handler from the user's data version.
+
+    A matching If-None-Match returns 304 Not Modified before the handler
+    runs, so no query or serialization happens. Successful responses carry
+    the ETag. Without a cache shared by every worker
+    (settings.ANALYTICS_CACHE_ENABLED is False) the version could be stale,
+    so no ETag is issued or honoured.
+
+    Args:
+        view_method: The view handler (e.g. ``list``) to wrap
+
+    Returns:
+        Callable: The wrapped handler
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if not request.user.is_authenticated or not settings.ANALYTICS_CACHE_ENABLED:
+            return view_method(self, request, *args, **kwargs)
+
+        etag = user_data_etag(request)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    return wrapper
+
+
+def cached_analytics(view_method: Callable) -> Callable:
+    """
+    Cache the successful responses of an APIView handler per user.
+
+    Conditional GETs are answered with 304 Not Modified before the cache is
+    even consulted. Anonymous requests and error responses are never cached,
+    and nothing is while settings.ANALYTICS_CACHE_ENABLED is False.
+
+    Args:
+        view_method: The view handler (e.g. ``get``) to wrap
+
+    Returns:
+        Callable: The wrapped handler
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if not request.user.is_authenticated or not settings.ANALYTICS_CACHE_ENABLED:
+            return view_method(self, request, *args, **kwargs)
+
+        cache = get_analytics_cache()
+        key = analytics_cache_key(request)
+        etag = _etag_for_key(key)
+
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+
+        payload = cache.get(key)
+        if payload is not None:
+            response = Response(payload)
+        else:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout=settings.ANALYTICS_CACHE_TIMEOUT)
+
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    return wrapper
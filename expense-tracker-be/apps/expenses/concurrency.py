@@ -0,0 +1,105 @@
+"""
+Concurrent execution of independent dashboard queries.
+
+DRF's APIView handlers are synchronous, and Django's async ORM still runs
+each query in a thread (sync_to_async), so the dashboard overlaps its
+independent queries with a bounded thread pool instead. Every worker uses
+its own database connection, so wall-clock time approaches that of the
+slowest query rather than the sum of all of them. Those connections are
+persistent like the request threads' ones (settings CONN_MAX_AGE).
+"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+# =============================================================================
+# THREAD POOL
+# =============================================================================
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    # One process-wide pool per size bounds the extra database connections
+    # no matter how many requests run at once
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='dashboard-query',
+            )
+            _executors[max_workers] = executor
+        return executor
+
+
+def _run_in_worker(task: Callable[[], Any]) -> Any:
+    # Pool threads outlive the request, so the request_started/finished
+    # signals never reach their connections. Mirror them here: drop
+    # connections past CONN_MAX_AGE or broken by an error, keep the rest
+    # (health-checked on next use) so workers don't reconnect per task
+    close_old_connections()
+    _worker_state.active = True
+    try:
+        return task()
+    finally:
+        _worker_state.active = False
+        close_old_connections()
+
+
+def can_run_concurrently() -> bool:
+    """
+    Whether queries may run on other threads' connections right now.
+
+    Other connections can't see rows written inside an open transaction
+    (including the one every TestCase runs in), and SQLite serializes
+    access anyway, so both cases run sequentially. So do tasks started
+    from a pool worker, which could otherwise wait on a saturated pool.
+
+    Returns:
+        bool: True if tasks may be spread over the pool
+    """
+    return (
+        not getattr(_worker_state, 'active', False)
+        and not connection.in_atomic_block
+        and connection.vendor != 'sqlite'
+    )
+
+
+def run_concurrently(
+    tasks: Dict[str, Callable[[], Any]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run independent callables, concurrently when possible.
+
+    Args:
+        tasks: Mapping of name to a callable taking no arguments
+        max_workers: Pool size (defaults to settings.DASHBOARD_QUERY_WORKERS);
+            1 or less runs every task on the calling thread
+
+    Returns:
+        Dict mapping each name to its callable's result. The first
+        exception raised by a task is re-raised.
+    """
+    if max_workers is None:
+        max_workers = settings.DASHBOARD_QUERY_WORKERS
+
+    if max_workers <= 1 or len(tasks) <= 1 or not can_run_concurrently():
+        return {name: task() for name, task in tasks.items()}
+
+    executor = _get_executor(max_workers)
+    # Each task runs in a copy of the caller's context, so the request's
+    # database routing (see db_routing.py) applies on the workers too
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _run_in_worker, task)
+        for name, task in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
@@ -1,49 +1,287 @@
 """
 Dashboard and Analytics API views.
 All dashboard page endpoints: summary, charts, and graphs.
+
+Every endpoint's payload is produced by a ``build_*`` function that reads
+spending through a spending source (see aggregations.py). The standalone
+views pass a DatabaseSpendingSource; the dashboard bundle passes one shared
+SpendingWindow so all of its sections come from the same data fetch.
 """
 import logging
 from datetime import date, timedelta
+from typing import Optional
+
+from django.db.models import Q
 
-from django.db.models import Sum, Count, Avg, Max, Min
-from django.db.models.functions import TruncMonth
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework import status
 
-from .models import Expense, Budget
+from .models import Expense
+from .aggregations import DatabaseSpendingSource, SpendingWindow, aggregate_spending_buckets
+from .budget_alerts_view import build_budget_alerts
+from .cache import cached_analytics
+from .concurrency import run_concurrently
+from .db_routing import ReplicaReadMixin
+from .recurring_views import build_recurring_expenses
 from .helpers import (
     # Constants
     MAX_MONTHS_LOOKBACK,
     MAX_CATEGORIES,
+    MAX_PIVOT_CATEGORIES,
+    MAX_TREND_POINTS,
+    TREND_BUCKETS,
+    MAX_HEATMAP_DAYS,
+    HEATMAP_LEVELS,
+    MIN_YEAR,
+    MAX_YEAR,
     # Type conversion
-    safe_float,
+    safe_int,
     safe_round,
+    cents_to_float,
     # Date validation
     parse_month_string,
+    parse_range_bound,
+    add_months,
+    month_end,
     get_week_date_range,
     validate_week_offset,
     validate_months_count,
     # Response helpers
     error_response,
+    success_payload,
     success_response,
     # Calculation helpers
     calculate_percentage,
     calculate_trend,
     calculate_change,
+    # Trend buckets
+    bucket_starts,
+    bucket_label,
+    next_bucket,
+    fit_trend_bucket,
+    # Heatmap levels
+    quantile_thresholds,
+    intensity_level,
     # Config helpers
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _month_bounds(today: date):
+    """First day of the current month and of the previous month."""
+    start_of_month = today.replace(day=1)
+    return start_of_month, add_months(start_of_month, -1)
+
+
 # =============================================================================
 # DASHBOARD SUMMARY
 # =============================================================================
 
-class DashboardSummaryView(APIView):
+def build_dashboard_summary(
+    user,
+    source,
+    today: Optional[date] = None,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    Build the dashboard summary payload.
+
+    Three queries, fetched concurrently: the period totals together with
+    the category breakdown (one grouped statement of filtered aggregates
+    over the daily rollups), the budget, and the top and recent expense
+    lists together.
+
+    Args:
+        user: The requesting user
+        source: Spending source covering at least the previous month
+        today: Reference date (defaults to today)
+        max_workers: Pool size for the concurrent fetch (see run_concurrently)
+
+    Returns:
+        dict: Response body of the summary endpoint
+    """
+    today = today or date.today()
+    start_of_month, last_month_start = _month_bounds(today)
+    start_of_week = today - timedelta(days=today.weekday())
+
+    # Calculate days in current month
+    days_in_month = (add_months(start_of_month, 1) - start_of_month).days
+    days_passed = today.day
+
+    expenses = Expense.objects.filter(user=user) if user.is_authenticated else Expense.objects.none()
+    expenses_this_month = expenses.filter(date__gte=start_of_month)
+    last_month_end = start_of_month - timedelta(days=1)
+
+    # === PERIOD INFO ===
+    period = {
+        "current_month": today.strftime('%Y-%m'),
+        "month_name": today.strftime('%B %Y'),
+        "start_date": str(start_of_month),
+        "end_date": str(today),
+        "days_in_month": days_in_month,
+        "days_passed": days_passed
+    }
+
+    # === FETCH (concurrently) ===
+    # All period totals and the category breakdown come from a single
+    # filtered-aggregate query
+    listed_fields = ('id', 'title', 'amount_cents', 'date', 'created_at', 'category_name')
+    top_ids = expenses_this_month.order_by('-amount_cents').values('pk')[:5]
+    recent_ids = expenses.order_by('-date', '-created_at').values('pk')[:5]
+    listed_qs = expenses.filter(Q(pk__in=top_ids) | Q(pk__in=recent_ids)).only(*listed_fields)
+    fetched = run_concurrently({
+        "totals": lambda: source.period_category_totals({
+            "month": (start_of_month, None),
+            "week": (start_of_week, None),
+            "today": (today, today),
+            "last_month": (last_month_start, last_month_end),
+        }, "month", 5),
+        "budget": lambda: source.budget_totals({"month": (start_of_month, start_of_month)})["month"],
+        "listed_expenses": lambda: list(listed_qs),
+    }, max_workers=max_workers)
+
+    # Both lists are in the combined rows: the month's top five are its
+    # largest, the recent five are the newest
+    listed = fetched["listed_expenses"]
+    top_expenses_rows = sorted(
+        (expense for expense in listed if expense.date >= start_of_month),
+        key=lambda expense: expense.amount_cents, reverse=True,
+    )[:5]
+    recent_expenses_rows = sorted(
+        listed, key=lambda expense: (expense.date, expense.created_at), reverse=True,
+    )[:5]
+
+    # === SPENDING SUMMARY ===
+    totals, categories_breakdown = fetched["totals"]
+    total_this_month = cents_to_float(totals["month"]["total_cents"])
+    total_this_week = cents_to_float(totals["week"]["total_cents"])
+    total_today = cents_to_float(totals["today"]["total_cents"])
+    total_last_month = cents_to_float(totals["last_month"]["total_cents"])
+    expense_count_this_month = totals["month"]["count"]
+
+    daily_avg = total_this_month / days_passed if days_passed > 0 else 0
+
+    spending = {
+        "total_this_month": total_this_month,
+        "total_this_week": total_this_week,
+        "total_today": total_today,
+        "transaction_count": expense_count_this_month,
+        "daily_average": safe_round(daily_avg)
+    }
+
+    # === BUDGET INFO ===
+    budget_data = fetched["budget"]
+    if budget_data["count"]:
+        budget_amount = cents_to_float(budget_data["total_cents"])
+        spent = total_this_month
+        remaining = budget_amount - spent
+        utilization = calculate_percentage(spent, budget_amount)
+
+        days_remaining = days_in_month - days_passed
+        daily_budget_remaining = remaining / days_remaining if days_remaining > 0 else 0
+
+        budget = {
+            "amount": budget_amount,
+            "spent": spent,
+            "remaining": safe_round(remaining),
+            "utilization_percent": utilization,
+            "daily_recommended": safe_round(daily_budget_remaining),
+            "status": "over_budget" if remaining < 0 else "on_track" if utilization <= 80 else "warning"
+        }
+    else:
+        budget = {
+            "amount": None,
+            "spent": total_this_month,
+            "remaining": None,
+            "utilization_percent": None,
+            "daily_recommended": None,
+            "status": "no_budget_set"
+        }
+
+    # === CATEGORY BREAKDOWN (Top 5) ===
+    # === TOP SPENDING CATEGORY ===
+    # The first row of the breakdown is the top category - no extra query
+    top_category_data = categories_breakdown[0] if categories_breakdown else None
+
+    if top_category_data and top_category_data['category__name']:
+        cat_total = cents_to_float(top_category_data['spent_cents'])
+        top_category = {
+            "id": top_category_data['category__id'],
+            "name": top_category_data['category__name'],
+            "color_code": top_category_data['category__color_code'],
+            "amount": cat_total,
+            "transaction_count": top_category_data['transactions'],
+            "percentage": calculate_percentage(cat_total, total_this_month)
+        }
+    else:
+        top_category = None
+
+    categories = []
+    for cat in categories_breakdown:
+        if cat['category__name']:
+            cat_total = cents_to_float(cat['spent_cents'])
+            categories.append({
+                "id": cat['category__id'],
+                "name": cat['category__name'],
+                "color_code": cat['category__color_code'],
+                "amount": cat_total,
+                "count": cat['transactions'],
+                "percentage": calculate_percentage(cat_total, total_this_month)
+            })
+
+    # === TOP EXPENSES ===
+    top_expenses = []
+    for exp in top_expenses_rows:
+        top_expenses.append({
+            "id": exp.id,
+            "title": exp.title,
+            "amount": cents_to_float(exp.amount_cents),
+            "category": exp.category_name,
+            "date": str(exp.date),
+        })
+
+    # === RECENT EXPENSES ===
+    recent_expenses = []
+    for exp in recent_expenses_rows:
+        recent_expenses.append({
+            "id": exp.id,
+            "title": exp.title,
+            "amount": cents_to_float(exp.amount_cents),
+            "category": exp.category_name,
+            "date": str(exp.date),
+        })
+
+
+    # === COMPARISON (vs last month) ===
+    trend = calculate_trend(total_this_month, total_last_month)
+    change_amount, change_percent = calculate_change(total_this_month, total_last_month)
+
+    comparison = {
+        "last_month_total": total_last_month,
+        "change_amount": change_amount,
+        "change_percent": change_percent,
+        "trend": trend
+    }
+
+    # === BUILD RESPONSE ===
+    return {
+        "success": True,
+        "period": period,
+        "spending": spending,
+        "budget": budget,
+        "top_category": top_category,
+        "categories": categories,
+        "top_expenses": top_expenses,
+        "recent_expenses": recent_expenses,
+        "comparison": comparison
+    }
+
+
+class DashboardSummaryView(ReplicaReadMixin, APIView):
     """
     Dashboard summary statistics.
     Returns grouped data for frontend dashboard components.
@@ -51,178 +289,12 @@ class DashboardSummaryView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
+    @cached_analytics
     def get(self, request):
         try:
-            today = date.today()
-            start_of_month = today.replace(day=1)
-            start_of_week = today - timedelta(days=today.weekday())
-            
-            # Calculate days in current month
-            if today.month == 12:
-                next_month = today.replace(year=today.year + 1, month=1, day=1)
-            else:
-                next_month = today.replace(month=today.month + 1, day=1)
-            days_in_month = (next_month - start_of_month).days
-            days_passed = today.day
-
-            expenses = Expense.objects.filter(user=request.user) if request.user.is_authenticated else Expense.objects.none()
-            expenses_this_month = expenses.filter(date__gte=start_of_month)
-
-            # === PERIOD INFO ===
-            period = {
-                "current_month": today.strftime('%Y-%m'),
-                "month_name": today.strftime('%B %Y'),
-                "start_date": str(start_of_month),
-                "end_date": str(today),
-                "days_in_month": days_in_month,
-                "days_passed": days_passed
-            }
-
-            # === SPENDING SUMMARY ===
-            total_this_month = expenses_this_month.aggregate(total=Sum('amount'))['total'] or 0
-            total_this_week = expenses.filter(date__gte=start_of_week).aggregate(total=Sum('amount'))['total'] or 0
-            total_today = expenses.filter(date=today).aggregate(total=Sum('amount'))['total'] or 0
-            expense_count_this_month = expenses_this_month.count()
-            
-            daily_avg = safe_float(total_this_month) / days_passed if days_passed > 0 else 0
-
-            spending = {
-                "total_this_month": safe_round(total_this_month),
-                "total_this_week": safe_round(total_this_week),
-                "total_today": safe_round(total_today),
-                "transaction_count": expense_count_this_month,
-                "daily_average": safe_round(daily_avg)
-            }
-
-            # === BUDGET INFO ===
-            budget_data = Budget.objects.filter(month=start_of_month, user=request.user).first() if request.user.is_authenticated else None
-            if budget_data:
-                budget_amount = safe_float(budget_data.budget_amount)
-                spent = safe_float(total_this_month)
-                remaining = budget_amount - spent
-                utilization = calculate_percentage(spent, budget_amount)
-                
-                days_remaining = days_in_month - days_passed
-                daily_budget_remaining = remaining / days_remaining if days_remaining > 0 else 0
-                
-                budget = {
-                    "amount": budget_amount,
-                    "spent": spent,
-                    "remaining": safe_round(remaining),
-                    "utilization_percent": utilization,
-                    "daily_recommended": safe_round(daily_budget_remaining),
-                    "status": "over_budget" if remaining < 0 else "on_track" if utilization <= 80 else "warning"
-                }
-            else:
-                budget = {
-                    "amount": None,
-                    "spent": safe_round(total_this_month),
-                    "remaining": None,
-                    "utilization_percent": None,
-                    "daily_recommended": None,
-                    "status": "no_budget_set"
-                }
-
-            # === TOP SPENDING CATEGORY ===
-            top_category_data = expenses_this_month.values(
-                'category__id', 'category__name', 'category__color_code'
-            ).annotate(
-                total=Sum('amount'),
-                count=Count('id')
-            ).order_by('-total').first()
-
-            if top_category_data and top_category_data['category__name']:
-                cat_total = safe_float(top_category_data['total'])
-                top_category = {
-                    "id": top_category_data['category__id'],
-                    "name": top_category_data['category__name'],
-                    "color_code": top_category_data['category__color_code'],
-                    "amount": safe_round(cat_total),
-                    "transaction_count": top_category_data['count'],
-                    "percentage": calculate_percentage(cat_total, safe_float(total_this_month))
-                }
-            else:
-                top_category = None
-
-            # === CATEGORY BREAKDOWN (Top 5) ===
-            categories_breakdown = expenses_this_month.values(
-                'category__id', 'category__name', 'category__color_code'
-            ).annotate(
-                total=Sum('amount'),
-                count=Count('id')
-            ).order_by('-total')[:5]
-
-            categories = []
-            for cat in categories_breakdown:
-                if cat['category__name']:
-                    cat_total = safe_float(cat['total'])
-                    categories.append({
-                        "id": cat['category__id'],
-                        "name": cat['category__name'],
-                        "color_code": cat['category__color_code'],
-                        "amount": safe_round(cat_total),
-                        "count": cat['count'],
-                        "percentage": calculate_percentage(cat_total, safe_float(total_this_month))
-                    })
-
-            # === TOP EXPENSES ===
-            top_expenses_qs = expenses_this_month.select_related('category').order_by('-amount')[:5]
-            top_expenses = []
-            for exp in top_expenses_qs:
-                top_expenses.append({
-                    "id": exp.id,
-                    "title": exp.title,
-                    "amount": safe_round(exp.amount),
-                    "category": exp.category.name if exp.category else None,
-                    "date": str(exp.date),
-                })
-
-            # === RECENT EXPENSES ===
-            recent_expenses_qs = expenses.select_related('category').order_by('-date', '-created_at')[:5]
-            recent_expenses = []
-            for exp in recent_expenses_qs:
-                recent_expenses.append({
-                    "id": exp.id,
-                    "title": exp.title,
-                    "amount": safe_round(exp.amount),
-                    "category": exp.category.name if exp.category else None,
-                    "date": str(exp.date),
-                })
-
-
-            # === COMPARISON (vs last month) ===
-            last_month_start = (start_of_month - timedelta(days=1)).replace(day=1)
-            last_month_end = start_of_month - timedelta(days=1)
-            
-            total_last_month = expenses.filter(
-                date__gte=last_month_start,
-                date__lte=last_month_end
-            ).aggregate(total=Sum('amount'))['total'] or 0
-
-            current = safe_float(total_this_month)
-            previous = safe_float(total_last_month)
-            trend = calculate_trend(current, previous)
-            change_amount, change_percent = calculate_change(current, previous)
-
-            comparison = {
-                "last_month_total": safe_round(total_last_month),
-                "change_amount": change_amount,
-                "change_percent": change_percent,
-                "trend": trend
-            }
-
-            # === BUILD RESPONSE ===
-            return Response({
-                "success": True,
-                "period": period,
-                "spending": spending,
-                "budget": budget,
-                "top_category": top_category,
-                "categories": categories,
-                "top_expenses": top_expenses,
-                "recent_expenses": recent_expenses,
-                "comparison": comparison
-            })
+            return Response(build_dashboard_summary(
+                request.user, DatabaseSpendingSource(request.user)
+            ))
 
         except Exception as e:
             logger.error(f"Dashboard summary error: {str(e)}", exc_info=True)
@@ -237,77 +309,174 @@ class DashboardSummaryView(APIView):
 # ANALYTICS - CATEGORY BREAKDOWN (Pie/Donut Chart)
 # =============================================================================
 
-class CategoryBreakdownView(APIView):
+def build_category_breakdown(source, month: Optional[str], start_date: date, end_date: date) -> dict:
+    """
+    Build the category breakdown payload for one month.
+
+    Args:
+        source: Spending source covering the month
+        month: Month as requested (YYYY-MM), or None for the current month
+        start_date: First day of the month
+        end_date: Last day of the month (today for the current month)
+
+    Returns:
+        dict: Response body of the category breakdown endpoint
+    """
+    data = source.category_totals(start_date, end_date, MAX_CATEGORIES)
+
+    total = cents_to_float(sum(item['spent_cents'] for item in data))
+    total_transactions = sum(item['transactions'] for item in data)
+
+    result = []
+    for item in data:
+        value = cents_to_float(item['spent_cents'])
+        result.append({
+            "id": item['category__id'],
+            "name": item['category__name'] or "Uncategorized",
+            "value": value,
+            "color": item['category__color_code'] or "#6B7280",
+            "count": item['transactions'],
+            "percentage": calculate_percentage(value, total),
+            "average": safe_round(value / item['transactions']) if item['transactions'] else 0,
+            "largest": safe_round(item['largest'])
+        })
+
+    return success_payload(
+        data=result,
+        meta={
+            "period": month or start_date.strftime('%Y-%m'),
+            "period_label": start_date.strftime('%B %Y'),
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "total_categories": len(result),
+            "max_categories": MAX_CATEGORIES
+        },
+        summary={
+            "total": total,
+            "transaction_count": total_transactions,
+            "average_per_transaction": safe_round(total / total_transactions) if total_transactions > 0 else 0
+        }
+    )
+
+
+def build_category_pivot(source, start_month: date, end_month: date, top: int) -> dict:
+    """
+    Build a categories x months spending matrix.
+
+    The matrix is column-oriented to stay small on the wire: ``categories``
+    and ``months`` label the axes and ``values`` holds the cells row-major
+    (``values[i * len(months) + j]`` is category i in month j). Categories
+    beyond the ``top`` largest over the whole range are merged into a
+    trailing "Other" row.
+
+    Args:
+        source: Spending source covering the months
+        start_month: First day of the first month
+        end_month: First day of the last month
+        top: Number of categories shown individually
+
+    Returns:
+        dict: Response body of the category breakdown endpoint in pivot mode
+    """
+    cells = source.category_month_totals(start_month, end_month)
+    months = bucket_starts(start_month, end_month, 'month')
+    month_index = {month: j for j, month in enumerate(months)}
+
+    # Rank categories by their total over the whole range
+    category_totals = {}
+    for cell in cells:
+        key = cell['category__id']
+        if key not in category_totals:
+            category_totals[key] = {
+                "id": key,
+                "name": cell['category__name'] or "Uncategorized",
+                "color": cell['category__color_code'] or "#6B7280",
+                "total_cents": 0,
+            }
+        category_totals[key]['total_cents'] += cell['spent_cents']
+
+    ranked = sorted(category_totals.values(), key=lambda category: category['total_cents'], reverse=True)
+    shown, others = ranked[:top], ranked[top:]
+
+    row_index = {category['id']: i for i, category in enumerate(shown)}
+    categories = [{"id": c['id'], "name": c['name'], "color": c['color']} for c in shown]
+    if others:
+        for category in others:
+            row_index[category['id']] = len(shown)
+        categories.append({"id": None, "name": "Other", "color": "#9CA3AF", "merged": len(others)})
+
+    # Cells are summed in cents and only converted once the totals are known
+    cents = [0] * (len(categories) * len(months))
+    for cell in cells:
+        i = row_index[cell['category__id']]
+        cents[i * len(months) + month_index[cell['month']]] += cell['spent_cents']
+    values = [cents_to_float(value) for value in cents]
+
+    month_totals = [
+        cents_to_float(sum(cents[i * len(months) + j] for i in range(len(categories))))
+        for j in range(len(months))
+    ]
+
+    return success_payload(
+        data={
+            "categories": categories,
+            "months": [month.strftime('%Y-%m') for month in months],
+            "values": values,
+        },
+        meta={
+            "mode": "pivot",
+            "start_month": start_month.strftime('%Y-%m'),
+            "end_month": end_month.strftime('%Y-%m'),
+            "shape": [len(categories), len(months)],
+            "layout": "row-major",
+            "top": top
+        },
+        summary={
+            "total": cents_to_float(sum(category['total_cents'] for category in ranked)),
+            "category_totals": [
+                cents_to_float(sum(cents[i * len(months):(i + 1) * len(months)]))
+                for i in range(len(categories))
+            ],
+            "month_totals": month_totals
+        }
+    )
+
+
+class CategoryBreakdownView(ReplicaReadMixin, APIView):
     """
     Pie/Donut chart data - expenses grouped by category.
-    
-    Query params: 
+
+    Query params:
         ?month=2025-12 (optional, defaults to current month)
-    
+
     Returns top 10 categories.
+
+    Pivot mode (?pivot=month) - categories x months matrix:
+        ?start=2025-01 (optional, default: 11 months before end)
+        ?end=2025-12 (optional, default: current month)
+        ?top=10 (optional, categories shown before "Other", max 25)
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
+    @cached_analytics
     def get(self, request):
         try:
+            if request.query_params.get('pivot'):
+                return self.get_pivot(request)
+
             month = request.query_params.get('month')
             start_date, end_date = parse_month_string(month)
-            
+
             if start_date is None and month:
                 return error_response(
                     message="Invalid month format. Use YYYY-MM (e.g., 2025-12)",
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
-            
-            expenses = Expense.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date,
-                user=request.user if request.user.is_authenticated else None
-            ).select_related('category')
-            
-            data = expenses.values(
-                'category__id', 'category__name', 'category__color_code'
-            ).annotate(
-                value=Sum('amount'),
-                count=Count('id'),
-                avg_amount=Avg('amount'),
-                max_amount=Max('amount')
-            ).order_by('-value')[:MAX_CATEGORIES]
-
-            total = sum(safe_float(item['value']) for item in data)
-            total_transactions = sum(item['count'] for item in data)
-
-            result = []
-            for item in data:
-                value = safe_float(item['value'])
-                result.append({
-                    "id": item['category__id'],
-                    "name": item['category__name'] or "Uncategorized",
-                    "value": safe_round(value),
-                    "color": item['category__color_code'] or "#6B7280",
-                    "count": item['count'],
-                    "percentage": calculate_percentage(value, total),
-                    "average": safe_round(item['avg_amount']),
-                    "largest": safe_round(item['max_amount'])
-                })
 
-            return success_response(
-                data=result,
-                meta={
-                    "period": month or start_date.strftime('%Y-%m'),
-                    "period_label": start_date.strftime('%B %Y'),
-                    "start_date": str(start_date),
-                    "end_date": str(end_date),
-                    "total_categories": len(result),
-                    "max_categories": MAX_CATEGORIES
-                },
-                summary={
-                    "total": safe_round(total),
-                    "transaction_count": total_transactions,
-                    "average_per_transaction": safe_round(total / total_transactions) if total_transactions > 0 else 0
-                }
-            )
+            return Response(build_category_breakdown(
+                DatabaseSpendingSource(request.user), month, start_date, end_date
+            ))
 
         except Exception as e:
             logger.error(f"Category breakdown error: {str(e)}", exc_info=True)
@@ -317,88 +486,142 @@ class CategoryBreakdownView(APIView):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def get_pivot(self, request):
+        params = request.query_params
+
+        if params.get('pivot') != 'month':
+            return error_response(
+                message="Invalid pivot. Use pivot=month",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        end_month, _ = parse_month_string(params.get('end'))
+        if end_month is None:
+            return error_response(
+                message="Invalid end. Use YYYY-MM (e.g., 2025-12)",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        end_month = end_month.replace(day=1)
+
+        if params.get('start'):
+            start_month, _ = parse_month_string(params.get('start'))
+        else:
+            start_month = add_months(end_month, -(MAX_MONTHS_LOOKBACK - 1))
+        if start_month is None:
+            return error_response(
+                message="Invalid start. Use YYYY-MM (e.g., 2025-01)",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if start_month > end_month:
+            return error_response(
+                message="start must not be after end",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        if len(bucket_starts(start_month, end_month, 'month')) > MAX_TREND_POINTS:
+            return error_response(
+                message=f"Range too long. The pivot covers at most {MAX_TREND_POINTS} months",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        top = min(max(safe_int(params.get('top'), MAX_CATEGORIES), 1), MAX_PIVOT_CATEGORIES)
+
+        return Response(build_category_pivot(
+            DatabaseSpendingSource(request.user), start_month, end_month, top
+        ))
+
 
 # =============================================================================
 # ANALYTICS - WEEKLY SPENDING (Bar Chart)
 # =============================================================================
 
-class WeeklySpendingView(APIView):
+def build_weekly_spending(source, week_offset: int, today: Optional[date] = None) -> dict:
+    """
+    Build the weekly spending payload.
+
+    Args:
+        source: Spending source covering the week
+        week_offset: Validated week offset (0 = current week)
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: Response body of the weekly spending endpoint
+    """
+    today = today or date.today()
+    start_of_week, end_of_week = get_week_date_range(week_offset)
+    days = [start_of_week + timedelta(days=i) for i in range(7)]
+
+    # One filtered aggregate per day, all in a single query
+    daily_totals = source.period_totals(
+        {f"day_{i}": (day, day) for i, day in enumerate(days)}
+    )
+
+    result = []
+    week_total = 0
+    highest_day = {"day": None, "total": 0}
+
+    for i, current_day in enumerate(days):
+        day_data = daily_totals[f"day_{i}"]
+        day_total = cents_to_float(day_data['total_cents'])
+        week_total += day_total
+
+        if day_total > highest_day['total']:
+            highest_day = {"day": current_day.strftime('%A'), "total": day_total}
+
+        result.append({
+            "date": str(current_day),
+            "day": current_day.strftime('%a'),
+            "day_full": current_day.strftime('%A'),
+            "day_number": current_day.strftime('%d'),
+            "total": day_total,
+            "count": day_data['count'],
+            "is_today": current_day == today
+        })
+
+    days_with_spending = sum(1 for item in result if item['total'] > 0)
+
+    return success_payload(
+        data=result,
+        meta={
+            "week_offset": week_offset,
+            "start_date": str(start_of_week),
+            "end_date": str(end_of_week),
+            "week_label": f"{start_of_week.strftime('%b %d')} - {end_of_week.strftime('%b %d, %Y')}",
+            "is_current_week": week_offset == 0
+        },
+        summary={
+            "total": safe_round(week_total),
+            "daily_average": safe_round(week_total / 7),
+            "transaction_count": sum(item['count'] for item in result),
+            "days_with_spending": days_with_spending,
+            "highest_spending_day": highest_day['day'],
+            "highest_spending_amount": safe_round(highest_day['total'])
+        }
+    )
+
+
+class WeeklySpendingView(ReplicaReadMixin, APIView):
     """
     Bar chart data - daily spending for the week.
-    
+
     Query params:
         ?week_offset=0 (0 = current week, -1 = last week, etc. Max: -52)
-    
+
     Returns 7 days (Mon-Sun).
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
+    @cached_analytics
     def get(self, request):
         try:
             week_offset = validate_week_offset(
                 request.query_params.get('week_offset', '0')
             )
-            
-            start_of_week, end_of_week = get_week_date_range(week_offset)
-            today = date.today()
-            
-            # Group by date field directly (SQLite compatible)
-            expenses = Expense.objects.filter(
-                date__gte=start_of_week,
-                date__lte=end_of_week,
-                user=request.user if request.user.is_authenticated else None
-            ).values('date').annotate(
-                total=Sum('amount'),
-                count=Count('id'),
-                avg=Avg('amount')
-            ).order_by('date')
-
-            expenses_dict = {item['date']: item for item in expenses}
-
-            result = []
-            week_total = 0
-            highest_day = {"day": None, "total": 0}
-            
-            for i in range(7):
-                current_day = start_of_week + timedelta(days=i)
-                day_data = expenses_dict.get(current_day, {'total': 0, 'count': 0, 'avg': 0})
-                day_total = safe_float(day_data['total'])
-                week_total += day_total
-                
-                if day_total > highest_day['total']:
-                    highest_day = {"day": current_day.strftime('%A'), "total": day_total}
-                
-                result.append({
-                    "date": str(current_day),
-                    "day": current_day.strftime('%a'),
-                    "day_full": current_day.strftime('%A'),
-                    "day_number": current_day.strftime('%d'),
-                    "total": safe_round(day_total),
-                    "count": day_data['count'],
-                    "is_today": current_day == today
-                })
-
-            days_with_spending = sum(1 for item in result if item['total'] > 0)
 
-            return success_response(
-                data=result,
-                meta={
-                    "week_offset": week_offset,
-                    "start_date": str(start_of_week),
-                    "end_date": str(end_of_week),
-                    "week_label": f"{start_of_week.strftime('%b %d')} - {end_of_week.strftime('%b %d, %Y')}",
-                    "is_current_week": week_offset == 0
-                },
-                summary={
-                    "total": safe_round(week_total),
-                    "daily_average": safe_round(week_total / 7),
-                    "transaction_count": sum(item['count'] for item in result),
-                    "days_with_spending": days_with_spending,
-                    "highest_spending_day": highest_day['day'],
-                    "highest_spending_amount": safe_round(highest_day['total'])
-                }
-            )
+            return Response(build_weekly_spending(
+                DatabaseSpendingSource(request.user), week_offset
+            ))
 
         except Exception as e:
             logger.error(f"Weekly spending error: {str(e)}", exc_info=True)
@@ -409,112 +632,472 @@ class WeeklySpendingView(APIView):
             )
 
 
+# =============================================================================
+# ANALYTICS - SPENDING HEATMAP (Calendar)
+# =============================================================================
+
+def build_spending_heatmap(source, start: date, end: date) -> dict:
+    """
+    Build the calendar heatmap payload: one cell per day of the range.
+
+    Intensity levels are quantiles of the range's non-zero daily totals, so
+    the colour scale adapts to the user's own spending.
+
+    Args:
+        source: Spending source covering the range
+        start: First day of the range
+        end: Last day of the range (inclusive)
+
+    Returns:
+        dict: Response body of the heatmap endpoint
+    """
+    totals = source.day_totals(start, end)
+    thresholds = quantile_thresholds([cents_to_float(day['total_cents']) for day in totals.values()])
+
+    result = []
+    current = start
+    while current <= end:
+        day = totals.get(current)
+        total = cents_to_float(day['total_cents']) if day else 0.0
+        result.append({
+            "date": str(current),
+            "total": total,
+            "count": day['count'] if day else 0,
+            "level": intensity_level(total, thresholds)
+        })
+        current += timedelta(days=1)
+
+    grand_total = sum(item['total'] for item in result)
+    busiest = max(result, key=lambda item: item['total']) if totals else None
+
+    return success_payload(
+        data=result,
+        meta={
+            "start_date": str(start),
+            "end_date": str(end),
+            "days": len(result),
+            "levels": HEATMAP_LEVELS + 1,
+            "thresholds": [safe_round(value) for value in thresholds]
+        },
+        summary={
+            "total": safe_round(grand_total),
+            "transaction_count": sum(item['count'] for item in result),
+            "days_with_spending": len(totals),
+            "daily_average": safe_round(grand_total / len(result)) if result else 0,
+            "busiest_day": busiest['date'] if busiest else None,
+            "busiest_amount": busiest['total'] if busiest else 0
+        }
+    )
+
+
+class SpendingHeatmapView(ReplicaReadMixin, APIView):
+    """
+    Calendar heatmap data - daily spending over a year or any range.
+
+    Query params:
+        ?year=2025 (optional, a whole calendar year)
+        ?start=2025-01-01&end=2025-12-31 (optional, max 731 days)
+
+    Defaults to the 365 days ending today. Level 0 means no spending,
+    levels 1-4 are quartiles of the days with spending.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+
+    @cached_analytics
+    def get(self, request):
+        try:
+            params = request.query_params
+            today = date.today()
+
+            if params.get('year'):
+                year = safe_int(params.get('year'), 0)
+                if not (MIN_YEAR <= year <= MAX_YEAR):
+                    return error_response(
+                        message=f"Invalid year. Use a year between {MIN_YEAR} and {MAX_YEAR}",
+                        status_code=status.HTTP_400_BAD_REQUEST
+                    )
+                start, end = date(year, 1, 1), date(year, 12, 31)
+            else:
+                end = parse_range_bound(params.get('end'), is_end=True) if params.get('end') else today
+                start = parse_range_bound(params.get('start')) if params.get('start') else (
+                    end - timedelta(days=364) if end else None
+                )
+                if start is None or end is None:
+                    return error_response(
+                        message="Invalid start or end. Use YYYY-MM or YYYY-MM-DD",
+                        status_code=status.HTTP_400_BAD_REQUEST
+                    )
+
+            if start > end:
+                return error_response(
+                    message="start must not be after end",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            if (end - start).days + 1 > MAX_HEATMAP_DAYS:
+                return error_response(
+                    message=f"Range too long. The heatmap covers at most {MAX_HEATMAP_DAYS} days",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+            return Response(build_spending_heatmap(
+                DatabaseSpendingSource(request.user), start, end
+            ))
+
+        except Exception as e:
+            logger.error(f"Spending heatmap error: {str(e)}", exc_info=True)
+            return error_response(
+                message="Unable to load spending heatmap data",
+                detail=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 # =============================================================================
 # ANALYTICS - MONTHLY TREND (Line Chart)
 # =============================================================================
 
-class MonthlyTrendView(APIView):
+def trend_start_month(months: int, today: Optional[date] = None) -> date:
+    """First month shown by a trend of ``months`` months ending this month."""
+    today = today or date.today()
+    return add_months(today.replace(day=1), -(months - 1))
+
+
+def build_monthly_trend(source, months: int, today: Optional[date] = None) -> dict:
+    """
+    Build the monthly trend payload.
+
+    Args:
+        source: Spending source covering the requested months
+        months: Validated number of months
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: Response body of the monthly trend endpoint
+    """
+    # Closed months are read as-is from the monthly rollup; only the
+    # month an expense is written to ever changes
+    data = source.month_totals(trend_start_month(months, today))
+
+    result = []
+    grand_total = 0
+    highest_month = {"month": None, "total": 0}
+    lowest_month = {"month": None, "total": float('inf')}
+
+    for item in data[-months:]:
+        total = cents_to_float(item['spent_cents'])
+        grand_total += total
+
+        month_name = item['month'].strftime('%B %Y')
+
+        if total > highest_month['total']:
+            highest_month = {"month": month_name, "total": total}
+        if total < lowest_month['total']:
+            lowest_month = {"month": month_name, "total": total}
+
+        result.append({
+            "month": item['month'].strftime('%Y-%m'),
+            "month_short": item['month'].strftime('%b'),
+            "month_name": month_name,
+            "total": total,
+            "count": item['transactions'],
+            "average_per_expense": safe_round(total / item['transactions']) if item['transactions'] else 0,
+            "largest_expense": safe_round(item['max_expense']),
+            "smallest_expense": safe_round(item['min_expense'])
+        })
+
+    # Calculate trend
+    trend = "stable"
+    change_amount = 0
+    change_percent = 0
+
+    if len(result) >= 2:
+        current = result[-1]['total']
+        previous = result[-2]['total']
+        trend = calculate_trend(current, previous)
+        change_amount, change_percent = calculate_change(current, previous)
+
+    if lowest_month['total'] == float('inf'):
+        lowest_month = {"month": None, "total": 0}
+
+    return success_payload(
+        data=result,
+        meta={
+            "months_requested": months,
+            "months_returned": len(result),
+            "max_months_allowed": MAX_MONTHS_LOOKBACK,
+            "start_month": result[0]['month'] if result else None,
+            "end_month": result[-1]['month'] if result else None
+        },
+        summary={
+            "grand_total": safe_round(grand_total),
+            "monthly_average": safe_round(grand_total / len(result)) if result else 0,
+            "trend": trend,
+            "change_amount": change_amount,
+            "change_percent": change_percent,
+            "highest_month": highest_month['month'],
+            "highest_amount": safe_round(highest_month['total']),
+            "lowest_month": lowest_month['month'],
+            "lowest_amount": safe_round(lowest_month['total'])
+        }
+    )
+
+
+def build_bucketed_trend(user, start: date, end: date, bucket: str) -> dict:
+    """
+    Build a spending trend over an arbitrary range, one point per bucket.
+
+    Ranges that would need more than MAX_TREND_POINTS buckets are coarsened
+    to the next bucket size, so the response size stays bounded. Buckets
+    without spending are returned as zero.
+
+    Args:
+        user: The requesting user
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: Requested bucket (one of TREND_BUCKETS)
+
+    Returns:
+        dict: Response body of the monthly trend endpoint in range mode
+    """
+    applied = fit_trend_bucket(start, end, bucket)
+    totals = aggregate_spending_buckets(user, start, end, applied)
+
+    result = []
+    grand_total = 0
+    highest = {"period": None, "total": 0}
+
+    for bucket_start in bucket_starts(start, end, applied):
+        # The first and last bucket are clipped to the requested range
+        bucket_end = min(next_bucket(bucket_start, applied) - timedelta(days=1), end)
+        item = totals.get(bucket_start)
+        total = cents_to_float(item['total_cents']) if item else 0.0
+        count = item['count'] if item else 0
+        grand_total += total
+
+        label = bucket_label(bucket_start, applied)
+        if total > highest['total']:
+            highest = {"period": label, "total": total}
+
+        result.append({
+            "period": label,
+            "start_date": str(max(bucket_start, start)),
+            "end_date": str(bucket_end),
+            "total": total,
+            "count": count,
+            "average_per_expense": safe_round(total / count) if count else 0,
+            "largest_expense": safe_round(item['max_amount']) if item else 0,
+            "smallest_expense": safe_round(item['min_amount']) if item else 0
+        })
+
+    trend = "stable"
+    change_amount = 0
+    change_percent = 0
+
+    if len(result) >= 2:
+        current = result[-1]['total']
+        previous = result[-2]['total']
+        trend = calculate_trend(current, previous)
+        change_amount, change_percent = calculate_change(current, previous)
+
+    return success_payload(
+        data=result,
+        meta={
+            "start_date": str(start),
+            "end_date": str(end),
+            "bucket_requested": bucket,
+            "bucket": applied,
+            "points": len(result),
+            "max_points": MAX_TREND_POINTS
+        },
+        summary={
+            "grand_total": safe_round(grand_total),
+            "bucket_average": safe_round(grand_total / len(result)) if result else 0,
+            "trend": trend,
+            "change_amount": change_amount,
+            "change_percent": change_percent,
+            "highest_period": highest['period'],
+            "highest_amount": safe_round(highest['total'])
+        }
+    )
+
+
+class MonthlyTrendView(ReplicaReadMixin, APIView):
     """
     Line chart data - monthly spending trend.
-    
+
     Query params:
         ?months=6 (default: 6, max: 12)
+
+    Range mode (any of start/end/bucket given):
+        ?start=2022-01 (YYYY-MM or YYYY-MM-DD, default: 12 months before end)
+        ?end=2025-12 (YYYY-MM or YYYY-MM-DD, default: end of current month)
+        ?bucket=month (day, week, month, quarter or year; default: month)
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
 
+    @cached_analytics
     def get(self, request):
         try:
+            params = request.query_params
+            if any(name in params for name in ('start', 'end', 'bucket')):
+                return self.get_range(request)
+
             months = validate_months_count(
-                request.query_params.get('months', '6')
+                params.get('months', '6')
+            )
+
+            return Response(build_monthly_trend(
+                DatabaseSpendingSource(request.user), months
+            ))
+
+        except Exception as e:
+            logger.error(f"Monthly trend error: {str(e)}", exc_info=True)
+            return error_response(
+                message="Unable to load monthly trend data",
+                detail=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def get_range(self, request):
+        params = request.query_params
+
+        bucket = params.get('bucket', 'month')
+        if bucket not in TREND_BUCKETS:
+            return error_response(
+                message=f"Invalid bucket. Use one of: {', '.join(TREND_BUCKETS)}",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        end = parse_range_bound(params.get('end'), is_end=True) if params.get('end') else month_end(date.today())
+        if end is None:
+            return error_response(
+                message="Invalid end. Use YYYY-MM or YYYY-MM-DD",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if params.get('start'):
+            start = parse_range_bound(params.get('start'))
+        else:
+            start = add_months(end.replace(day=1), -(MAX_MONTHS_LOOKBACK - 1))
+        if start is None:
+            return error_response(
+                message="Invalid start. Use YYYY-MM or YYYY-MM-DD",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if start > end:
+            return error_response(
+                message="start must not be after end",
+                status_code=status.HTTP_400_BAD_REQUEST
             )
 
+        return Response(build_bucketed_trend(request.user, start, end, bucket))
+
+
+# =============================================================================
+# DASHBOARD BUNDLE
+# =============================================================================
+
+BUNDLE_SECTIONS = [
+    "summary",
+    "category_breakdown",
+    "weekly_spending",
+    "monthly_trend",
+    "budget_alerts",
+    "recurring",
+]
+
+
+class DashboardBundleView(ReplicaReadMixin, APIView):
+    """
+    All dashboard sections in one response.
+
+    Every section is built from one shared SpendingWindow covering the
+    widest date range the requested sections need, so the whole page costs
+    one rollup query and one budget query (plus the raw top/recent expense
+    lists of the summary and the recurring list).
+
+    Query params:
+        ?sections=summary,weekly_spending (optional, defaults to all sections)
+        ?month=2025-12 (category_breakdown, defaults to current month)
+        ?week_offset=0 (weekly_spending)
+        ?months=6 (monthly_trend)
+
+    Each section holds exactly what its standalone endpoint returns.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+
+    @cached_analytics
+    def get(self, request):
+        try:
+            sections_param = request.query_params.get('sections', '')
+            sections = [name.strip() for name in sections_param.split(',') if name.strip()] or BUNDLE_SECTIONS
+            unknown = [name for name in sections if name not in BUNDLE_SECTIONS]
+            if unknown:
+                return error_response(
+                    message=f"Unknown sections: {', '.join(unknown)}. Valid sections: {', '.join(BUNDLE_SECTIONS)}",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+            month = request.query_params.get('month')
+            month_start, month_end = parse_month_string(month)
+            if month_start is None and month:
+                return error_response(
+                    message="Invalid month format. Use YYYY-MM (e.g., 2025-12)",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            week_offset = validate_week_offset(request.query_params.get('week_offset', '0'))
+            months = validate_months_count(request.query_params.get('months', '6'))
+
             today = date.today()
-            start_date = today - timedelta(days=months * 31)
-            
-            data = Expense.objects.filter(
-                date__gte=start_date,
-                user=request.user if request.user.is_authenticated else None
-            ).annotate(
-                month=TruncMonth('date')
-            ).values('month').annotate(
-                total=Sum('amount'),
-                count=Count('id'),
-                avg=Avg('amount'),
-                max_expense=Max('amount'),
-                min_expense=Min('amount')
-            ).order_by('month')
-
-            result = []
-            grand_total = 0
-            highest_month = {"month": None, "total": 0}
-            lowest_month = {"month": None, "total": float('inf')}
-            
-            for item in list(data)[-months:]:
-                total = safe_float(item['total'])
-                grand_total += total
-                
-                month_name = item['month'].strftime('%B %Y')
-                
-                if total > highest_month['total']:
-                    highest_month = {"month": month_name, "total": total}
-                if total < lowest_month['total']:
-                    lowest_month = {"month": month_name, "total": total}
-                
-                result.append({
-                    "month": item['month'].strftime('%Y-%m'),
-                    "month_short": item['month'].strftime('%b'),
-                    "month_name": month_name,
-                    "total": safe_round(total),
-                    "count": item['count'],
-                    "average_per_expense": safe_round(item['avg']),
-                    "largest_expense": safe_round(item['max_expense']),
-                    "smallest_expense": safe_round(item['min_expense'])
-                })
-
-            # Calculate trend
-            trend = "stable"
-            change_amount = 0
-            change_percent = 0
-            
-            if len(result) >= 2:
-                current = result[-1]['total']
-                previous = result[-2]['total']
-                trend = calculate_trend(current, previous)
-                change_amount, change_percent = calculate_change(current, previous)
-
-            if lowest_month['total'] == float('inf'):
-                lowest_month = {"month": None, "total": 0}
+
+            # === WIDEST WINDOW ===
+            window_starts = {
+                "summary": _month_bounds(today)[1],
+                "category_breakdown": month_start,
+                "weekly_spending": get_week_date_range(week_offset)[0],
+                "monthly_trend": trend_start_month(months, today),
+                "budget_alerts": today.replace(month=1, day=1),
+            }
+            needed = [window_starts[name] for name in sections if name in window_starts]
+            window = SpendingWindow(request.user, min(needed)) if needed else None
+
+            # Load the shared window and the recurring list side by side;
+            # every section after that is computed from memory (plus the
+            # summary's top/recent expense lists)
+            preload = {}
+            if window:
+                preload["rows"] = lambda: window.rows
+            if window and {"summary", "budget_alerts"} & set(sections):
+                preload["budgets"] = lambda: window.budgets
+            if "recurring" in sections:
+                preload["recurring"] = lambda: build_recurring_expenses(request.user)
+            preloaded = run_concurrently(preload)
+
+            builders = {
+                "summary": lambda: build_dashboard_summary(request.user, window, today),
+                "category_breakdown": lambda: build_category_breakdown(window, month, month_start, month_end),
+                "weekly_spending": lambda: build_weekly_spending(window, week_offset, today),
+                "monthly_trend": lambda: build_monthly_trend(window, months, today),
+                "budget_alerts": lambda: build_budget_alerts(window, today),
+                "recurring": lambda: preloaded["recurring"],
+            }
 
             return success_response(
-                data=result,
+                data={name: builders[name]() for name in sections},
                 meta={
-                    "months_requested": months,
-                    "months_returned": len(result),
-                    "max_months_allowed": MAX_MONTHS_LOOKBACK,
-                    "start_month": result[0]['month'] if result else None,
-                    "end_month": result[-1]['month'] if result else None
-                },
-                summary={
-                    "grand_total": safe_round(grand_total),
-                    "monthly_average": safe_round(grand_total / len(result)) if result else 0,
-                    "trend": trend,
-                    "change_amount": change_amount,
-                    "change_percent": change_percent,
-                    "highest_month": highest_month['month'],
-                    "highest_amount": safe_round(highest_month['total']),
-                    "lowest_month": lowest_month['month'],
-                    "lowest_amount": safe_round(lowest_month['total'])
+                    "sections": sections,
+                    "window_start": str(window.start) if window else None,
                 }
             )
 
         except Exception as e:
-            logger.error(f"Monthly trend error: {str(e)}", exc_info=True)
+            logger.error(f"Dashboard bundle error: {str(e)}", exc_info=True)
             return error_response(
-                message="Unable to load monthly trend data",
+                message="Unable to load dashboard data",
                 detail=str(e),
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-
-
-
@@ -0,0 +1,117 @@
+"""
+Read-replica routing for the read-only analytics endpoints.
+
+With ``settings.DATABASE_REPLICA_ALIAS`` naming a configured database, the
+GET requests of the dashboard, analytics, export, recurring and budget
+alert views (the views using ReplicaReadMixin) run their queries on that
+replica, so they don't compete with expense writes on the primary. Every
+write still goes to ``default``.
+
+Replicas lag behind the primary, so a user who just wrote is pinned to the
+primary for ``settings.DATABASE_REPLICA_PIN_SECONDS`` (see signals.py) and
+reads their own writes, whichever worker serves the read: the pin lives in
+the analytics state cache, shared by every process (see settings.py). Keep
+the window above the replica's usual lag. Without a shared cache a pin
+can't reach the other workers, so every read goes to the primary.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import get_state_cache
+
+
+# App label of the model DatabaseCache reads its table through
+CACHE_APP_LABEL = 'django_cache'
+
+# Alias reads of the current request go to (None means the default routing)
+_read_alias: ContextVar[Optional[str]] = ContextVar('read_alias', default=None)
+
+
+def replica_alias() -> Optional[str]:
+    """The configured replica alias, or None when there is no replica."""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+# =============================================================================
+# READ-YOUR-WRITES PINNING
+# =============================================================================
+
+def _pin_key(user_id: int) -> str:
+    return f'replica:pinned:{user_id}'
+
+
+def pin_reads_to_primary(user_id: int) -> None:
+    """
+    Send a user's reads to the primary for the next few seconds.
+
+    Args:
+        user_id: ID of the user who just wrote
+    """
+    if replica_alias() is None:
+        return
+    get_state_cache().set(_pin_key(user_id), True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id: Optional[int]) -> bool:
+    """
+    Whether a user wrote recently enough that the replica may not have it yet.
+
+    Always True while the state cache is process-local with several
+    workers (settings.ANALYTICS_CACHE_ENABLED is False) - a pin set by
+    another worker would go unseen.
+    """
+    if not settings.ANALYTICS_CACHE_ENABLED:
+        return True
+    return user_id is not None and bool(get_state_cache().get(_pin_key(user_id)))
+
+
+# =============================================================================
+# ROUTER AND VIEW MIXIN
+# =============================================================================
+
+class ReadReplicaRouter:
+    """Route the reads of replica-eligible requests to the replica; writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            # Data versions and pins must never be read from a lagging replica
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so objects read from the replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Run an APIView's safe requests on the replica.
+
+    The decision is made after authentication, so a user pinned to the
+    primary by a recent write is recognised.
+    """
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        alias = replica_alias()
+        if alias and request.method in SAFE_METHODS and not is_pinned_to_primary(request.user.pk):
+            self._replica_token = _read_alias.set(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            _read_alias.reset(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
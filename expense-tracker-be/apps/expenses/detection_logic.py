@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 from django.db.models import QuerySet
+from .helpers import normalize_title
 from .models import Expense
+from .title_matching import fuzzy_matching_enabled, similar_titles
 
 # "Golden List" of keywords that strongly suggest recurring expenses
 RECURRING_KEYWORDS = [
@@ -36,14 +38,21 @@ def analyze_expense(user, title: str, amount, current_date: date) -> tuple[bool,
     Returns: (is_recurring, frequency)
     """
     
-    # 1. Fetch recent expenses with same title (case-insensitive)
-    # We look for up to 3 previous entries to establish a pattern
-    recent_expenses = Expense.objects.filter(
+    # 1. Fetch recent expenses with the same normalized title
+    # ("Netflix", "netflix " and "NETFLIX." match). We look for up to 3
+    # previous entries to establish a pattern - one index seek on
+    # (user, normalized_title, -date)
+    if fuzzy_matching_enabled():
+        # "Meralco bill" also matches "Meralco Bill Jan" (trigram index lookup)
+        title_filter = {'normalized_title__in': similar_titles(user, title)}
+    else:
+        title_filter = {'normalized_title': normalize_title(title)}
+    recent_expenses = list(Expense.objects.filter(
         user=user,
-        title__iexact=title
-    ).order_by('-date')[:3]
+        **title_filter
+    ).order_by('-date').only('date')[:3])
 
-    if not recent_expenses.exists():
+    if not recent_expenses:
         return False, None
 
     last_expense = recent_expenses[0]
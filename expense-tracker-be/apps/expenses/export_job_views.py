@@ -0,0 +1,120 @@
+"""
+Background export jobs: queue an export, poll its progress, download the file.
+
+The file is generated by the export worker (see export_jobs.py), so large
+exports don't hold a web worker for their whole run.
+"""
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .export_jobs import ExportJobLimitError, delete_export_job, export_file_path, submit_export_job
+from .exporters import EXPORT_FORMATS, ExportParamError, export_filename, parse_export_params
+from .helpers import error_response, success_payload, success_response
+from .models import ExportJob
+from .serializers import ExportJobSerializer
+
+
+# Jobs listed by GET /api/export/jobs/
+MAX_LISTED_JOBS = 20
+
+
+class ExportJobListView(APIView):
+    """
+    List the user's recent export jobs, or queue a new one.
+
+    POST Body (the query parameters of GET /api/export/):
+    - export_format: 'csv', 'xlsx', 'pdf', 'ndjson', 'parquet' or 'arrow' (default 'csv')
+    - start_date / end_date: YYYY-MM-DD. Optional.
+    - category: Category ID. Optional.
+
+    POST returns 202 with the pending job; poll GET /api/export/jobs/<id>/
+    until its status is "completed", then fetch its download_url. A user
+    may have settings.EXPORT_JOBS_PER_USER jobs queued or running at once.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            jobs = ExportJob.objects.filter(user=request.user).order_by('-created_at')[:MAX_LISTED_JOBS]
+            return success_response(data=ExportJobSerializer(jobs, many=True).data)
+
+        except Exception as e:
+            return error_response(
+                message="Failed to list export jobs",
+                detail=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def post(self, request):
+        try:
+            export_format, filters, filters_applied = parse_export_params(request.data, request.user)
+            job = submit_export_job(request.user, export_format, filters, filters_applied)
+            return Response(
+                success_payload(data=ExportJobSerializer(job).data),
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        except ExportParamError as e:
+            return error_response(message=e.message, status_code=status.HTTP_400_BAD_REQUEST)
+        except ExportJobLimitError as e:
+            return error_response(message=str(e), status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+        except Exception as e:
+            return error_response(
+                message="Failed to queue export",
+                detail=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ExportJobDetailView(APIView):
+    """Status and progress of an export job (GET), or cancel/delete it (DELETE)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = ExportJob.objects.filter(pk=pk, user=request.user).first()
+        if job is None:
+            return error_response(message="Export job not found", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(data=ExportJobSerializer(job).data)
+
+    def delete(self, request, pk):
+        job = ExportJob.objects.filter(pk=pk, user=request.user).first()
+        if job is None:
+            return error_response(message="Export job not found", status_code=status.HTTP_404_NOT_FOUND)
+        if not delete_export_job(job):
+            return error_response(
+                message="The export is running and can't be cancelled",
+                status_code=status.HTTP_409_CONFLICT
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ExportJobDownloadView(APIView):
+    """Download the file of a completed export job."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = ExportJob.objects.filter(pk=pk, user=request.user).first()
+        if job is None:
+            return error_response(message="Export job not found", status_code=status.HTTP_404_NOT_FOUND)
+        if job.status in ExportJob.ACTIVE_STATUSES:
+            return error_response(message="The export is not ready yet", status_code=status.HTTP_409_CONFLICT)
+        if job.status != ExportJob.STATUS_COMPLETED:
+            return error_response(
+                message=f"The export {job.status} - queue it again",
+                status_code=status.HTTP_410_GONE
+            )
+
+        try:
+            output = open(export_file_path(job), 'rb')
+        except FileNotFoundError:
+            return error_response(message="The export file is no longer available", status_code=status.HTTP_410_GONE)
+
+        response = FileResponse(output, content_type=EXPORT_FORMATS[job.export_format]['content_type'])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{export_filename(job.export_format, job.created_at)}"'
+        )
+        response['Access-Control-Expose-Headers'] = 'Content-Disposition'
+        return response
@@ -0,0 +1,239 @@
+"""
+Background export jobs.
+
+Large XLSX and PDF exports take longer than a request should hold a
+gunicorn worker (and than proxies wait), so clients can queue them:
+POST /api/export/jobs/ stores the validated format and filters as an
+ExportJob, and a worker process (`manage.py run_export_worker`) writes the
+file to settings.EXPORT_STORAGE_DIR. The database is the queue - workers
+claim the oldest pending job with SELECT ... FOR UPDATE SKIP LOCKED, so
+several can run side by side without a broker.
+
+Clients poll the job for its status and progress, then download the file.
+Files expire after settings.EXPORT_JOB_TTL seconds; cleanup_export_jobs
+(run by the worker) deletes them and fails jobs abandoned by a stopped
+worker.
+"""
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .export_rows import ExportRows
+from .exporters import EXPORT_WRITERS
+from .models import ExportJob
+
+
+# Seconds between progress updates of a running job
+PROGRESS_INTERVAL = 1.0
+
+# Days expired and failed jobs stay listed before they are deleted
+JOB_HISTORY_DAYS = 7
+
+
+class ExportJobLimitError(Exception):
+    """The user already has settings.EXPORT_JOBS_PER_USER jobs queued or running."""
+
+
+def export_file_path(job: ExportJob) -> Path:
+    """Where the worker writes a job's file."""
+    return Path(settings.EXPORT_STORAGE_DIR) / f'export-{job.pk}.{job.export_format}'
+
+
+def _partial_path(path: Path) -> Path:
+    return path.with_name(f'{path.name}.part')
+
+
+# =============================================================================
+# SUBMITTING
+# =============================================================================
+
+def submit_export_job(user, export_format: str, filters: Dict[str, object], filters_applied: List[str]) -> ExportJob:
+    """
+    Queue an export for the worker.
+
+    Args:
+        user: User exporting
+        export_format: Export format (see exporters.EXPORT_FORMATS)
+        filters: Expense lookups from exporters.parse_export_params
+        filters_applied: Descriptions of the applied filters
+
+    Returns:
+        ExportJob: The pending job
+
+    Raises:
+        ExportJobLimitError: If the user has too many jobs queued or running
+    """
+    with transaction.atomic():
+        # Locking the user row serializes concurrent submissions, so two
+        # requests can't both pass the count and exceed the limit
+        get_user_model().objects.select_for_update().only('pk').get(pk=user.pk)
+
+        active = ExportJob.objects.filter(user=user, status__in=ExportJob.ACTIVE_STATUSES).count()
+        if active >= settings.EXPORT_JOBS_PER_USER:
+            raise ExportJobLimitError(
+                f'You already have {active} exports in progress - wait for them to finish'
+            )
+
+        return ExportJob.objects.create(
+            user=user,
+            export_format=export_format,
+            # Dates are stored as ISO strings (JSON)
+            filters={key: value.isoformat() if isinstance(value, date) else value for key, value in filters.items()},
+            filters_applied=filters_applied,
+        )
+
+
+def delete_export_job(job: ExportJob) -> bool:
+    """
+    Cancel a pending job or delete a finished one with its file.
+
+    Returns:
+        bool: False if the job is running (it can't be interrupted)
+    """
+    deleted, _ = ExportJob.objects.filter(pk=job.pk).exclude(status=ExportJob.STATUS_RUNNING).delete()
+    if not deleted:
+        return False
+    export_file_path(job).unlink(missing_ok=True)
+    return True
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def claim_next_job() -> Optional[ExportJob]:
+    """
+    Mark the oldest pending job as running and return it.
+
+    Rows locked by another worker are skipped, so concurrent workers never
+    claim the same job.
+
+    Returns:
+        Optional[ExportJob]: The claimed job, or None if the queue is empty
+    """
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJob.STATUS_PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+class _ProgressRows:
+    """ExportRows of a job that record how many rows a writer has read."""
+
+    def __init__(self, job: ExportJob, rows: ExportRows):
+        self.job = job
+        self.rows = rows
+        self.total = rows.count()
+        self.written = 0
+        ExportJob.objects.filter(pk=job.pk).update(rows_total=self.total)
+
+    def count(self) -> int:
+        return self.total
+
+    def category_totals(self):
+        return self.rows.category_totals()
+
+    def __iter__(self) -> Iterator:
+        self.written = 0
+        last_update = time.monotonic()
+        for row in self.rows:
+            yield row
+            self.written += 1
+            if time.monotonic() - last_update >= PROGRESS_INTERVAL:
+                ExportJob.objects.filter(pk=self.job.pk).update(rows_written=self.written)
+                last_update = time.monotonic()
+
+
+def run_export_job(job: ExportJob) -> None:
+    """
+    Write a claimed job's file and mark the job completed (or failed).
+
+    The file is written under a temporary name and renamed when complete,
+    so a download never sees a partial file.
+
+    Raises:
+        Exception: Whatever made the export fail, after the job was marked failed
+    """
+    path = export_file_path(job)
+    partial = _partial_path(path)
+    running = ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_RUNNING)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        filters = {
+            key: date.fromisoformat(value) if key.startswith('date__') else value
+            for key, value in job.filters.items()
+        }
+        rows = _ProgressRows(job, ExportRows(job.user, filters))
+        with open(partial, 'wb') as output:
+            EXPORT_WRITERS[job.export_format](rows, job.filters_applied, output)
+        os.replace(partial, path)
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        running.update(status=ExportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+        raise
+
+    finished_at = timezone.now()
+    updated = running.update(
+        status=ExportJob.STATUS_COMPLETED,
+        rows_written=rows.written,
+        file_size=path.stat().st_size,
+        finished_at=finished_at,
+        expires_at=finished_at + timedelta(seconds=settings.EXPORT_JOB_TTL),
+    )
+    if not updated:
+        # Deleted, or given up on by cleanup_export_jobs, while it ran
+        path.unlink(missing_ok=True)
+
+
+def cleanup_export_jobs() -> Dict[str, int]:
+    """
+    Expire old files, fail abandoned jobs and forget old jobs.
+
+    Returns:
+        Dict with the numbers of jobs "expired", "abandoned" and "deleted"
+    """
+    now = timezone.now()
+
+    expired = 0
+    for job in ExportJob.objects.filter(status=ExportJob.STATUS_COMPLETED, expires_at__lte=now):
+        export_file_path(job).unlink(missing_ok=True)
+        expired += ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_COMPLETED).update(
+            status=ExportJob.STATUS_EXPIRED
+        )
+
+    # A worker that was killed mid-export leaves its job running
+    abandoned = 0
+    stale = ExportJob.objects.filter(
+        status=ExportJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT),
+    )
+    for job in stale:
+        _partial_path(export_file_path(job)).unlink(missing_ok=True)
+        abandoned += ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_RUNNING).update(
+            status=ExportJob.STATUS_FAILED,
+            error='The export worker stopped before finishing',
+            finished_at=now,
+        )
+
+    deleted, _ = ExportJob.objects.filter(
+        status__in=[ExportJob.STATUS_EXPIRED, ExportJob.STATUS_FAILED],
+        finished_at__lt=now - timedelta(days=JOB_HISTORY_DAYS),
+    ).delete()
+
+    return {"expired": expired, "abandoned": abandoned, "deleted": deleted}
@@ -0,0 +1,580 @@
+"""
+File writers of the expense exports (CSV, XLSX, PDF, NDJSON, Parquet and
+Arrow IPC).
+
+Shared by the export endpoint, which sends the file right away, and the
+export worker (export_jobs.py), which writes it to the export storage.
+Every writer reads its expenses from ExportRows (export_rows.py).
+
+CSV, XLSX and PDF are reports for people (title, filters, summary).
+NDJSON, Parquet and Arrow are for analytics tools: the rows only, with
+typed columns and no decoration.
+"""
+import csv
+import json
+import os
+from datetime import datetime, date
+from decimal import Decimal
+from itertools import chain, islice
+from typing import BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Parquet and Arrow exports are unavailable without it
+    pyarrow = None
+
+from . import pdf_report
+from .helpers import cents_to_float, format_cents
+from .models import Category
+
+
+# Content type and file name prefix of every export format
+EXPORT_FORMATS = {
+    'csv': {'content_type': 'text/csv', 'filename': 'expenses'},
+    'xlsx': {
+        'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'filename': 'expenses',
+    },
+    'pdf': {'content_type': 'application/pdf', 'filename': 'expense_report'},
+    'ndjson': {'content_type': 'application/x-ndjson', 'filename': 'expenses'},
+    'parquet': {'content_type': 'application/vnd.apache.parquet', 'filename': 'expenses'},
+    'arrow': {'content_type': 'application/vnd.apache.arrow.file', 'filename': 'expenses'},
+}
+
+# Formats written with pyarrow (in requirements.txt; still guarded at import)
+PYARROW_FORMATS = ('parquet', 'arrow')
+
+EXPORT_COLUMNS = ['ID', 'Date', 'Title', 'Description', 'Category', 'Amount', 'Recurring', 'Frequency']
+
+# CSV lines sent to the client per chunk of a streamed export
+CSV_LINES_PER_CHUNK = 500
+
+# Rows the XLSX column widths are estimated from
+XLSX_WIDTH_SAMPLE = 1000
+
+# NDJSON records sent to the client per chunk of a streamed export
+NDJSON_LINES_PER_CHUNK = 500
+
+# Rows per Arrow record batch, and so per Parquet row group
+ARROW_BATCH_ROWS = 10000
+
+# Precision of Expense.amount
+AMOUNT_DIGITS, AMOUNT_DECIMALS = 10, 2
+
+_THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+# Quoted - a bare "H" would make Excel read the amount as an hour
+XLSX_AMOUNT_FORMAT = '"PHP" #,##0.00'
+
+# Named styles of the XLSX export, registered once per workbook
+XLSX_STYLES = {
+    'export_title': {'font': Font(bold=True, size=14)},
+    'export_info': {'font': Font(italic=True, size=10)},
+    'export_header': {
+        'font': Font(bold=True, color="FFFFFF"),
+        'fill': PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        'alignment': Alignment(horizontal="center", vertical="center"),
+        'border': _THIN_BORDER,
+    },
+    'export_cell': {'border': _THIN_BORDER},
+    'export_amount': {'border': _THIN_BORDER, 'number_format': XLSX_AMOUNT_FORMAT},
+    'export_bold': {'font': Font(bold=True)},
+    'export_total': {'number_format': XLSX_AMOUNT_FORMAT},
+}
+
+
+class ExportParamError(Exception):
+    """Invalid export parameters, with a short error title and a message for the user."""
+
+    def __init__(self, error: str, message: str):
+        super().__init__(message)
+        self.error = error
+        self.message = message
+
+
+# =============================================================================
+# PARAMETERS
+# =============================================================================
+
+def _param(params: Mapping, name: str, default: str = '') -> str:
+    value = params.get(name)
+    return default if value is None else str(value).strip()
+
+
+def parse_export_params(params: Mapping, user) -> Tuple[str, Dict[str, object], List[str]]:
+    """
+    Validate the parameters of an export.
+
+    Args:
+        params: Query parameters or request body (export_format, start_date,
+            end_date, category)
+        user: User exporting (category names are looked up among theirs)
+
+    Returns:
+        Tuple of the export format, the expense lookups (date__gte,
+        date__lte, category_id) and descriptions of the applied filters
+
+    Raises:
+        ExportParamError: If a parameter is invalid
+    """
+    export_format = _param(params, 'export_format', 'csv').lower()
+    start_date = _param(params, 'start_date')
+    end_date = _param(params, 'end_date')
+    category_id = _param(params, 'category')
+
+    # Validate format (only required field)
+    if export_format not in EXPORT_FORMATS:
+        raise ExportParamError(
+            'Invalid format',
+            f"Invalid export_format. Supported formats: {', '.join(EXPORT_FORMATS)}"
+        )
+    if export_format in PYARROW_FORMATS and pyarrow is None:
+        raise ExportParamError(
+            'Format unavailable',
+            f"{export_format} exports need pyarrow, which is not installed on this server"
+        )
+
+    # Expense lookups, applied to the live and (when the range reaches
+    # into it) the archived expenses
+    filters = {}
+
+    # Track applied filters for response metadata
+    filters_applied = []
+
+    # Date filtering with smart defaults
+    start = None
+    end = None
+
+    if start_date:
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            filters['date__gte'] = start
+            filters_applied.append(f"Start Date: {start_date}")
+        except ValueError:
+            raise ExportParamError(
+                'Invalid date format',
+                'Invalid start_date format. Please use YYYY-MM-DD (e.g., 2025-01-01)'
+            )
+
+    # If start_date is provided but end_date is not, default end_date to current date
+    if start_date and not end_date:
+        end = date.today()
+        filters['date__lte'] = end
+        filters_applied.append(f"End Date: {end.strftime('%Y-%m-%d')} (today)")
+    elif end_date:
+        try:
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            filters['date__lte'] = end
+            filters_applied.append(f"End Date: {end_date}")
+        except ValueError:
+            raise ExportParamError(
+                'Invalid date format',
+                'Invalid end_date format. Please use YYYY-MM-DD (e.g., 2025-12-31)'
+            )
+
+    # Validate date range
+    if start and end and start > end:
+        raise ExportParamError('Invalid date range', 'Start date cannot be after end date')
+
+    if category_id:
+        try:
+            cat_id = int(category_id)
+        except ValueError:
+            raise ExportParamError('Invalid category', 'Category ID must be a valid number')
+        filters['category_id'] = cat_id
+        # Get category name for display
+        try:
+            category = Category.objects.get(id=cat_id, user=user)
+            filters_applied.append(f"Category: {category.name}")
+        except Category.DoesNotExist:
+            filters_applied.append(f"Category ID: {cat_id}")
+
+    return export_format, filters, filters_applied
+
+
+def export_filename(export_format: str, when: Optional[datetime] = None) -> str:
+    """Download file name of an export, timestamped (now unless given)."""
+    timestamp = (when or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{EXPORT_FORMATS[export_format]['filename']}_{timestamp}.{export_format}"
+
+
+# =============================================================================
+# ROWS
+# =============================================================================
+
+def expense_values(expense) -> list:
+    """Export values of one expense (an ExportRow), in EXPORT_COLUMNS order."""
+    return [
+        expense.id,
+        expense.date.strftime('%Y-%m-%d'),
+        expense.title,
+        expense.description or '',
+        expense.category_name or 'Uncategorized',
+        cents_to_float(expense.amount_cents),
+        'Yes' if expense.is_recurring else 'No',
+        expense.recurring_frequency or 'N/A',
+    ]
+
+
+def get_expense_data(expenses) -> List[dict]:
+    """Convert expense rows to list of dictionaries for export."""
+    return [dict(zip(EXPORT_COLUMNS, expense_values(expense))) for expense in expenses]
+
+
+def expense_record(expense) -> dict:
+    """
+    Typed record of one expense (an ExportRow) for the analytics formats.
+
+    Unlike expense_values, missing values stay null instead of being
+    replaced by 'Uncategorized' or 'N/A'. The amount is an exact decimal
+    string ("10.05"), matching the decimal128 column of Parquet and Arrow.
+    """
+    return {
+        'id': expense.id,
+        'date': expense.date.isoformat(),
+        'title': expense.title,
+        'description': expense.description,
+        'category': expense.category_name,
+        'amount': format_cents(expense.amount_cents),
+        'is_recurring': expense.is_recurring,
+        'recurring_frequency': expense.recurring_frequency,
+    }
+
+
+# =============================================================================
+# CSV
+# =============================================================================
+
+class _Echo:
+    """File-like object that hands the lines written by csv.writer back."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(rows, filters_applied: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    The CSV export as chunks of lines, for a streamed response.
+
+    Rows are read from a database iterator and written out in chunks while
+    the summary totals are added up, so memory stays flat however many
+    expenses are exported and the first lines go out before any query runs.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Descriptions of the applied filters
+
+    Yields:
+        str: CSV text
+    """
+    writer = csv.writer(_Echo())
+
+    # Add header info (sent before the first query runs)
+    header = [writer.writerow(['SpendWise - Expense Report'])]
+    header.append(writer.writerow([f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}']))
+    if filters_applied:
+        header.append(writer.writerow([f'Filters: {", ".join(filters_applied)}']))
+    else:
+        header.append(writer.writerow(['Filters: All expenses (no filters applied)']))
+    yield ''.join(header)
+
+    total_records = rows.count()
+    header = [writer.writerow([f'Total Records: {total_records}'])]
+    header.append(writer.writerow([]))  # Empty row
+    if not total_records:
+        header.append(writer.writerow(['No expenses found matching your criteria']))
+        yield ''.join(header)
+        return
+
+    # Write data, adding up the summary on the way
+    header.append(writer.writerow(EXPORT_COLUMNS))
+    yield ''.join(header)
+
+    total_cents = 0
+    count = 0
+    lines = []
+    for expense in rows:
+        total_cents += expense.amount_cents
+        count += 1
+        lines.append(writer.writerow(expense_values(expense)))
+        if len(lines) == CSV_LINES_PER_CHUNK:
+            yield ''.join(lines)
+            lines = []
+
+    # Add summary
+    total_amount = cents_to_float(total_cents)
+    lines.append(writer.writerow([]))
+    lines.append(writer.writerow(['Summary']))
+    lines.append(writer.writerow([f'Total Amount: PHP {total_amount:.2f}']))
+    lines.append(writer.writerow([f'Number of Expenses: {count}']))
+    if count:
+        avg_amount = total_amount / count
+        lines.append(writer.writerow([f'Average Amount: PHP {avg_amount:.2f}']))
+    yield ''.join(lines)
+
+
+def write_csv(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """Write the CSV export to a binary file (UTF-8)."""
+    for chunk in csv_chunks(rows, filters_applied):
+        output.write(chunk.encode('utf-8'))
+
+
+# =============================================================================
+# XLSX
+# =============================================================================
+
+def write_xlsx(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """
+    Write the XLSX (Excel) export.
+
+    The workbook is written in openpyxl's write-only mode: each row is
+    serialized as it is appended, through styled cells prepared once per
+    column, so memory stays bounded. Column widths are estimated from the
+    first XLSX_WIDTH_SAMPLE rows.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Descriptions of the applied filters
+        output: Binary file the workbook is saved to
+    """
+    wb = Workbook(write_only=True)
+    for name, attributes in XLSX_STYLES.items():
+        wb.add_named_style(NamedStyle(name=name, **attributes))
+    ws = wb.create_sheet("Expenses")
+
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    # Widths must be set before the first row is written
+    remaining = iter(rows)
+    sample = list(islice(remaining, XLSX_WIDTH_SAMPLE))
+    for col_num, header in enumerate(EXPORT_COLUMNS, 1):
+        max_length = max(
+            [len(header)] + [len(str(values[col_num - 1])) for values in map(expense_values, sample)]
+        )
+        ws.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
+
+    # Add report header info
+    ws.append([styled('SpendWise - Expense Report', 'export_title')])
+    ws.append([styled(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', 'export_info')])
+    if filters_applied:
+        ws.append([styled(f'Filters: {", ".join(filters_applied)}', 'export_info')])
+    else:
+        ws.append([styled('Filters: All expenses (no filters applied)', 'export_info')])
+    # A COUNT query is only needed when the sample didn't hold every row
+    total_records = len(sample) if len(sample) < XLSX_WIDTH_SAMPLE else rows.count()
+    ws.append([styled(f'Total Records: {total_records}', 'export_info')])
+    ws.append([])
+
+    if not sample:
+        ws.append(['No expenses found matching your criteria'])
+    else:
+        # Write headers
+        ws.append([styled(header, 'export_header') for header in EXPORT_COLUMNS])
+
+        # Write data through one reused cell per column - append()
+        # serializes the row right away
+        cells = [
+            styled(None, 'export_amount' if header == 'Amount' else 'export_cell')
+            for header in EXPORT_COLUMNS
+        ]
+        total_cents = 0
+        count = 0
+        for expense in chain(sample, remaining):
+            total_cents += expense.amount_cents
+            count += 1
+            for cell, value in zip(cells, expense_values(expense)):
+                cell.value = value
+            ws.append(cells)
+
+        # Add summary section
+        total_amount = cents_to_float(total_cents)
+        ws.append([])
+        ws.append([styled("Summary", 'export_bold')])
+        ws.append(["Total Expenses:", styled(total_amount, 'export_total')])
+        ws.append(["Number of Expenses:", count])
+        avg_amount = total_amount / count
+        ws.append(["Average Amount:", styled(avg_amount, 'export_total')])
+
+    wb.save(output)
+
+
+# =============================================================================
+# PDF
+# =============================================================================
+
+def write_pdf(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """
+    Write the PDF export - professional and presentable layout.
+
+    The summary is aggregated by the database and the transactions are laid
+    out a page at a time as they are read (see pdf_report.py). Reports of
+    settings.EXPORT_PDF_PARALLEL_ROWS rows or more are rendered by up to
+    settings.EXPORT_PDF_WORKERS processes when pypdf is installed.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Descriptions of the applied filters
+        output: Binary file the document is written to
+    """
+    category_cents = {}
+    count = 0
+    for name, (category_count, cents) in rows.category_totals().items():
+        name = name or 'Uncategorized'
+        category_cents[name] = category_cents.get(name, 0) + cents
+        count += category_count
+    category_totals = {name: cents_to_float(cents) for name, cents in category_cents.items()}
+
+    head = pdf_report.report_head(
+        filters_applied, count, cents_to_float(sum(category_cents.values())), category_totals
+    )
+    cells = (
+        pdf_report.transaction_cells(number, expense_values(expense))
+        for number, expense in enumerate(rows, 1)
+    )
+
+    workers = min(settings.EXPORT_PDF_WORKERS, os.cpu_count() or 1)
+    if count >= settings.EXPORT_PDF_PARALLEL_ROWS and workers > 1 and pdf_report.can_render_parallel():
+        pdf_report.render_parallel(output, head, cells, count, workers)
+    else:
+        pdf_report.render(output, head, cells, count)
+
+
+# =============================================================================
+# NDJSON
+# =============================================================================
+
+def ndjson_chunks(rows, filters_applied: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    The NDJSON export (one expense_record per line) as chunks, for a streamed response.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Unused - the file holds the rows only
+
+    Yields:
+        str: JSON lines
+    """
+    lines = []
+    for expense in rows:
+        lines.append(json.dumps(expense_record(expense), ensure_ascii=False) + '\n')
+        if len(lines) == NDJSON_LINES_PER_CHUNK:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def write_ndjson(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """Write the NDJSON export to a binary file (UTF-8)."""
+    for chunk in ndjson_chunks(rows, filters_applied):
+        output.write(chunk.encode('utf-8'))
+
+
+# =============================================================================
+# PARQUET / ARROW
+# =============================================================================
+
+def arrow_schema():
+    """Column types of the Parquet and Arrow exports (field names as in expense_record)."""
+    return pyarrow.schema([
+        pyarrow.field('id', pyarrow.int64(), nullable=False),
+        pyarrow.field('date', pyarrow.date32(), nullable=False),
+        pyarrow.field('title', pyarrow.string(), nullable=False),
+        pyarrow.field('description', pyarrow.string()),
+        pyarrow.field('category', pyarrow.string()),
+        pyarrow.field('amount', pyarrow.decimal128(AMOUNT_DIGITS, AMOUNT_DECIMALS), nullable=False),
+        pyarrow.field('is_recurring', pyarrow.bool_(), nullable=False),
+        pyarrow.field('recurring_frequency', pyarrow.string()),
+    ])
+
+
+def arrow_batches(rows, schema) -> Iterator:
+    """
+    The rows as Arrow record batches of ARROW_BATCH_ROWS rows.
+
+    Each batch is built column by column from the row tuples, so only one
+    batch of rows is held at a time.
+
+    Args:
+        rows: ExportRows of the export
+        schema: arrow_schema()
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, ARROW_BATCH_ROWS))
+        if not batch:
+            return
+        ids, dates, titles, descriptions, categories, cents, recurring, frequencies = zip(*batch)
+        # Exact decimals, scaled from the integer cents
+        amounts = [Decimal(amount_cents).scaleb(-AMOUNT_DECIMALS) for amount_cents in cents]
+        columns = [ids, dates, titles, descriptions, categories, amounts, recurring, frequencies]
+        yield pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def write_parquet(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """
+    Write the Parquet export, one row group per record batch.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Unused - the file holds the rows only
+        output: Binary file the document is written to
+    """
+    schema = arrow_schema()
+    with pyarrow.parquet.ParquetWriter(output, schema, compression='zstd') as writer:
+        for batch in arrow_batches(rows, schema):
+            writer.write_batch(batch)
+
+
+def write_arrow(rows, filters_applied: Optional[List[str]], output: BinaryIO) -> None:
+    """
+    Write the Arrow IPC file (Feather v2) export, with zstd-compressed buffers.
+
+    Args:
+        rows: ExportRows of the export
+        filters_applied: Unused - the file holds the rows only
+        output: Binary file the document is written to
+    """
+    schema = arrow_schema()
+    options = pyarrow.ipc.IpcWriteOptions(compression='zstd')
+    with pyarrow.ipc.new_file(output, schema, options=options) as writer:
+        for batch in arrow_batches(rows, schema):
+            writer.write_batch(batch)
+
+
+EXPORT_WRITERS = {
+    'csv': write_csv,
+    'xlsx': write_xlsx,
+    'pdf': write_pdf,
+    'ndjson': write_ndjson,
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+}
+
+# Formats the export endpoint streams as they are generated
+EXPORT_STREAMS = {
+    'csv': csv_chunks,
+    'ndjson': ndjson_chunks,
+}
@@ -3,8 +3,10 @@ Helper functions and utilities for the expenses app.
 Includes validation, formatting, and data processing utilities.
 """
 import re
+import statistics
+from bisect import bisect_left
 from datetime import date, timedelta
-from decimal import Decimal, InvalidOperation
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from typing import Tuple, Optional, Any, List, Dict
 
 from rest_framework.response import Response
@@ -18,8 +20,18 @@ from rest_framework import status
 MAX_MONTHS_LOOKBACK = 12
 MAX_WEEKS_LOOKBACK = 52
 MAX_CATEGORIES = 10
+MAX_PIVOT_CATEGORIES = 25
 MAX_RECORDS_PER_QUERY = 10000
 
+# Trend buckets, finest first; ranges that would exceed MAX_TREND_POINTS
+# buckets are coarsened to the next bucket size
+TREND_BUCKETS = ['day', 'week', 'month', 'quarter', 'year']
+MAX_TREND_POINTS = 120
+
+# Heatmap range limit and number of non-zero intensity levels
+MAX_HEATMAP_DAYS = 731
+HEATMAP_LEVELS = 4
+
 # Year range for validation
 MIN_YEAR = 2000
 MAX_YEAR = 2100
@@ -101,6 +113,87 @@ def safe_round(value: Any, decimals: int = 2) -> float:
     return round(safe_float(value), decimals)
 
 
+# =============================================================================
+# MINOR UNITS (CENTS)
+# =============================================================================
+
+CENT = Decimal('0.01')
+
+
+def to_cents(value: Any) -> int:
+    """
+    Convert an amount to integer cents (Decimal('12.34') -> 1234).
+    
+    Half cents round away from zero, like the DecimalField quantization
+    of the stored amounts.
+    
+    Args:
+        value: Amount (Decimal, int, float or numeric string); None counts as 0
+        
+    Returns:
+        int: The amount in cents
+    """
+    if value is None:
+        return 0
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def cents_to_float(cents: Optional[int]) -> float:
+    """
+    Convert integer cents to a float amount for a response (1234 -> 12.34).
+    
+    A single correctly rounded division, so the result equals
+    float(Decimal('12.34')) without building a Decimal.
+    
+    Args:
+        cents: Amount in cents (None counts as 0)
+        
+    Returns:
+        float: The amount
+    """
+    return (cents or 0) / 100
+
+
+def format_cents(cents: Optional[int]) -> str:
+    """
+    Format integer cents as a plain two-decimal string (123456 -> "1234.56").
+    
+    Args:
+        cents: Amount in cents (None counts as 0)
+        
+    Returns:
+        str: The formatted amount
+    """
+    cents = cents or 0
+    units, remainder = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{units}.{remainder:02d}"
+
+
+# =============================================================================
+# TEXT NORMALIZATION
+# =============================================================================
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Normalize an expense title for matching ("NETFLIX.", " netflix " -> "netflix").
+    
+    Casefolds, replaces punctuation and symbols with spaces and collapses
+    runs of whitespace.
+    
+    Args:
+        title: Title to normalize
+        
+    Returns:
+        str: Normalized title ('' for empty input)
+    """
+    if not title:
+        return ''
+    
+    return ' '.join(re.sub(r'[^\w\s]|_', ' ', title.casefold()).split())
+
+
 # =============================================================================
 # DATE VALIDATION & PARSING
 # =============================================================================
@@ -184,6 +277,170 @@ def get_week_date_range(week_offset: int = 0) -> Tuple[date, date]:
     return start_of_week, end_of_week
 
 
+def add_months(month_start: date, months: int) -> date:
+    """
+    Shift the first day of a month by a number of months.
+    
+    Args:
+        month_start: First day of a month
+        months: Number of months to move (negative moves back)
+        
+    Returns:
+        date: First day of the resulting month
+    """
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_end(day: date) -> date:
+    """
+    Get the last day of the month a date falls in.
+    
+    Args:
+        day: Any date
+        
+    Returns:
+        date: Last day of that month
+    """
+    return add_months(day.replace(day=1), 1) - timedelta(days=1)
+
+
+def parse_range_bound(value: Optional[str], is_end: bool = False) -> Optional[date]:
+    """
+    Parse a range bound given as YYYY-MM-DD or YYYY-MM.
+    
+    Args:
+        value: String to parse
+        is_end: A bare month means its last day (instead of its first)
+        
+    Returns:
+        date: The parsed date, or None if invalid
+    """
+    if not value:
+        return None
+    
+    if validate_month_string(value):
+        start, end = parse_month_string(value)
+        return end if is_end else start
+    
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return None
+    
+    if not (MIN_YEAR <= parsed.year <= MAX_YEAR):
+        return None
+    return parsed
+
+
+# =============================================================================
+# TREND BUCKETS
+# =============================================================================
+
+def bucket_floor(day: date, bucket: str) -> date:
+    """
+    Get the first day of the bucket a date falls in (weeks start on Monday).
+    
+    Args:
+        day: Any date
+        bucket: One of TREND_BUCKETS
+        
+    Returns:
+        date: First day of the bucket
+    """
+    if bucket == 'day':
+        return day
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    if bucket == 'quarter':
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return date(day.year, 1, 1)
+
+
+def next_bucket(bucket_start: date, bucket: str) -> date:
+    """
+    Get the first day of the bucket following the given one.
+    
+    Args:
+        bucket_start: First day of a bucket
+        bucket: One of TREND_BUCKETS
+        
+    Returns:
+        date: First day of the next bucket
+    """
+    if bucket == 'day':
+        return bucket_start + timedelta(days=1)
+    if bucket == 'week':
+        return bucket_start + timedelta(weeks=1)
+    return add_months(bucket_start, {'month': 1, 'quarter': 3, 'year': 12}[bucket])
+
+
+def bucket_starts(start: date, end: date, bucket: str) -> List[date]:
+    """
+    List the first day of every bucket overlapping a date range.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: One of TREND_BUCKETS
+        
+    Returns:
+        List[date]: Bucket start dates, oldest first
+    """
+    starts = []
+    current = bucket_floor(start, bucket)
+    while current <= end:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def fit_trend_bucket(start: date, end: date, bucket: str, max_points: int = MAX_TREND_POINTS) -> str:
+    """
+    Coarsen a bucket size until a date range fits in max_points buckets.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: Requested bucket (one of TREND_BUCKETS)
+        max_points: Maximum number of buckets
+        
+    Returns:
+        str: The requested bucket, or the finest coarser one that fits
+    """
+    for candidate in TREND_BUCKETS[TREND_BUCKETS.index(bucket):]:
+        # Lower bound first, so a decade of days isn't enumerated just to be rejected
+        approximate = (end - start).days // {'day': 1, 'week': 7, 'month': 31, 'quarter': 92, 'year': 366}[candidate]
+        if approximate <= max_points and len(bucket_starts(start, end, candidate)) <= max_points:
+            return candidate
+    return TREND_BUCKETS[-1]
+
+
+def bucket_label(bucket_start: date, bucket: str) -> str:
+    """
+    Short display label of a bucket (e.g. 2025-W03, 2025-Q1).
+    
+    Args:
+        bucket_start: First day of the bucket
+        bucket: One of TREND_BUCKETS
+        
+    Returns:
+        str: Label
+    """
+    if bucket == 'day':
+        return bucket_start.isoformat()
+    if bucket == 'week':
+        year, week, _ = bucket_start.isocalendar()
+        return f'{year}-W{week:02d}'
+    if bucket == 'month':
+        return bucket_start.strftime('%Y-%m')
+    if bucket == 'quarter':
+        return f'{bucket_start.year}-Q{(bucket_start.month - 1) // 3 + 1}'
+    return str(bucket_start.year)
+
+
 def validate_week_offset(offset: Any) -> int:
     """
     Validate and normalize week offset.
@@ -224,6 +481,50 @@ def validate_months_count(months: Any) -> int:
     return months
 
 
+# =============================================================================
+# HEATMAP LEVELS
+# =============================================================================
+
+def quantile_thresholds(values: List[float], levels: int = HEATMAP_LEVELS) -> List[float]:
+    """
+    Split points dividing values into equally populated intensity levels.
+    
+    Args:
+        values: Non-zero values to rank (e.g. daily totals)
+        levels: Number of levels
+        
+    Returns:
+        List[float]: levels - 1 ascending thresholds (empty for no values)
+    """
+    if not values:
+        return []
+    if len(values) == 1:
+        return [values[0]] * (levels - 1)
+    return statistics.quantiles(values, n=levels, method='inclusive')
+
+
+def intensity_level(value: float, thresholds: List[float]) -> int:
+    """
+    Intensity level of a value: 0 for nothing, else 1 up to len(thresholds) + 1.
+
+    When every threshold is the same - a single day with spending, or all
+    days spending the same amount - there is no spread to rank by, and
+    those days get the top level rather than the lowest.
+    
+    Args:
+        value: Value to rank
+        thresholds: Output of quantile_thresholds
+        
+    Returns:
+        int: Intensity level
+    """
+    if value <= 0:
+        return 0
+    if thresholds and thresholds[0] == thresholds[-1] and value >= thresholds[-1]:
+        return len(thresholds) + 1
+    return bisect_left(thresholds, value) + 1
+
+
 # =============================================================================
 # RESPONSE HELPERS
 # =============================================================================
@@ -257,13 +558,13 @@ def error_response(
     return Response(response_data, status=status_code)
 
 
-def success_response(
+def success_payload(
     data: Any,
     meta: Optional[Dict] = None,
     summary: Optional[Dict] = None
-) -> Response:
+) -> Dict:
     """
-    Create a standardized success response.
+    Create a standardized success response body.
     
     Args:
         data: The response data
@@ -271,7 +572,7 @@ def success_response(
         summary: Summary statistics
         
     Returns:
-        Response: DRF Response object
+        Dict: Response body
     """
     response_data = {
         "success": True,
@@ -285,7 +586,26 @@ def success_response(
     
     response_data["data"] = data
     
-    return Response(response_data)
+    return response_data
+
+
+def success_response(
+    data: Any,
+    meta: Optional[Dict] = None,
+    summary: Optional[Dict] = None
+) -> Response:
+    """
+    Create a standardized success response.
+    
+    Args:
+        data: The response data
+        meta: Metadata about the response
+        summary: Summary statistics
+        
+    Returns:
+        Response: DRF Response object
+    """
+    return Response(success_payload(data, meta=meta, summary=summary))
 
 
 # =============================================================================
@@ -0,0 +1,47 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.expenses.archive import archive_cutoff, archive_expenses
+from apps.expenses.models import Expense
+
+
+class Command(BaseCommand):
+    help = 'Move expenses older than the archive cutoff to the archive table (run e.g. nightly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            type=date.fromisoformat,
+            help='Archive expenses dated before this date, YYYY-MM-DD '
+                 '(default: today minus EXPENSE_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only archive the expenses of this user ID',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Expenses moved per transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the expenses that would be archived',
+        )
+
+    def handle(self, *args, **options):
+        before = options['before'] or archive_cutoff()
+
+        if options['dry_run']:
+            expenses = Expense.objects.filter(date__lt=before)
+            if options['user'] is not None:
+                expenses = expenses.filter(user_id=options['user'])
+            self.stdout.write(f'{expenses.count()} expenses dated before {before} would be archived')
+            return
+
+        archived = archive_expenses(before, user_id=options['user'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} expenses dated before {before}'))
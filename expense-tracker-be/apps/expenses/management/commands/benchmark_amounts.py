@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+from apps.expenses.benchmarking import format_timing, seed_benchmark_user, time_call
+from apps.expenses.helpers import cents_to_float, safe_float, safe_round
+from apps.expenses.models import Expense
+
+
+class Command(BaseCommand):
+    help = 'Compare Decimal and integer-cents amount aggregation against a seeded user'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expenses',
+            type=int,
+            default=1000000,
+            help='Number of expenses to seed (default: 1000000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Timed runs per mode (default: 5)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded user instead of deleting it afterwards',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Seeding {options['expenses']} expenses...")
+        user = seed_benchmark_user(options['expenses'], days=730)
+        expenses = Expense.objects.filter(user=user).order_by()
+
+        def monthly(field, convert):
+            rows = expenses.annotate(month=TruncMonth('date')).values('month').annotate(spent=Sum(field))
+            return [(row['month'], convert(row['spent'])) for row in rows]
+
+        # What the export does per row: convert every amount, then total them
+        def export_loop_decimal():
+            amounts = [safe_float(value) for value in expenses.values_list('amount', flat=True).iterator(chunk_size=5000)]
+            return amounts, sum(amounts)
+
+        def export_loop_cents():
+            cents = list(expenses.values_list('amount_cents', flat=True).iterator(chunk_size=5000))
+            return [cents_to_float(value) for value in cents], cents_to_float(sum(cents))
+
+        try:
+            for label, decimal_call, cents_call in (
+                (
+                    'grand total',
+                    lambda: safe_round(expenses.aggregate(total=Sum('amount'))['total']),
+                    lambda: cents_to_float(expenses.aggregate(total=Sum('amount_cents'))['total']),
+                ),
+                (
+                    'per-month totals',
+                    lambda: monthly('amount', safe_round),
+                    lambda: monthly('amount_cents', cents_to_float),
+                ),
+                (
+                    'export row loop',
+                    export_loop_decimal,
+                    export_loop_cents,
+                ),
+            ):
+                decimal_timing = time_call(decimal_call, options['iterations'])
+                cents_timing = time_call(cents_call, options['iterations'])
+                self.stdout.write(format_timing(f'{label} (Decimal)', decimal_timing))
+                self.stdout.write(format_timing(f'{label} (cents)', cents_timing))
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label}: {decimal_timing['median'] / cents_timing['median']:.2f}x median speed-up"
+                ))
+        finally:
+            if options['keep']:
+                self.stdout.write(f'Kept benchmark user {user.username} (id {user.pk})')
+            else:
+                user.delete()
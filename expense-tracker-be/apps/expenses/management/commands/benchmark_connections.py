@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from rest_framework.test import APIClient
+
+from apps.expenses.benchmarking import format_timing, seed_benchmark_user, time_call
+from apps.expenses.cache import clear_analytics_cache
+
+
+ENDPOINTS = ['/api/expenses/', '/api/dashboard/summary/']
+
+
+class Command(BaseCommand):
+    help = 'Compare API latency with a new database connection per request and with persistent connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expenses',
+            type=int,
+            default=2000,
+            help='Number of expenses to seed (default: 2000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Timed requests per endpoint and mode (default: 200)',
+        )
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=600,
+            help='CONN_MAX_AGE for the persistent runs (default: 600)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded user instead of deleting it afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite opens a local file, not a network connection - '
+                'point the benchmark at PostgreSQL to see the difference'
+            ))
+
+        self.stdout.write(f"Seeding {options['expenses']} expenses...")
+        user = seed_benchmark_user(options['expenses'])
+        client = APIClient()
+        client.force_authenticate(user=user)
+        original = {
+            alias: (connections[alias].settings_dict['CONN_MAX_AGE'],
+                    connections[alias].settings_dict['CONN_HEALTH_CHECKS'])
+            for alias in connections
+        }
+
+        def request(path):
+            # The test client leaves connections open between requests;
+            # close_old_connections() is what request_started/finished run
+            # under a real server
+            close_old_connections()
+            response = client.get(path)
+            close_old_connections()
+            if response.status_code != 200:
+                raise RuntimeError(f'{path} returned {response.status_code}')
+
+        try:
+            for path in ENDPOINTS:
+                self.stdout.write(path)
+                timings = {}
+                for label, max_age, health_checks in (
+                    ('per request', 0, False),
+                    (f"persistent ({options['max_age']}s)", options['max_age'], True),
+                ):
+                    self._configure(max_age, health_checks)
+                    timings[label] = time_call(
+                        lambda: request(path),
+                        options['iterations'],
+                        # Every request misses the analytics cache, so each one queries
+                        setup=clear_analytics_cache,
+                    )
+                    self.stdout.write(format_timing(f'  {label}', timings[label]))
+
+                per_request, persistent = timings.values()
+                self.stdout.write(self.style.SUCCESS(
+                    f"  p50 {per_request['median'] - persistent['median']:+.2f} ms, "
+                    f"p99 {per_request['p99'] - persistent['p99']:+.2f} ms saved per request"
+                ))
+        finally:
+            for alias, (max_age, health_checks) in original.items():
+                connections[alias].settings_dict['CONN_MAX_AGE'] = max_age
+                connections[alias].settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+            if options['keep']:
+                self.stdout.write(f'Kept benchmark user {user.username} (id {user.pk})')
+            else:
+                user.delete()
+
+    def _configure(self, max_age, health_checks):
+        # A connection's expiry is fixed when it opens, so start afresh
+        for alias in connections:
+            connections[alias].close()
+            connections[alias].settings_dict['CONN_MAX_AGE'] = max_age
+            connections[alias].settings_dict['CONN_HEALTH_CHECKS'] = health_checks
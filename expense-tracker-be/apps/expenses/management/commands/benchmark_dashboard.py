@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.expenses.aggregations import DatabaseSpendingSource
+from apps.expenses.benchmarking import format_timing, seed_benchmark_user, time_call
+from apps.expenses.budget_alerts_view import build_budget_alerts
+from apps.expenses.concurrency import can_run_concurrently
+from apps.expenses.dashboard_views import build_dashboard_summary
+
+
+class Command(BaseCommand):
+    help = 'Compare sequential and concurrent dashboard query execution against a seeded user'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expenses',
+            type=int,
+            default=50000,
+            help='Number of expenses to seed (default: 50000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed runs per mode (default: 20)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.DASHBOARD_QUERY_WORKERS,
+            help='Pool size for the concurrent runs (default: DASHBOARD_QUERY_WORKERS)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded user instead of deleting it afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if not can_run_concurrently():
+            self.stdout.write(self.style.WARNING(
+                'This database runs dashboard queries sequentially (SQLite or an open '
+                'transaction) - both modes will take the same path'
+            ))
+
+        self.stdout.write(f"Seeding {options['expenses']} expenses...")
+        user = seed_benchmark_user(options['expenses'])
+        source = DatabaseSpendingSource(user)
+
+        try:
+            for label, build in (
+                ('dashboard summary', lambda workers: build_dashboard_summary(user, source, max_workers=workers)),
+                ('budget alerts', lambda workers: build_budget_alerts(source, max_workers=workers)),
+            ):
+                sequential = time_call(lambda: build(1), options['iterations'])
+                concurrent = time_call(lambda: build(options['workers']), options['iterations'])
+                self.stdout.write(format_timing(f'{label} (sequential)', sequential))
+                self.stdout.write(format_timing(f"{label} ({options['workers']} workers)", concurrent))
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label}: {sequential['median'] / concurrent['median']:.2f}x median speed-up"
+                ))
+        finally:
+            if options['keep']:
+                self.stdout.write(f'Kept benchmark user {user.username} (id {user.pk})')
+            else:
+                user.delete()
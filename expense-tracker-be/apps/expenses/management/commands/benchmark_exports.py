@@ -0,0 +1,103 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIClient
+
+from apps.expenses.benchmarking import PeakRss, seed_benchmark_user
+
+
+DEFAULT_SIZES = '1000,10000,100000'
+
+
+def _megabytes(size):
+    return '-' if size is None else f'{size / 2 ** 20:.1f} MB'
+
+
+class Command(BaseCommand):
+    help = 'Time expense exports and measure their memory use (RSS and Python heap) for growing row counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default=DEFAULT_SIZES,
+            help=f'Comma-separated expense counts, one seeded user each (default: {DEFAULT_SIZES})',
+        )
+        parser.add_argument(
+            '--format',
+            action='append',
+            dest='formats',
+            help='Export format to run; repeatable (default: csv)',
+        )
+        parser.add_argument(
+            '--no-trace',
+            action='store_true',
+            help='Skip the tracemalloc run (it takes several times as long as the export)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated numbers')
+        formats = options['formats'] or ['csv']
+
+        self.stdout.write(
+            f"{'format':<8}{'rows':>10}{'first byte':>14}{'total':>12}{'peak RSS':>14}{'RSS growth':>14}"
+            f"{'peak memory':>16}{'size':>14}"
+        )
+        for size in sizes:
+            user = seed_benchmark_user(size, days=3 * 365)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            try:
+                for export_format in formats:
+                    first_byte, total, rss, peak, length = self._measure(
+                        client, export_format, trace=not options['no_trace']
+                    )
+                    self.stdout.write(
+                        f'{export_format:<8}{size:>10}{first_byte * 1000:>11.1f} ms{total * 1000:>9.1f} ms'
+                        f'{_megabytes(rss.peak):>14}{_megabytes(rss.growth):>14}{_megabytes(peak):>16}'
+                        f'{_megabytes(length):>14}'
+                    )
+            finally:
+                user.delete()
+
+    def _measure(self, client, export_format, trace=True):
+        """
+        Time to first byte, total time, RSS, peak memory and size of one export.
+
+        RSS (of this process and any render workers) is sampled during the
+        timed run. Python allocations are traced in a second run - tracing
+        slows Python down several times over, so it would distort the
+        timings.
+        """
+        with PeakRss() as rss:
+            first_byte, total, length = self._export(client, export_format)
+        if not trace:
+            return first_byte, total, rss, None, length
+
+        tracemalloc.start()
+        try:
+            self._export(client, export_format)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return first_byte, total, rss, peak, length
+
+    def _export(self, client, export_format):
+        started = time.perf_counter()
+        response = client.get('/api/export/', {'export_format': export_format})
+        if response.status_code != 200:
+            raise CommandError(f'{export_format} export returned {response.status_code}')
+
+        if response.streaming:
+            chunks = iter(response.streaming_content)
+            length = len(next(chunks, b''))
+            first_byte = time.perf_counter() - started
+            # Chunks are dropped as they are read, like a server would
+            length += sum(len(chunk) for chunk in chunks)
+        else:
+            first_byte = time.perf_counter() - started
+            length = len(response.content)
+        return first_byte, time.perf_counter() - started, length
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.expenses.benchmarking import format_timing, seed_benchmark_user, time_call
+from apps.expenses.models import Expense
+from apps.expenses.search import full_text_search_supported, search_expenses
+
+
+# A frequent title, a title prefix and a rare description word
+DEFAULT_TERMS = ['coffee', 'elec', 'plumber']
+
+
+class Command(BaseCommand):
+    help = 'Compare ILIKE and full-text expense search against a seeded user'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expenses',
+            type=int,
+            default=200000,
+            help='Number of expenses to seed (default: 200000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed runs per mode and term (default: 20)',
+        )
+        parser.add_argument(
+            '--term',
+            action='append',
+            dest='terms',
+            help=f"Search term to time; repeatable (default: {', '.join(DEFAULT_TERMS)})",
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded user instead of deleting it afterwards',
+        )
+
+    def handle(self, *args, **options):
+        full_text = full_text_search_supported(Expense.objects.db)
+        if not full_text:
+            self.stdout.write(self.style.WARNING(
+                'Full-text search needs PostgreSQL - only the ILIKE search will be timed'
+            ))
+
+        self.stdout.write(f"Seeding {options['expenses']} expenses...")
+        user = seed_benchmark_user(options['expenses'], days=3 * 365)
+        expenses = Expense.objects.filter(user=user)
+
+        # What DRF's SearchFilter runs for search_fields = ['title', 'description']
+        def ilike(term):
+            matches = expenses.filter(Q(title__icontains=term) | Q(description__icontains=term)).order_by('-date')
+            return list(matches.values_list('id', flat=True))
+
+        def ranked(term):
+            return list(search_expenses(expenses, [term]).values_list('id', flat=True))
+
+        try:
+            for term in options['terms'] or DEFAULT_TERMS:
+                ilike_timing = time_call(lambda: ilike(term), options['iterations'])
+                self.stdout.write(format_timing(f'"{term}" ILIKE ({len(ilike(term))} rows)', ilike_timing))
+                if not full_text:
+                    continue
+
+                ranked_timing = time_call(lambda: ranked(term), options['iterations'])
+                self.stdout.write(format_timing(f'"{term}" full-text ({len(ranked(term))} rows)', ranked_timing))
+                self.stdout.write(self.style.SUCCESS(
+                    f"\"{term}\": {ilike_timing['median'] / ranked_timing['median']:.2f}x median speed-up"
+                ))
+        finally:
+            if options['keep']:
+                self.stdout.write(f'Kept benchmark user {user.username} (id {user.pk})')
+            else:
+                user.delete()
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from apps.expenses.snapshots import drifted_expenses, repair_snapshots
+
+
+class Command(BaseCommand):
+    help = "Find expenses whose category name/colour snapshot doesn't match their category, and optionally repair them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only check the expenses of this user ID',
+        )
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Rewrite the drifted snapshots from their categories',
+        )
+        parser.add_argument(
+            '--show',
+            type=int,
+            default=10,
+            help='Number of drifted expenses to list (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        drifted = drifted_expenses(options['user'])
+        count = drifted.count()
+        if not count:
+            self.stdout.write(self.style.SUCCESS('All category snapshots are consistent'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'{count} expenses have a stale category snapshot'))
+        sample = drifted.order_by('pk').values_list(
+            'pk', 'category_id', 'category_name', 'category__name', 'category_color', 'category__color_code'
+        )[:options['show']]
+        for pk, category_id, name, actual_name, color, actual_color in sample:
+            self.stdout.write(
+                f'  expense {pk} (category {category_id}): '
+                f'{name!r}/{color!r} should be {actual_name!r}/{actual_color!r}'
+            )
+
+        if options['repair']:
+            repaired = repair_snapshots(options['user'])
+            self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} expenses'))
+        else:
+            self.stdout.write('Run again with --repair to fix them')
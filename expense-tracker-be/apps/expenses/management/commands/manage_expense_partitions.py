@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.expenses.models import Expense
+from apps.expenses.partitioning import (
+    convert_to_partitioned,
+    ensure_future_partitions,
+    existing_partition_years,
+    is_partitioned,
+    partitioning_supported,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming yearly expense partitions (run e.g. monthly from cron), or convert the table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years-ahead',
+            type=int,
+            default=1,
+            help='Future years that must already have a partition (default: 1)',
+        )
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the regular expense table into a partitioned one first',
+        )
+
+    def handle(self, *args, **options):
+        if not partitioning_supported(connection):
+            self.stdout.write(self.style.WARNING(
+                f'{connection.vendor} does not support table partitioning - nothing to do'
+            ))
+            return
+
+        table = Expense._meta.db_table
+
+        if options['convert']:
+            with transaction.atomic(), connection.schema_editor(atomic=False) as schema_editor:
+                converted = convert_to_partitioned(schema_editor, Expense, options['years_ahead'])
+            if converted:
+                self.stdout.write(self.style.SUCCESS(f'Converted {table} to a partitioned table'))
+
+        if not is_partitioned(table, connection):
+            raise CommandError(f'{table} is not partitioned - run with --convert first')
+
+        with transaction.atomic():
+            created = ensure_future_partitions(table, options['years_ahead'], connection=connection)
+
+        for name in created:
+            self.stdout.write(f'Created partition {name}')
+        years = existing_partition_years(table, connection)
+        self.stdout.write(self.style.SUCCESS(
+            f'{table} has partitions for {years[0]}-{years[-1]} ({len(years)} years)' if years
+            else f'{table} has no yearly partitions'
+        ))
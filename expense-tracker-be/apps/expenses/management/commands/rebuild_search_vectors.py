@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.expenses.models import Expense
+from apps.expenses.search import full_text_search_supported, refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recompute the full-text search vectors of expenses (after changing EXPENSE_SEARCH_CONFIG or bulk imports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only rebuild the search vectors of this user ID',
+        )
+
+    def handle(self, *args, **options):
+        expenses = Expense.objects.all()
+        if not full_text_search_supported(expenses.db):
+            self.stdout.write(self.style.WARNING(
+                'Full-text search needs PostgreSQL - expense search uses ILIKE here, nothing to do'
+            ))
+            return
+
+        if options['user'] is not None:
+            expenses = expenses.filter(user_id=options['user'])
+        updated = refresh_search_vectors(expenses)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search vectors of {updated} expenses'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.expenses.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily and monthly spending rollups from the expense table (backfill or repair)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only rebuild the rollups of this user ID',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per INSERT statement (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(
+            user_id=options['user'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written['daily']} daily and {written['monthly']} monthly rollup rows"
+        ))
@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.expenses.archive import restore_expenses
+
+
+class Command(BaseCommand):
+    help = 'Move archived expenses back to the live expense table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only restore the expenses of this user ID',
+        )
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='Only restore expenses dated on or after this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Only restore expenses dated on or before this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Expenses moved per transaction (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        if options['start'] and options['end'] and options['start'] > options['end']:
+            raise CommandError('--start cannot be after --end')
+
+        restored = restore_expenses(
+            user_id=options['user'],
+            start=options['start'],
+            end=options['end'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Restored {restored} archived expenses'))
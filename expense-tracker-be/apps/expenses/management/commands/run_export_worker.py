@@ -0,0 +1,74 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.expenses.export_jobs import claim_next_job, cleanup_export_jobs, run_export_job
+
+
+class Command(BaseCommand):
+    help = 'Generate queued background exports; run one or more next to the web processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait before checking an empty queue again (default: 2)',
+        )
+        parser.add_argument(
+            '--cleanup-interval',
+            type=float,
+            default=300.0,
+            help='Seconds between removals of expired export files (default: 300)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs',
+        )
+
+    def handle(self, *args, **options):
+        # SIGTERM/SIGINT let the current export finish, then stop
+        stopping = threading.Event()
+        previous = {
+            signum: signal.signal(signum, lambda *_: stopping.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        last_cleanup = None
+        try:
+            while not stopping.is_set():
+                # Like the request cycle: drop connections that expired or broke
+                close_old_connections()
+
+                if last_cleanup is None or time.monotonic() - last_cleanup >= options['cleanup_interval']:
+                    cleaned = cleanup_export_jobs()
+                    last_cleanup = time.monotonic()
+                    if any(cleaned.values()):
+                        self.stdout.write(
+                            f"Expired {cleaned['expired']}, failed {cleaned['abandoned']} abandoned "
+                            f"and deleted {cleaned['deleted']} old export jobs"
+                        )
+
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    stopping.wait(options['poll_interval'])
+                    continue
+
+                started = time.monotonic()
+                try:
+                    run_export_job(job)
+                except Exception as e:
+                    self.stderr.write(f'Export job {job.pk} ({job.export_format}) failed: {e}')
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Export job {job.pk} ({job.export_format}) completed in {time.monotonic() - started:.1f}s'
+                    ))
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            close_old_connections()
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.16 on 2026-10-17 03:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    Expense = apps.get_model('expenses', 'Expense')
+    DailySpendingRollup = apps.get_model('expenses', 'DailySpendingRollup')
+
+    buckets = Expense.objects.order_by().values('user_id', 'date', 'category_id').annotate(
+        bucket_total=models.Sum('amount'),
+        bucket_count=models.Count('id'),
+        bucket_min=models.Min('amount'),
+        bucket_max=models.Max('amount'),
+    )
+    DailySpendingRollup.objects.bulk_create(
+        (
+            DailySpendingRollup(
+                user_id=row['user_id'],
+                date=row['date'],
+                category_id=row['category_id'],
+                total=row['bucket_total'],
+                count=row['bucket_count'],
+                min_amount=row['bucket_min'],
+                max_amount=row['bucket_max'],
+            )
+            for row in buckets.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenses', '0005_remove_expense_payment_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySpendingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='expenses.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyspendingrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'date', 'category'), name='unique_daily_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyspendingrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'date'), name='unique_daily_rollup_uncategorized'),
+        ),
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.16 on 2026-10-17 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import TruncMonth
+
+
+def backfill_monthly_rollups(apps, schema_editor):
+    DailySpendingRollup = apps.get_model('expenses', 'DailySpendingRollup')
+    MonthlySpendingRollup = apps.get_model('expenses', 'MonthlySpendingRollup')
+
+    buckets = DailySpendingRollup.objects.order_by().annotate(
+        bucket_month=TruncMonth('date')
+    ).values('user_id', 'bucket_month', 'category_id').annotate(
+        bucket_total=models.Sum('total'),
+        bucket_count=models.Sum('count'),
+        bucket_min=models.Min('min_amount'),
+        bucket_max=models.Max('max_amount'),
+    )
+    MonthlySpendingRollup.objects.bulk_create(
+        (
+            MonthlySpendingRollup(
+                user_id=row['user_id'],
+                month=row['bucket_month'],
+                category_id=row['category_id'],
+                total=row['bucket_total'],
+                count=row['bucket_count'],
+                min_amount=row['bucket_min'],
+                max_amount=row['bucket_max'],
+            )
+            for row in buckets.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenses', '0006_dailyspendingrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlySpendingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='expenses.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyspendingrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'category'), name='unique_monthly_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyspendingrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'month'), name='unique_monthly_rollup_uncategorized'),
+        ),
+        migrations.RunPython(backfill_monthly_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-17 03:42
+
+from django.db import migrations, models
+
+from apps.expenses.helpers import normalize_title
+
+
+def backfill_normalized_titles(apps, schema_editor):
+    Expense = apps.get_model('expenses', 'Expense')
+
+    batch = []
+    for expense in Expense.objects.only('id', 'title').iterator(chunk_size=2000):
+        expense.normalized_title = normalize_title(expense.title)
+        batch.append(expense)
+        if len(batch) >= 2000:
+            Expense.objects.bulk_update(batch, ['normalized_title'])
+            batch = []
+    if batch:
+        Expense.objects.bulk_update(batch, ['normalized_title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0008_expense_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='expense_recurring_idx',
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='normalized_title',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_normalized_titles, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'normalized_title', '-date'], name='expense_user_title_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('is_recurring', True)), fields=['user', 'recurring_frequency', 'normalized_title'], name='expense_recurring_title_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import migrations
+
+from apps.expenses.partitioning import convert_to_partitioned
+
+
+def partition_expenses(apps, schema_editor):
+    # Opt-in and PostgreSQL only - everywhere else the table stays as is
+    # (it can still be converted later with manage_expense_partitions --convert)
+    if not settings.EXPENSE_PARTITIONING:
+        return
+    convert_to_partitioned(schema_editor, apps.get_model('expenses', 'Expense'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0009_expense_normalized_title'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_expenses, migrations.RunPython.noop),
+    ]
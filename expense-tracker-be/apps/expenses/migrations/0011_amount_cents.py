@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-17 03:48
+
+from django.db import migrations, models
+from django.db.models.functions import Cast, Round
+
+
+def to_cents(field):
+    return Cast(Round(models.F(field) * 100), models.BigIntegerField())
+
+
+def backfill_cents(apps, schema_editor):
+    # One set-based UPDATE per table - no rows are loaded into Python
+    apps.get_model('expenses', 'Expense').objects.update(amount_cents=to_cents('amount'))
+    apps.get_model('expenses', 'Budget').objects.update(budget_amount_cents=to_cents('budget_amount'))
+    apps.get_model('expenses', 'DailySpendingRollup').objects.update(total_cents=to_cents('total'))
+    apps.get_model('expenses', 'MonthlySpendingRollup').objects.update(total_cents=to_cents('total'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0010_expense_partitioning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='budget_amount_cents',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dailyspendingrollup',
+            name='total_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='amount_cents',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='monthlyspendingrollup',
+            name='total_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_cents, migrations.RunPython.noop),
+    ]
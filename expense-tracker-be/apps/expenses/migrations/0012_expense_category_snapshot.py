@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+
+def backfill_category_snapshots(apps, schema_editor):
+    Category = apps.get_model('expenses', 'Category')
+    Expense = apps.get_model('expenses', 'Expense')
+
+    categories = Category.objects.filter(pk=models.OuterRef('category_id'))
+    Expense.objects.filter(category__isnull=False).update(
+        category_name=models.Subquery(categories.values('name')[:1]),
+        category_color=models.Subquery(categories.values('color_code')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0011_amount_cents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='category_color',
+            field=models.CharField(blank=True, editable=False, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='category_name',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_category_snapshots, migrations.RunPython.noop),
+    ]
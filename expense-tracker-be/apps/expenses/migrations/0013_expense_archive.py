@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-17 04:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenses', '0012_expense_category_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('category_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('category_color', models.CharField(blank=True, max_length=20, null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('normalized_title', models.CharField(default='', max_length=255)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('amount_cents', models.BigIntegerField(default=0)),
+                ('date', models.DateField()),
+                ('description', models.TextField(blank=True)),
+                ('is_recurring', models.BooleanField(default=False)),
+                ('recurring_frequency', models.CharField(blank=True, choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('yearly', 'Yearly')], max_length=20, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_expenses', to='expenses.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_expenses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['user', 'date'], name='expense_archive_user_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-17 04:09
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.expenses.search import SEARCH_INDEX_NAME, create_search_index, refresh_search_vectors
+
+
+def index_search_vectors(apps, schema_editor):
+    # PostgreSQL only - elsewhere the column stays NULL and search uses ILIKE
+    refresh_search_vectors(apps.get_model('expenses', 'Expense').objects.using(schema_editor.connection.alias))
+    create_search_index(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(SEARCH_INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0013_expense_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(index_search_vectors, drop_search_index),
+    ]
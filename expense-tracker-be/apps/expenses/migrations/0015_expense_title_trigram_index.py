@@ -0,0 +1,29 @@
+from django.contrib.postgres.operations import BtreeGinExtension, TrigramExtension
+from django.db import migrations
+
+from apps.expenses.title_matching import TITLE_INDEX_NAME, create_title_index
+
+
+def add_title_index(apps, schema_editor):
+    # PostgreSQL only - elsewhere titles are compared in process
+    create_title_index(schema_editor)
+
+
+def drop_title_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(TITLE_INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0014_expense_search_vector'),
+    ]
+
+    operations = [
+        # Both are no-ops on other databases; btree_gin lets the GIN index
+        # lead with user_id
+        TrigramExtension(),
+        BtreeGinExtension(),
+        migrations.RunPython(add_title_index, drop_title_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0016_export_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='export_format',
+            field=models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'XLSX'), ('pdf', 'PDF'), ('ndjson', 'NDJSON'), ('parquet', 'Parquet'), ('arrow', 'Arrow IPC')], max_length=10),
+        ),
+    ]
@@ -1,6 +1,10 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, router
 from django.conf import settings
 
+from .helpers import normalize_title, to_cents
+from .search import document_vector
+
 
 class Category(models.Model):
     """Expense category model"""
@@ -31,10 +35,21 @@ class Expense(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='expenses')
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='expenses')
+    # Copy of the category's name and colour, so reads don't join the
+    # category table (kept current by snapshots.py; NULL when uncategorized)
+    category_name = models.CharField(max_length=100, null=True, blank=True, editable=False)
+    category_color = models.CharField(max_length=20, null=True, blank=True, editable=False)
     title = models.CharField(max_length=255)
+    # Casefolded, punctuation-free title used to match repeated expenses
+    normalized_title = models.CharField(max_length=255, default='', editable=False)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # The amount in integer cents, summed by the analytics and export paths
+    amount_cents = models.BigIntegerField(default=0, editable=False)
     date = models.DateField()
     description = models.TextField(blank=True)
+    # Weighted title/description tsvector for full-text search (PostgreSQL
+    # only, GIN-indexed by migration 0014; NULL elsewhere - see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     
     is_recurring = models.BooleanField(default=False)
@@ -45,16 +60,156 @@ class Expense(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # Date-range aggregates and lookups of one user's expenses
+            models.Index(fields=['user', 'date'], name='expense_user_date_idx'),
+            # Per-category date ranges (category filters, rollup extremes)
+            models.Index(fields=['user', 'category', 'date'], name='expense_user_cat_date_idx'),
+            # Newest-first listings (expense list, recent expenses)
+            models.Index(fields=['user', '-date', '-created_at'], name='expense_user_recent_idx'),
+            # Recurring detection - latest occurrences of a title
+            models.Index(fields=['user', 'normalized_title', '-date'], name='expense_user_title_date_idx'),
+            # Recurring expense list - only the (few) recurring rows are indexed
+            models.Index(
+                fields=['user', 'recurring_frequency', 'normalized_title'],
+                name='expense_recurring_title_idx',
+                condition=models.Q(is_recurring=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.description} - ${self.amount}"
 
+    def save(self, *args, **kwargs):
+        self.normalized_title = normalize_title(self.title)
+        self.amount_cents = to_cents(self.amount)
+        category = self.category if self.category_id else None
+        self.category_name = category.name if category else None
+        self.category_color = category.color_code if category else None
+        self.search_vector = document_vector(
+            self.title, self.description, kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            derived = {
+                'title': ['normalized_title', 'search_vector'],
+                'description': ['search_vector'],
+                'amount': ['amount_cents'],
+                'category': ['category_name', 'category_color'],
+                'category_id': ['category_name', 'category_color'],
+            }
+            kwargs['update_fields'] = {
+                *update_fields,
+                *(field for name in update_fields for field in derived.get(name, [])),
+            }
+        super().save(*args, **kwargs)
+
+
+class ExpenseArchive(models.Model):
+    """
+    Cold-storage copy of an expense older than the archive cutoff.
+
+    Rows keep their expense ID and are moved here (and back) by archive.py
+    without touching the spending rollups, which still count them.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_expenses')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='archived_expenses')
+    category_name = models.CharField(max_length=100, null=True, blank=True)
+    category_color = models.CharField(max_length=20, null=True, blank=True)
+    title = models.CharField(max_length=255)
+    normalized_title = models.CharField(max_length=255, default='')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    amount_cents = models.BigIntegerField(default=0)
+    date = models.DateField()
+    description = models.TextField(blank=True)
+    is_recurring = models.BooleanField(default=False)
+    recurring_frequency = models.CharField(
+        max_length=20, choices=Expense.RECURRING_FREQUENCY_CHOICES, blank=True, null=True
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+        indexes = [
+            # Exports reaching into the archive, restores by date range
+            models.Index(fields=['user', 'date'], name='expense_archive_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - ${self.amount} (archived)"
+
+
+class ExportJob(models.Model):
+    """An export generated in the background by the export worker (see export_jobs.py)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_EXPIRED, 'Expired'),
+    ]
+    ACTIVE_STATUSES = [STATUS_PENDING, STATUS_RUNNING]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'XLSX'),
+        ('pdf', 'PDF'),
+        ('ndjson', 'NDJSON'),
+        ('parquet', 'Parquet'),
+        ('arrow', 'Arrow IPC'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='export_jobs')
+    export_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    # Expense lookups with ISO dates, and their descriptions for the report
+    filters = models.JSONField(default=dict, blank=True)
+    filters_applied = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's queue: oldest pending job first, stale running jobs
+            models.Index(fields=['status', 'created_at'], name='export_job_queue_idx'),
+            # A user's active jobs (concurrency limit) and job list
+            models.Index(fields=['user', 'status'], name='export_job_user_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.export_format} - {self.status}"
+
+    @property
+    def progress(self) -> int:
+        """Percentage of the rows written so far."""
+        if self.status == self.STATUS_COMPLETED:
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(int(self.rows_written * 100 / self.rows_total), 99)
+
 
 class Budget(models.Model):
     """Budget model for tracking monthly budgets"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='budgets')
     month = models.DateField(help_text="First day of the month for this budget")
     budget_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    budget_amount_cents = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-month']
@@ -62,3 +217,64 @@ class Budget(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.month.strftime('%Y-%m')} - ${self.budget_amount}"
+
+    def save(self, *args, **kwargs):
+        self.budget_amount_cents = to_cents(self.budget_amount)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'budget_amount' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'budget_amount_cents'}
+        super().save(*args, **kwargs)
+
+
+class DailySpendingRollup(models.Model):
+    """Per-day spending totals by category, maintained on every expense write"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_rollups')
+    date = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, related_name='daily_rollups')
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_cents = models.BigIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+    min_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date', 'category'], name='unique_daily_rollup'),
+            # NULLs are distinct in unique constraints, so uncategorized
+            # buckets need their own partial constraint
+            models.UniqueConstraint(
+                fields=['user', 'date'],
+                condition=models.Q(category__isnull=True),
+                name='unique_daily_rollup_uncategorized',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.date} - {self.category_id} - ${self.total}"
+
+
+class MonthlySpendingRollup(models.Model):
+    """Per-month spending totals by category, maintained alongside the daily rollup"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='monthly_rollups')
+    month = models.DateField(help_text="First day of the month")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, related_name='monthly_rollups')
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_cents = models.BigIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+    min_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month', 'category'], name='unique_monthly_rollup'),
+            models.UniqueConstraint(
+                fields=['user', 'month'],
+                condition=models.Q(category__isnull=True),
+                name='unique_monthly_rollup_uncategorized',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month.strftime('%Y-%m')} - {self.category_id} - ${self.total}"
@@ -0,0 +1,277 @@
+"""
+Optional yearly range partitioning of the expense table (PostgreSQL only).
+
+With EXPENSE_PARTITIONING enabled, expenses_expense is a declaratively
+partitioned table with one partition per calendar year
+(expenses_expense_y2025 holds 2025-01-01 up to 2026-01-01) and a default
+partition for anything outside the created years. Every query bounded on
+``date`` - the dashboard, budget alert and export queries - then only
+reads the partitions its range overlaps.
+
+PostgreSQL requires the primary key of a partitioned table to include the
+partition key, so the table's key becomes (id, date); ids still come from
+the same sequence and stay unique. On other databases (SQLite in tests and
+local development) every function here is a no-op.
+"""
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import connection as default_connection
+
+
+PARTITION_PREFIX = 'y'
+
+
+# =============================================================================
+# INSPECTION
+# =============================================================================
+
+def partitioning_supported(connection=None) -> bool:
+    """Whether the database supports declarative partitioning."""
+    connection = connection or default_connection
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(table: str, connection=None) -> bool:
+    """
+    Whether a table is a partitioned (parent) table.
+
+    Args:
+        table: Table name
+        connection: Database connection (defaults to the default one)
+
+    Returns:
+        bool: True for a partitioned table, False otherwise or if unsupported
+    """
+    connection = connection or default_connection
+    if not partitioning_supported(connection):
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_name(table: str, year: int) -> str:
+    """Name of the partition holding one year of a table."""
+    return f'{table}_{PARTITION_PREFIX}{year}'
+
+
+def existing_partition_years(table: str, connection=None) -> List[int]:
+    """
+    Years that already have their own partition.
+
+    Args:
+        table: Partitioned table name
+        connection: Database connection (defaults to the default one)
+
+    Returns:
+        List[int]: Sorted years (empty if the table isn't partitioned)
+    """
+    connection = connection or default_connection
+    if not is_partitioned(table, connection):
+        return []
+
+    prefix = f'{table}_{PARTITION_PREFIX}'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    return sorted(
+        int(name[len(prefix):]) for name in names
+        if name.startswith(prefix) and name[len(prefix):].isdigit()
+    )
+
+
+# =============================================================================
+# PARTITION MANAGEMENT
+# =============================================================================
+
+def create_year_partitions(table: str, years: Iterable[int], connection=None) -> List[str]:
+    """
+    Create the yearly partitions of a table that don't exist yet.
+
+    Rows of a new year that already landed in the default partition are
+    moved into the new partition.
+
+    Args:
+        table: Partitioned table name
+        years: Years to create partitions for
+        connection: Database connection (defaults to the default one)
+
+    Returns:
+        List[str]: Names of the partitions created
+    """
+    connection = connection or default_connection
+    if not is_partitioned(table, connection):
+        return []
+
+    qn = connection.ops.quote_name
+    existing = set(existing_partition_years(table, connection))
+    default = f'{table}_default'
+    created = []
+
+    with connection.cursor() as cursor:
+        for year in sorted(set(years) - existing):
+            name = partition_name(table, year)
+            start, end = date(year, 1, 1), date(year + 1, 1, 1)
+
+            # A partition can't be attached while the default partition
+            # holds rows of its range, so those rows are moved over
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {qn(default)} WHERE date >= %s AND date < %s RETURNING *) "
+                f"INSERT INTO {qn(name)} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+            created.append(name)
+
+    return created
+
+
+def ensure_future_partitions(table: str, years_ahead: int = 1, today: Optional[date] = None, connection=None) -> List[str]:
+    """
+    Make sure the current year and the next ``years_ahead`` years have partitions.
+
+    Args:
+        table: Partitioned table name
+        years_ahead: Number of future years to prepare
+        today: Reference date (defaults to today)
+        connection: Database connection (defaults to the default one)
+
+    Returns:
+        List[str]: Names of the partitions created
+    """
+    year = (today or date.today()).year
+    return create_year_partitions(table, range(year, year + years_ahead + 1), connection)
+
+
+# =============================================================================
+# CONVERSION
+# =============================================================================
+
+def convert_to_partitioned(schema_editor, model, years_ahead: int = 1) -> bool:
+    """
+    Turn a model's regular table into a yearly partitioned one, keeping its rows.
+
+    The table is renamed, recreated as a partitioned table with the same
+    columns, filled from the old table, and the old table is dropped - all
+    inside the caller's transaction. Its foreign keys, check constraints
+    and indexes (including the PostgreSQL-only GIN indexes that aren't
+    declared on the model) are read from the catalog beforehand and
+    recreated from their own definitions.
+
+    Args:
+        schema_editor: Schema editor of the running migration or command
+        model: Model whose table to convert (partitioned on its ``date`` field)
+        years_ahead: Future years to create partitions for
+
+    Returns:
+        bool: True if the table was converted, False if unsupported or
+        already partitioned
+    """
+    connection = schema_editor.connection
+    table = model._meta.db_table
+    if not partitioning_supported(connection) or is_partitioned(table, connection):
+        return False
+
+    qn = connection.ops.quote_name
+    legacy = f'{table}_legacy'
+    pk = model._meta.pk.column
+
+    with connection.cursor() as cursor:
+        # Deferred foreign key checks still pending would block the DROP TABLE below
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "SELECT attidentity FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = %s",
+            [table, pk],
+        )
+        is_identity = bool(cursor.fetchone()[0])
+        cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", [table, pk])
+        sequence = cursor.fetchone()[0]
+
+        # Definitions name the table, so they are read before the rename
+        constraints = _constraint_definitions(cursor, table)
+        indexes = _index_definitions(cursor, table)
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+            f"PARTITION BY RANGE (date)"
+        )
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+        cursor.execute(f"SELECT MIN(date), MAX(date) FROM {qn(legacy)}")
+        first, last = cursor.fetchone()
+
+    this_year = date.today().year
+    first_year = first.year if first else this_year
+    last_year = max(last.year if last else this_year, this_year + years_ahead)
+    create_year_partitions(table, range(first_year, last_year + 1), connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+
+        if is_identity:
+            # The new identity column got its own sequence - continue after the copied ids
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({qn(pk)}), 0) + 1, false) "
+                f"FROM {qn(table)}",
+                [table, pk],
+            )
+        elif sequence:
+            # A serial default still points at the old table's sequence - keep it alive
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.{qn(pk)}")
+
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+
+        # Added only now - the old table's key still held the constraint name
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY ({qn(pk)}, date)")
+
+        # Recreated on the parent, they cascade to every partition (the old
+        # ones were dropped with the old table, freeing their names)
+        for name, definition in constraints:
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for definition in indexes:
+            cursor.execute(definition)
+
+    return True
+
+
+def _constraint_definitions(cursor, table: str) -> List[Tuple[str, str]]:
+    """(name, definition) of a table's foreign key and check constraints."""
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype IN ('f', 'c') ORDER BY conname",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _index_definitions(cursor, table: str) -> List[str]:
+    """CREATE INDEX statements of a table's indexes that don't back a constraint."""
+    cursor.execute(
+        "SELECT pg_get_indexdef(pg_index.indexrelid) FROM pg_index "
+        "WHERE pg_index.indrelid = to_regclass(%s) "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = pg_index.indexrelid) "
+        "ORDER BY pg_index.indexrelid",
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
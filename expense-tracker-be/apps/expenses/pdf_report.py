@@ -0,0 +1,492 @@
+"""
+Layout of the PDF expense report.
+
+The report used to be one Table holding every transaction. Reportlab splits
+such a table page by page, copying the rows left over each time, so the
+work grew with the square of the row count (10k rows took ~12s, 100k
+would take tens of minutes), and every row had to be in memory first.
+
+Here the transactions are a TransactionPages flowable instead: it reads
+rows from an iterator one page at a time and lays out a page-sized
+LongTable (with the column headers) for each page. Every row has the same
+height, so how many fit on a page is simple arithmetic and the layout is
+linear in the number of rows.
+
+Styles are built once per process. This module doesn't touch Django, so
+render_parallel can lay out page ranges of very large reports in worker
+processes (concatenated with pypdf, when it is installed).
+"""
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from itertools import islice
+from multiprocessing import get_context
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, LongTable, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # Reports are rendered in one process without it
+    PdfReader = PdfWriter = None
+
+
+PAGE_SIZE = landscape(letter)
+PAGE_MARGIN = 40
+
+# Pages of transactions rendered by one worker task
+PAGES_PER_PART = 50
+
+# Page ranges queued per worker; bounds the rows held by the parent
+PARTS_PER_WORKER = 2
+
+
+# =============================================================================
+# STYLES
+# =============================================================================
+
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    fontName='Helvetica-Bold',
+    textColor=colors.HexColor('#1e293b'),
+    spaceAfter=5,
+    alignment=1  # Center
+)
+
+SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.HexColor('#64748b'),
+    alignment=1,
+    spaceAfter=3
+)
+
+SECTION_HEADER_STYLE = ParagraphStyle(
+    'SectionHeader',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=14,
+    fontName='Helvetica-Bold',
+    textColor=colors.HexColor('#334155'),
+    spaceBefore=15,
+    spaceAfter=8
+)
+
+# Breakdown section header - tighter spacing
+BREAKDOWN_HEADER_STYLE = ParagraphStyle(
+    'BreakdownHeader',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=14,
+    fontName='Helvetica-Bold',
+    textColor=colors.HexColor('#334155'),
+    spaceBefore=12,
+    spaceAfter=0  # No spacing after header - very compact
+)
+
+INFO_STYLE = ParagraphStyle(
+    'InfoStyle',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.HexColor('#94a3b8'),
+    alignment=1
+)
+
+NO_DATA_STYLE = ParagraphStyle(
+    'NoData',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=14,
+    alignment=1,
+    textColor=colors.HexColor('#94a3b8'),
+    spaceBefore=30
+)
+
+FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#94a3b8'),
+    alignment=1
+)
+
+LINE_TABLE_STYLE = TableStyle([
+    ('LINEABOVE', (0, 0), (-1, 0), 2, colors.HexColor('#3b82f6')),
+])
+
+INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8fafc')),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#475569')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('SPAN', (1, 1), (3, 1)),  # Span filters across columns
+])
+
+SUMMARY_CARDS_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    # Value row
+    ('BACKGROUND', (0, 1), (-1, 1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, 1), colors.HexColor('#1e293b')),
+    ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 1), (-1, 1), 16),
+    ('ALIGN', (0, 1), (-1, 1), 'CENTER'),
+    # Description row
+    ('BACKGROUND', (0, 2), (-1, 2), colors.HexColor('#f1f5f9')),
+    ('TEXTCOLOR', (0, 2), (-1, 2), colors.HexColor('#64748b')),
+    ('FONTSIZE', (0, 2), (-1, 2), 8),
+    ('ALIGN', (0, 2), (-1, 2), 'CENTER'),
+    # Borders and padding - more generous padding
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+CATEGORY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8b5cf6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f3ff')]),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#ddd6fe')),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd6fe')),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+])
+
+TRANSACTION_HEADERS = ['#', 'Date', 'Title', 'Description', 'Category', 'Amount', 'Recurring']
+
+TRANSACTION_COL_WIDTHS = [0.35*inch, 0.85*inch, 1.4*inch, 2.0*inch, 1.5*inch, 1.0*inch, 0.75*inch]
+
+TRANSACTION_TABLE_STYLE = TableStyle([
+    # Header styling - more padding for headers
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
+    ('TOPPADDING', (0, 0), (-1, 0), 15),
+    ('LEFTPADDING', (0, 0), (-1, 0), 10),
+    ('RIGHTPADDING', (0, 0), (-1, 0), 10),
+    # Data rows
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+    # Alignment
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # # column
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),  # Date column
+    ('ALIGN', (2, 0), (2, -1), 'LEFT'),    # Title column
+    ('ALIGN', (3, 0), (3, -1), 'LEFT'),    # Description column
+    ('ALIGN', (4, 0), (4, -1), 'LEFT'),    # Category column
+    ('ALIGN', (5, 0), (5, -1), 'RIGHT'),   # Amount column
+    ('ALIGN', (6, 0), (6, -1), 'CENTER'),  # Recurring column
+    # Borders
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+    ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#3b82f6')),
+    ('INNERGRID', (0, 1), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+    # More padding for data rows
+    ('TOPPADDING', (0, 1), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
+    ('LEFTPADDING', (0, 1), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 1), (-1, -1), 10),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+
+def _transaction_table(rows: Sequence[Sequence[str]]) -> LongTable:
+    return LongTable(
+        [TRANSACTION_HEADERS, *rows],
+        colWidths=TRANSACTION_COL_WIDTHS,
+        style=TRANSACTION_TABLE_STYLE,
+        repeatRows=1,
+    )
+
+
+def _measure_transaction_rows():
+    """Heights of the header row and of a transaction row (one line of text each)."""
+    table = _transaction_table([TRANSACTION_HEADERS])
+    table.wrap(PAGE_SIZE[0], PAGE_SIZE[1])
+    return table._rowHeights[0], table._rowHeights[1]
+
+
+HEADER_ROW_HEIGHT, TRANSACTION_ROW_HEIGHT = _measure_transaction_rows()
+
+
+# =============================================================================
+# FLOWABLES
+# =============================================================================
+
+def _truncate(text: str, length: int) -> str:
+    # Cells are single lines so every row has the same height
+    text = ' '.join(text.split())
+    return text[:length] + '...' if len(text) > length else text
+
+
+def transaction_cells(number: int, values: Sequence) -> tuple:
+    """
+    Cells of one transaction row.
+
+    Args:
+        number: Position of the row in the report (the "#" column)
+        values: Export values of the expense (exporters.expense_values)
+    """
+    _, expense_date, title, description, category, amount, recurring, _ = values
+    return (
+        str(number),
+        expense_date,
+        _truncate(title, 18),
+        _truncate(description, 30) or '-',
+        _truncate(category, 15),
+        f'PHP {amount:,.2f}',
+        recurring,
+    )
+
+
+def rows_per_page(available_height: float) -> int:
+    """Transaction rows that fit, under the column headers, in the given height."""
+    return max(0, math.floor((available_height - HEADER_ROW_HEIGHT) / TRANSACTION_ROW_HEIGHT + 1e-6))
+
+
+class TransactionPages(Flowable):
+    """
+    The detailed transactions table, laid out one page at a time.
+
+    Args:
+        rows: Iterator of transaction_cells tuples
+        count: Number of rows the iterator yields
+        max_pages: Stop after this many pages, leaving the remaining rows
+            in the iterator (used for the first page range of a parallel
+            render)
+    """
+
+    def __init__(self, rows: Iterator[tuple], count: int, max_pages: Optional[int] = None):
+        super().__init__()
+        self.rows = rows
+        self.count = count
+        self.max_pages = max_pages
+        self.width = sum(TRANSACTION_COL_WIDTHS)
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        self.height = HEADER_ROW_HEIGHT + self.count * TRANSACTION_ROW_HEIGHT
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fitting = min(rows_per_page(availHeight), self.count)
+        if not fitting:
+            # Not even one row - start on the next page
+            return []
+
+        table = _transaction_table(list(islice(self.rows, fitting)))
+        max_pages = None if self.max_pages is None else self.max_pages - 1
+        if max_pages == 0:
+            return [table]
+        # A new flowable, as the document gives up on one that was postponed twice
+        return [table, TransactionPages(self.rows, self.count - fitting, max_pages)]
+
+    def draw(self):
+        # The remaining rows fit on this page
+        table = _transaction_table(list(islice(self.rows, self.count)))
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+def report_head(filters_applied: Optional[List[str]], count: int, total_amount: float,
+                category_totals: Dict[str, float]) -> list:
+    """
+    Flowables of the report title, info box and (when there are expenses) summary.
+
+    Args:
+        filters_applied: Descriptions of the applied filters
+        count: Number of expenses
+        total_amount: Sum of the expenses
+        category_totals: Sum of the expenses per category name
+    """
+    elements = []
+
+    # ========== HEADER SECTION ==========
+    # Title with decorative line
+    elements.append(Paragraph("SpendWise - Expense Report", TITLE_STYLE))
+    elements.append(Paragraph("Financial Summary & Transaction Details", SUBTITLE_STYLE))
+    elements.append(Spacer(1, 5))
+    elements.append(Table([['']], colWidths=[9*inch], style=LINE_TABLE_STYLE))
+    elements.append(Spacer(1, 10))
+
+    # ========== REPORT INFO BOX ==========
+    generated_date = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    filters_text = ', '.join(filters_applied) if filters_applied else 'No filters applied (showing all expenses)'
+
+    info_data = [
+        ['Generated:', generated_date, 'Total Records:', str(count)],
+        ['Filters:', filters_text, '', ''],
+    ]
+    elements.append(Table(info_data, colWidths=[1.2*inch, 3.5*inch, 1.3*inch, 1.5*inch], style=INFO_TABLE_STYLE))
+    elements.append(Spacer(1, 15))
+
+    if not count:
+        # ========== NO DATA MESSAGE ==========
+        elements.append(Paragraph("No expenses found matching your criteria", NO_DATA_STYLE))
+        elements.append(Paragraph("Try adjusting your filters or date range", INFO_STYLE))
+        return elements
+
+    # ========== SUMMARY CARDS SECTION ==========
+    elements.append(Paragraph("Financial Summary", SECTION_HEADER_STYLE))
+
+    avg_amount = total_amount / count
+    top_category = max(category_totals.items(), key=lambda x: x[1]) if category_totals else ('N/A', 0)
+    summary_cards = [
+        ['TOTAL SPENT', 'TRANSACTIONS', 'AVERAGE', 'TOP CATEGORY'],
+        [f'PHP {total_amount:,.2f}', str(count), f'PHP {avg_amount:,.2f}', f'{top_category[0]}'],
+        ['Total expenses', 'Number of items', 'Per transaction', f'PHP {top_category[1]:,.2f}'],
+    ]
+    elements.append(Table(summary_cards, colWidths=[2.2*inch] * 4, style=SUMMARY_CARDS_STYLE))
+    elements.append(Spacer(1, 3))
+
+    # ========== BREAKDOWN SECTION ==========
+    elements.append(Paragraph("Category Breakdown", BREAKDOWN_HEADER_STYLE))
+
+    # Category breakdown (top 5)
+    sorted_categories = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:5]
+    category_data = [['Category', 'Amount', '% of Total']]
+    for cat_name, amount in sorted_categories:
+        pct = (amount / total_amount) * 100 if total_amount else 0
+        category_data.append([_truncate(cat_name, 15), f'PHP {amount:,.2f}', f'{pct:.1f}%'])
+    elements.append(Table(category_data, colWidths=[3.5*inch, 2.5*inch, 1.5*inch], style=CATEGORY_TABLE_STYLE))
+    elements.append(Spacer(1, 20))
+
+    # ========== DETAILED TRANSACTIONS TABLE ==========
+    elements.append(Paragraph("Detailed Transactions", SECTION_HEADER_STYLE))
+    return elements
+
+
+def report_footer() -> list:
+    """Flowables closing the report."""
+    return [
+        Spacer(1, 20),
+        Paragraph("─" * 80, FOOTER_STYLE),
+        Paragraph(
+            f"This report was automatically generated by SpendWise - {datetime.now().strftime('%Y')}",
+            FOOTER_STYLE
+        ),
+        Paragraph("For questions or support, please contact your administrator", FOOTER_STYLE),
+    ]
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def _document(output: BinaryIO) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
+        output,
+        pagesize=PAGE_SIZE,
+        rightMargin=PAGE_MARGIN,
+        leftMargin=PAGE_MARGIN,
+        topMargin=PAGE_MARGIN,
+        bottomMargin=PAGE_MARGIN
+    )
+
+
+def render(output: BinaryIO, head: list, rows: Iterator[tuple], count: int) -> None:
+    """
+    Write the report in this process.
+
+    Args:
+        output: Binary file the document is written to
+        head: Flowables from report_head
+        rows: Iterator of transaction_cells tuples
+        count: Number of rows
+    """
+    elements = list(head)
+    if count:
+        elements.append(TransactionPages(rows, count))
+        elements.extend(report_footer())
+    _document(output).build(elements)
+
+
+def can_render_parallel() -> bool:
+    """Whether pypdf is installed to concatenate page ranges."""
+    return PdfWriter is not None
+
+
+def _render_part(rows: List[tuple], last: bool) -> bytes:
+    """Worker task: the pages of a range of transaction rows."""
+    output = BytesIO()
+    elements = [TransactionPages(iter(rows), len(rows))] if rows else []
+    if last:
+        elements.extend(report_footer())
+    _document(output).build(elements)
+    return output.getvalue()
+
+
+def render_parallel(output: BinaryIO, head: list, rows: Iterator[tuple], count: int, workers: int) -> None:
+    """
+    Write the report, laying out its transaction pages in worker processes.
+
+    This process renders the head and the rest of its page, then reads the
+    remaining rows in ranges of PAGES_PER_PART full pages for the workers
+    (which get plain tuples - they don't need the database) and
+    concatenates their documents in order. Every range starts at the top
+    of a page, so no page is left half empty between them.
+
+    Args:
+        output: Binary file the document is written to
+        head: Flowables from report_head
+        rows: Iterator of transaction_cells tuples
+        count: Number of rows
+        workers: Worker processes
+    """
+    first_page = BytesIO()
+    document = _document(first_page)
+    document.build([*head, TransactionPages(rows, count, max_pages=1)])
+
+    # A fresh frame: its height less the frame padding
+    part_rows = rows_per_page(document.height - 12) * PAGES_PER_PART
+    parts = [first_page.getvalue()]
+
+    # Spawned workers don't inherit the parent's database connections or locks
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        pending = deque()
+        chunk = list(islice(rows, part_rows))
+        if not chunk:
+            # Everything fit on the first page after all
+            pending.append(pool.submit(_render_part, chunk, True))
+        while chunk:
+            following = list(islice(rows, part_rows))
+            pending.append(pool.submit(_render_part, chunk, not following))
+            if len(pending) >= workers * PARTS_PER_WORKER:
+                parts.append(pending.popleft().result())
+            chunk = following
+        parts.extend(future.result() for future in pending)
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(BytesIO(part)))
+    writer.write(output)
@@ -1,13 +1,121 @@
 from rest_framework import generics, serializers
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django.db.models import Case, When, Value, IntegerField
+from .db_routing import ReplicaReadMixin
 from .serializers import RecurringExpenseSerializer
 from .models import Expense
+from .title_matching import cluster_titles, fuzzy_matching_enabled
 
 from django.db.models import Count, Max, Q
 from rest_framework.response import Response
 
-class RecurringExpenseListView(generics.ListAPIView):
+
+def merge_similar_series(rows: list) -> list:
+    """
+    Merge recurring series whose titles are alike ("meralco bill", "meralco bill jan").
+
+    Series only merge within the same frequency; the most frequent one
+    gives the merged series its title, category and ID.
+
+    Args:
+        rows: Series dicts ordered by occurrences, most frequent first
+
+    Returns:
+        list: Merged series, still ordered by occurrences
+    """
+    merged = {}
+    for frequency in {row['recurring_frequency'] for row in rows}:
+        series = [row for row in rows if row['recurring_frequency'] == frequency]
+        groups = cluster_titles(row['normalized_title'] for row in series)
+        for row in series:
+            key = (frequency, groups[row['normalized_title']])
+            if key not in merged:
+                merged[key] = dict(row)
+                continue
+            target = merged[key]
+            target['occurrences'] += row['occurrences']
+            target['amount'] = max(target['amount'], row['amount'])
+            target['id'] = max(target['id'], row['id'])
+    return sorted(merged.values(), key=lambda row: row['occurrences'], reverse=True)
+
+
+def build_recurring_expenses(user) -> dict:
+    """
+    Group a user's recurring expenses by frequency, most frequent first.
+
+    Args:
+        user: The requesting user (anonymous users get empty groups)
+
+    Returns:
+        dict: Lists of recurring expenses keyed daily/weekly/monthly/yearly
+    """
+    # Base filter
+    if user.is_authenticated:
+        qs = Expense.objects.filter(is_recurring=True, user=user)
+    else:
+        qs = Expense.objects.none()
+        
+    # Aggregation: Group by normalized Title and Frequency, so "Netflix",
+    # "netflix " and "NETFLIX" form one series
+    # We also grab the latest amount (or max), a display title and category name
+    data_raw = qs.values('normalized_title', 'recurring_frequency', 'category_name') \
+             .annotate(
+                 occurrences=Count('id'),
+                 title=Max('title'), # representative spelling
+                 amount=Max('amount'), # approximate 'current' amount
+                 id=Max('id') # approximate representative ID
+             ) \
+             .order_by('-occurrences')
+
+    if fuzzy_matching_enabled():
+        data_raw = merge_similar_series(list(data_raw))
+             
+    # Use Serializer for Validation and Transformation
+    # Since we are passing a list of dicts (from values()), simpler Serializer works best vs ModelSerializer
+    serializer = RecurringExpenseSerializer(data=data_raw, many=True)
+    serializer.is_valid(raise_exception=False) # Skip strict validation validation errors for partial data, or handle them
+    # Note: values() returns dicts, not instances.
+    
+    # Validated data (orderedDicts)
+    serialized_data = serializer.data 
+    
+    # Grouping
+    grouped_data = {
+        "daily": [],
+        "weekly": [],
+        "monthly": [],
+        "yearly": []
+    }
+    
+    # Iterate over ORIGINAL raw data or re-map? 
+    # The serializer 'write_only' field recurring_frequency won't be in serializer.data
+    # So we need to access it from initial_data or keep it read_only but remove later?
+    # Correction: Make recurring_frequency read_only so it is in output, then pop it.
+    
+    # Let's adjust serializer above to be ReadOnly for freq, then we pop it.
+    
+    for i, item in enumerate(serialized_data):
+        # We need the frequency to group. 
+        # If we used write_only=True, it wouldn't be here.
+        # If we use read_only=True, it is here.
+        # Let's assume we change serializer to read_only or regular charfield.
+        
+        # Fallback: get freq from raw data if missing (but we will update serializer to include it)
+        freq = data_raw[i].get('recurring_frequency', '').lower()
+        
+        if freq in grouped_data:
+            grouped_data[freq].append(item)
+        else:
+            pass
+            
+    # The query is already ordered by -occurrences
+    for key in grouped_data:
+        grouped_data[key].sort(key=lambda x: x['occurrences'], reverse=True)
+            
+    return grouped_data
+
+
+class RecurringExpenseListView(ReplicaReadMixin, generics.ListAPIView):
     """
     List recurring expenses grouped by frequency and sorted by occurrence count (popularity).
     Returns:
@@ -20,69 +128,4 @@ class RecurringExpenseListView(generics.ListAPIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def list(self, request, *args, **kwargs):
-        user = self.request.user
-        
-        # Base filter
-        if user.is_authenticated:
-            qs = Expense.objects.filter(is_recurring=True, user=user)
-        else:
-            qs = Expense.objects.none()
-            
-        # Aggregation: Group by Title and Frequency
-        # We also grab the latest amount (or max) and category name
-        data_raw = qs.values('title', 'recurring_frequency', 'category__name') \
-                 .annotate(
-                     occurrences=Count('id'),
-                     amount=Max('amount'), # approximate 'current' amount
-                     id=Max('id') # approximate representative ID
-                 ) \
-                 .order_by('-occurrences')
-                 
-        # Pre-process raw data to match serializer expectations
-        for item in data_raw:
-            # Map category__name to category_name
-            item['category_name'] = item.pop('category__name', None)
-
-        # Use Serializer for Validation and Transformation
-        # Since we are passing a list of dicts (from values()), simpler Serializer works best vs ModelSerializer
-        serializer = self.get_serializer(data=data_raw, many=True)
-        serializer.is_valid(raise_exception=False) # Skip strict validation validation errors for partial data, or handle them
-        # Note: values() returns dicts, not instances.
-        
-        # Validated data (orderedDicts)
-        serialized_data = serializer.data 
-        
-        # Grouping
-        grouped_data = {
-            "daily": [],
-            "weekly": [],
-            "monthly": [],
-            "yearly": []
-        }
-        
-        # Iterate over ORIGINAL raw data or re-map? 
-        # The serializer 'write_only' field recurring_frequency won't be in serializer.data
-        # So we need to access it from initial_data or keep it read_only but remove later?
-        # Correction: Make recurring_frequency read_only so it is in output, then pop it.
-        
-        # Let's adjust serializer above to be ReadOnly for freq, then we pop it.
-        
-        for i, item in enumerate(serialized_data):
-            # We need the frequency to group. 
-            # If we used write_only=True, it wouldn't be here.
-            # If we use read_only=True, it is here.
-            # Let's assume we change serializer to read_only or regular charfield.
-            
-            # Fallback: get freq from raw data if missing (but we will update serializer to include it)
-            freq = data_raw[i].get('recurring_frequency', '').lower()
-            
-            if freq in grouped_data:
-                grouped_data[freq].append(item)
-            else:
-                pass
-                
-        # The query is already ordered by -occurrences
-        for key in grouped_data:
-            grouped_data[key].sort(key=lambda x: x['occurrences'], reverse=True)
-                
-        return Response(grouped_data)
+        return Response(build_recurring_expenses(self.request.user))
@@ -0,0 +1,337 @@
+"""
+Spending rollup maintenance.
+
+Spending is rolled up in two tiers, both keyed by category:
+
+- DailySpendingRollup: one row per (user, date, category)
+- MonthlySpendingRollup: one row per (user, month, category)
+
+Each row holds the total (as a Decimal and in integer cents), count,
+smallest and largest expense of its bucket. Rows are adjusted incrementally
+on every expense write (see signals.py), so analytics read a handful of
+rows per day or month instead of every expense in the window. A write only
+touches the buckets of its own date, so closed months stay as they are
+unless an expense is back-dated into them.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Iterator, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Max, Min, QuerySet, Sum, Value
+from django.db.models.functions import Greatest, Least, TruncMonth
+
+from .cache import bump_data_version
+from .db_routing import pin_reads_to_primary
+from .helpers import add_months, to_cents
+from .models import DailySpendingRollup, Expense, ExpenseArchive, MonthlySpendingRollup
+
+
+# =============================================================================
+# BUCKET MAINTENANCE
+# =============================================================================
+
+def _daily_lookup(user_id: int, day: date, category_id: Optional[int]) -> dict:
+    # category_id=None compiles to IS NULL
+    return {"user_id": user_id, "date": day, "category_id": category_id}
+
+
+def _monthly_lookup(user_id: int, day: date, category_id: Optional[int]) -> dict:
+    return {"user_id": user_id, "month": day.replace(day=1), "category_id": category_id}
+
+
+def _add_to_bucket(
+    model,
+    lookup: dict,
+    total: Decimal,
+    count: int,
+    min_amount: Decimal,
+    max_amount: Decimal,
+) -> None:
+    """
+    Add spending to a rollup bucket, creating the bucket if needed.
+
+    Args:
+        model: Rollup model of the tier
+        lookup: Field values identifying the bucket
+        total: Amount to add to the total
+        count: Number of expenses to add
+        min_amount: Smallest amount among the added expenses
+        max_amount: Largest amount among the added expenses
+    """
+    amount_field = DecimalField(max_digits=10, decimal_places=2)
+
+    updated = model.objects.filter(**lookup).update(
+        total=F('total') + Value(total, output_field=amount_field),
+        total_cents=F('total_cents') + to_cents(total),
+        count=F('count') + count,
+        min_amount=Least('min_amount', Value(min_amount, output_field=amount_field)),
+        max_amount=Greatest('max_amount', Value(max_amount, output_field=amount_field)),
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(
+                **lookup,
+                total=total,
+                total_cents=to_cents(total),
+                count=count,
+                min_amount=min_amount,
+                max_amount=max_amount,
+            )
+    except IntegrityError:
+        # A concurrent write created the bucket first - add to it instead
+        _add_to_bucket(model, lookup, total, count, min_amount, max_amount)
+
+
+def _remove_from_bucket(
+    model,
+    lookup: dict,
+    amount: Decimal,
+    extremes_sources: Iterable[QuerySet],
+    min_field: str,
+    max_field: str,
+) -> None:
+    """
+    Remove one expense from a rollup bucket.
+
+    The bucket is deleted once it is empty. Min/max can't be derived from a
+    subtraction, so they are re-read from the finer-grained source only when
+    the removed amount was one of the bucket's extremes.
+
+    Args:
+        model: Rollup model of the tier
+        lookup: Field values identifying the bucket
+        amount: Amount of the removed expense
+        extremes_sources: Querysets of the rows the bucket's min/max can be
+            re-read from
+        min_field: Field of the sources holding the minimum
+        max_field: Field of the sources holding the maximum
+    """
+    buckets = model.objects.filter(**lookup)
+
+    buckets.update(
+        total=F('total') - amount,
+        total_cents=F('total_cents') - to_cents(amount),
+        count=F('count') - 1,
+    )
+    bucket = buckets.first()
+    if bucket is None:
+        return
+
+    if bucket.count <= 0:
+        bucket.delete()
+        return
+
+    if amount <= bucket.min_amount or amount >= bucket.max_amount:
+        found = [
+            extremes for extremes in (
+                source.aggregate(min_amount=Min(min_field), max_amount=Max(max_field))
+                for source in extremes_sources
+            )
+            if extremes['min_amount'] is not None
+        ]
+        if found:
+            buckets.update(
+                min_amount=min(extremes['min_amount'] for extremes in found),
+                max_amount=max(extremes['max_amount'] for extremes in found),
+            )
+
+
+def add_expense(user_id: int, day: date, category_id: Optional[int], amount: Decimal) -> None:
+    """
+    Record a single expense in its daily and monthly buckets.
+
+    Args:
+        user_id: Owner of the expense
+        day: Date of the expense
+        category_id: Category of the expense (None for uncategorized)
+        amount: Amount of the expense
+    """
+    _add_to_bucket(DailySpendingRollup, _daily_lookup(user_id, day, category_id), amount, 1, amount, amount)
+    _add_to_bucket(MonthlySpendingRollup, _monthly_lookup(user_id, day, category_id), amount, 1, amount, amount)
+
+
+def remove_expense(user_id: int, day: date, category_id: Optional[int], amount: Decimal) -> None:
+    """
+    Take a single expense out of its daily and monthly buckets.
+
+    Args:
+        user_id: Owner of the expense
+        day: Date the expense was recorded under
+        category_id: Category the expense was recorded under
+        amount: Amount of the expense
+    """
+    daily_lookup = _daily_lookup(user_id, day, category_id)
+    _remove_from_bucket(
+        DailySpendingRollup, daily_lookup, amount,
+        # Archived expenses still count towards their day
+        [Expense.objects.filter(**daily_lookup), ExpenseArchive.objects.filter(**daily_lookup)],
+        'amount', 'amount',
+    )
+
+    # The daily tier is already up to date, so the month's extremes are
+    # re-read from (at most 31) daily rows
+    month_start = day.replace(day=1)
+    _remove_from_bucket(
+        MonthlySpendingRollup, _monthly_lookup(user_id, day, category_id), amount,
+        [DailySpendingRollup.objects.filter(
+            user_id=user_id,
+            category_id=category_id,
+            date__gte=month_start,
+            date__lt=add_months(month_start, 1),
+        )],
+        'min_amount', 'max_amount',
+    )
+
+
+def merge_category_into_uncategorized(category) -> None:
+    """
+    Move a category's buckets to the uncategorized buckets of the same periods.
+
+    Deleting a category sets its expenses' category to NULL with a bulk
+    UPDATE (no per-row signals), so the rollups are moved the same way.
+
+    Args:
+        category: Category about to be deleted
+    """
+    for model, key in ((DailySpendingRollup, 'date'), (MonthlySpendingRollup, 'month')):
+        for bucket in model.objects.filter(category=category):
+            _add_to_bucket(
+                model,
+                {"user_id": bucket.user_id, key: getattr(bucket, key), "category_id": None},
+                bucket.total, bucket.count, bucket.min_amount, bucket.max_amount,
+            )
+
+
+# =============================================================================
+# REBUILD
+# =============================================================================
+
+def _bucket_rows(expenses: QuerySet) -> QuerySet:
+    return expenses.order_by().values('user_id', 'date', 'category_id').annotate(
+        bucket_total=Sum('amount'),
+        bucket_cents=Sum('amount_cents'),
+        bucket_count=Count('id'),
+        bucket_min=Min('amount'),
+        bucket_max=Max('amount'),
+    )
+
+
+def _daily_buckets(expenses: QuerySet, archived: QuerySet) -> Iterator[dict]:
+    """Daily bucket rows of the live expenses, merged with those of the archive."""
+    def key(row):
+        return row['date'], row['category_id']
+
+    def merge(row, old):
+        return {
+            **row,
+            'bucket_total': row['bucket_total'] + old['bucket_total'],
+            'bucket_cents': row['bucket_cents'] + old['bucket_cents'],
+            'bucket_count': row['bucket_count'] + old['bucket_count'],
+            'bucket_min': min(row['bucket_min'], old['bucket_min']),
+            'bucket_max': max(row['bucket_max'], old['bucket_max']),
+        }
+
+    # Live buckets are streamed user by user; only the current user's
+    # archived buckets are held in memory to merge into them
+    archived_users = set(archived.order_by().values_list('user_id', flat=True).distinct())
+    current_user, pending = None, {}
+    for row in _bucket_rows(expenses).order_by('user_id').iterator():
+        if row['user_id'] != current_user:
+            yield from pending.values()
+            current_user, pending = row['user_id'], {}
+            if current_user in archived_users:
+                archived_users.discard(current_user)
+                pending = {
+                    key(old): old for old in _bucket_rows(archived.filter(user_id=current_user)).iterator()
+                }
+        old = pending.pop(key(row), None)
+        yield row if old is None else merge(row, old)
+    yield from pending.values()
+
+    for user_id in archived_users:
+        yield from _bucket_rows(archived.filter(user_id=user_id)).iterator()
+
+
+def rebuild_rollups(user_id: Optional[int] = None, batch_size: int = 1000) -> dict:
+    """
+    Rebuild both rollup tiers from the expense and expense archive tables.
+
+    Args:
+        user_id: Only rebuild this user's rollups (all users if None)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        dict: Number of rows written per tier ({"daily": int, "monthly": int})
+    """
+    expenses = Expense.objects.all()
+    archived = ExpenseArchive.objects.all()
+    daily = DailySpendingRollup.objects.all()
+    monthly = MonthlySpendingRollup.objects.all()
+    if user_id is not None:
+        expenses = expenses.filter(user_id=user_id)
+        archived = archived.filter(user_id=user_id)
+        daily = daily.filter(user_id=user_id)
+        monthly = monthly.filter(user_id=user_id)
+
+    with transaction.atomic():
+        # Users whose rollups are replaced, including those left with none
+        rebuilt_users = set(daily.values_list('user_id', flat=True).distinct())
+        daily.delete()
+        monthly.delete()
+
+        daily_written = DailySpendingRollup.objects.bulk_create(
+            (
+                DailySpendingRollup(
+                    user_id=row['user_id'],
+                    date=row['date'],
+                    category_id=row['category_id'],
+                    total=row['bucket_total'],
+                    total_cents=row['bucket_cents'],
+                    count=row['bucket_count'],
+                    min_amount=row['bucket_min'],
+                    max_amount=row['bucket_max'],
+                )
+                for row in _daily_buckets(expenses, archived)
+            ),
+            batch_size=batch_size,
+        )
+
+        # The monthly tier is folded from the freshly written daily tier
+        monthly_buckets = daily.order_by().annotate(
+            bucket_month=TruncMonth('date')
+        ).values('user_id', 'bucket_month', 'category_id').annotate(
+            bucket_total=Sum('total'),
+            bucket_cents=Sum('total_cents'),
+            bucket_count=Sum('count'),
+            bucket_min=Min('min_amount'),
+            bucket_max=Max('max_amount'),
+        )
+        monthly_written = MonthlySpendingRollup.objects.bulk_create(
+            (
+                MonthlySpendingRollup(
+                    user_id=row['user_id'],
+                    month=row['bucket_month'],
+                    category_id=row['category_id'],
+                    total=row['bucket_total'],
+                    total_cents=row['bucket_cents'],
+                    count=row['bucket_count'],
+                    min_amount=row['bucket_min'],
+                    max_amount=row['bucket_max'],
+                )
+                for row in monthly_buckets.iterator()
+            ),
+            batch_size=batch_size,
+        )
+        rebuilt_users.update(rollup.user_id for rollup in daily_written)
+
+    # Dashboard and analytics payloads are read from the rollups, so the
+    # cached ones of every rebuilt user are stale
+    for rebuilt_user in rebuilt_users:
+        bump_data_version(rebuilt_user)
+        pin_reads_to_primary(rebuilt_user)
+
+    return {"daily": len(daily_written), "monthly": len(monthly_written)}
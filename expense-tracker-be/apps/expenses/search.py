@@ -0,0 +1,157 @@
+"""
+Full-text expense search (PostgreSQL), with the ILIKE search as fallback.
+
+On PostgreSQL every expense stores a weighted ``tsvector`` of its title (A)
+and description (B) in ``search_vector``, written by Expense.save() in the
+same INSERT/UPDATE and indexed with GIN. ``?search=`` on the expense list
+then matches each word as a prefix against that index and orders the
+results by rank (an explicit ``?ordering=`` still wins). Other databases
+keep DRF's SearchFilter, i.e. ``ILIKE '%term%'`` on title and description.
+
+Bulk writes that bypass save() (bulk_create, restoring archived expenses)
+call refresh_search_vectors() on the rows they wrote.
+"""
+import re
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, QuerySet, TextField, Value
+from rest_framework import filters
+
+
+SEARCH_INDEX_NAME = 'expense_search_vector_idx'
+
+# Only word characters reach to_tsquery, so user input can't form operators
+_WORD_RE = re.compile(r'\w+')
+
+
+def full_text_search_supported(alias: str) -> bool:
+    """Whether the database behind an alias has PostgreSQL full-text search."""
+    return connections[alias].vendor == 'postgresql'
+
+
+# =============================================================================
+# DOCUMENT VECTORS
+# =============================================================================
+
+def _weighted_vector(title, description) -> SearchVector:
+    config = settings.EXPENSE_SEARCH_CONFIG
+    return (
+        SearchVector(title, weight='A', config=config)
+        + SearchVector(description, weight='B', config=config)
+    )
+
+
+def document_vector(title: str, description: str, alias: str) -> Optional[SearchVector]:
+    """
+    Search vector expression for an expense about to be saved.
+
+    Built from the values themselves (not column references), so it can be
+    part of the INSERT as well as the UPDATE.
+
+    Args:
+        title: Title of the expense
+        description: Description of the expense
+        alias: Database the expense is written to
+
+    Returns:
+        SearchVector expression, or None where full-text search is unsupported
+    """
+    if not full_text_search_supported(alias):
+        return None
+    return _weighted_vector(
+        Value(title or '', output_field=TextField()),
+        Value(description or '', output_field=TextField()),
+    )
+
+
+def refresh_search_vectors(expenses: QuerySet) -> int:
+    """
+    Recompute the stored search vector of expenses in one UPDATE.
+
+    Args:
+        expenses: Expense queryset to refresh
+
+    Returns:
+        int: Number of expenses updated (0 where full-text search is unsupported)
+    """
+    if not full_text_search_supported(expenses.db):
+        return 0
+    return expenses.update(search_vector=_weighted_vector('title', 'description'))
+
+
+def create_search_index(schema_editor) -> None:
+    """
+    Create the GIN index on expenses_expense.search_vector (PostgreSQL only).
+
+    It isn't declared in Expense.Meta because GIN is PostgreSQL-only; the
+    migration creates it through here (the partition conversion carries it
+    over from the catalog).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    qn = connection.ops.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(SEARCH_INDEX_NAME)} "
+        f"ON {qn('expenses_expense')} USING gin ({qn('search_vector')})"
+    )
+
+
+# =============================================================================
+# QUERYING
+# =============================================================================
+
+def prefix_query(terms: List[str]) -> Optional[SearchQuery]:
+    """
+    Query matching every word of the search terms as a prefix ("groc" finds "Groceries").
+
+    Args:
+        terms: Search terms as typed
+
+    Returns:
+        SearchQuery, or None if the terms hold no words
+    """
+    words = [word for term in terms for word in _WORD_RE.findall(term)]
+    if not words:
+        return None
+    raw = ' & '.join(f"'{word}':*" for word in words)
+    return SearchQuery(raw, search_type='raw', config=settings.EXPENSE_SEARCH_CONFIG)
+
+
+def search_expenses(queryset: QuerySet, terms: List[str]) -> QuerySet:
+    """
+    Filter expenses by full-text search terms, best matches first.
+
+    Args:
+        queryset: Expense queryset on a PostgreSQL database
+        terms: Search terms as typed
+
+    Returns:
+        QuerySet: Matching expenses annotated with ``search_rank``
+    """
+    query = prefix_query(terms)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query),
+    ).order_by('-search_rank', '-date', '-id')
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter using the stored search vector on PostgreSQL.
+
+    Falls back to SearchFilter's ILIKE lookups on other databases.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not full_text_search_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_expenses(queryset, terms)
@@ -1,5 +1,6 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Expense, Category, Budget
+from .models import Expense, Category, Budget, ExportJob
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -14,11 +15,11 @@ class CategorySerializer(serializers.ModelSerializer):
 
 class ExpenseSerializer(serializers.ModelSerializer):
     """Serializer for Expense model"""
-    category_name = serializers.CharField(source='category.name', read_only=True)
     user_username = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
         model = Expense
+        # category_name is the snapshot stored on the expense (no join)
         fields = [
             'id', 'user', 'user_username', 'category', 'category_name',
             'title', 'description', 'amount', 'date',
@@ -50,3 +51,23 @@ class RecurringExpenseSerializer(serializers.Serializer):
     category_name = serializers.CharField(required=False, allow_null=True)
     # Input only, used for grouping logic in view
     recurring_frequency = serializers.CharField(write_only=True)
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for ExportJob model (read only - jobs are created from export parameters)"""
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_format', 'status', 'progress', 'rows_total', 'rows_written',
+            'file_size', 'filters_applied', 'error', 'download_url',
+            'created_at', 'started_at', 'finished_at', 'expires_at',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.STATUS_COMPLETED:
+            return None
+        return reverse('export-job-download', args=[obj.pk])
@@ -0,0 +1,108 @@
+"""
+Model signal handlers for the expenses app.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollups, snapshots
+from .cache import bump_data_version
+from .db_routing import pin_reads_to_primary
+from .models import Budget, Category, Expense
+
+
+# =============================================================================
+# SPENDING ROLLUPS
+# =============================================================================
+
+def _rollup_key(instance):
+    """Normalized (user_id, date, category_id, amount) of an expense instance."""
+    return (
+        instance.user_id,
+        Expense._meta.get_field('date').to_python(instance.date),
+        instance.category_id,
+        Expense._meta.get_field('amount').to_python(instance.amount),
+    )
+
+
+def _is_owner_deletion(origin):
+    """True when the delete cascades from a user account being removed."""
+    return isinstance(origin, get_user_model()) or getattr(origin, 'model', None) is get_user_model()
+
+
+@receiver(pre_save, sender=Expense)
+def remember_previous_rollup_key(sender, instance, raw=False, **kwargs):
+    """Capture the stored date/category/amount so updates can move buckets."""
+    instance._previous_rollup_key = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_rollup_key = Expense.objects.filter(pk=instance.pk).values_list(
+        'user_id', 'date', 'category_id', 'amount'
+    ).first()
+
+
+@receiver(post_save, sender=Expense)
+def update_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    """Add the expense to its rollup buckets, moving it out of the old ones on update."""
+    if raw:
+        return
+
+    current = _rollup_key(instance)
+    previous = getattr(instance, '_previous_rollup_key', None)
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        if previous is not None:
+            rollups.remove_expense(*previous)
+        rollups.add_expense(*current)
+
+
+@receiver(post_delete, sender=Expense)
+def update_rollups_on_delete(sender, instance, origin=None, **kwargs):
+    """Take the expense out of its rollup buckets."""
+    if _is_owner_deletion(origin):
+        # The user's rollups are removed by the same cascade
+        return
+    with transaction.atomic():
+        rollups.remove_expense(*_rollup_key(instance))
+
+
+@receiver(pre_delete, sender=Category)
+def move_rollups_to_uncategorized(sender, instance, origin=None, **kwargs):
+    """Expenses of a deleted category become uncategorized - so do its rollups."""
+    if _is_owner_deletion(origin):
+        return
+    rollups.merge_category_into_uncategorized(instance)
+    snapshots.clear_category_snapshots(instance)
+
+
+# =============================================================================
+# CACHE INVALIDATION
+# =============================================================================
+# Connected after the rollup receivers above, and deferred to the commit:
+# a read between the bump and the commit would otherwise cache the old
+# rollup totals under the new data version.
+
+def _invalidate_on_commit(user_id):
+    """Bump a user's data version and pin their reads once the write is committed."""
+    def invalidate():
+        bump_data_version(user_id)
+        pin_reads_to_primary(user_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_user_analytics(sender, instance, origin=None, **kwargs):
+    """Expire the owner's cached analytics and pin their reads to the primary."""
+    if _is_owner_deletion(origin):
+        # One bump per cascaded row, for a user with nothing left to serve
+        return
+    _invalidate_on_commit(instance.user_id)
@@ -0,0 +1,141 @@
+"""
+Category snapshot maintenance.
+
+Every expense carries a copy of its category's name and colour
+(``category_name`` / ``category_color``, both NULL when uncategorized), so
+the expense list, the dashboard's top/recent lists, the recurring list and
+the export never join the category table. The copy is kept current:
+
+- on every expense save (Expense.save)
+- with one bulk UPDATE when a category is renamed or recoloured
+  (CategoryViewSet.perform_update and the admin)
+- by clearing it when a category is deleted (see signals.py)
+
+Archived expenses (archive.py) keep their snapshot too and are updated
+alongside the live ones.
+
+Writes that bypass these paths (raw SQL, queryset.update() of category_id)
+can leave stale copies; the check_category_snapshots command finds and
+repairs them.
+
+The bulk updates send no signals, so each of them bumps the data version
+of the affected users itself once the update commits - cached lists would
+otherwise keep the old name or colour.
+"""
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery
+
+from .cache import bump_data_version
+from .db_routing import pin_reads_to_primary
+from .models import Category, Expense, ExpenseArchive
+
+
+def snapshot_of(category: Optional[Category]) -> dict:
+    """Snapshot field values for expenses of a category (or uncategorized ones)."""
+    return {
+        "category_name": category.name if category else None,
+        "category_color": category.color_code if category else None,
+    }
+
+
+def _invalidate_users(user_ids: Iterable[int]) -> None:
+    """Drop the cached payloads of users whose expenses were bulk updated, once committed."""
+    user_ids = set(user_ids)
+
+    def invalidate():
+        for user_id in user_ids:
+            bump_data_version(user_id)
+            pin_reads_to_primary(user_id)
+
+    # Bumped before the commit, a concurrent read could cache the old
+    # snapshot under the new version
+    transaction.on_commit(invalidate)
+
+
+def refresh_category_snapshots(category: Category) -> int:
+    """
+    Copy a category's current name and colour to all of its expenses.
+
+    Args:
+        category: The saved category
+
+    Returns:
+        int: Number of expenses updated (archived ones included)
+    """
+    updated = sum(
+        model.objects.filter(category=category).update(**snapshot_of(category))
+        for model in (Expense, ExpenseArchive)
+    )
+    if updated:
+        _invalidate_users([category.user_id])
+    return updated
+
+
+def clear_category_snapshots(category: Category) -> int:
+    """
+    Clear the snapshot of a category's expenses, ahead of the category's deletion.
+
+    Args:
+        category: Category about to be deleted
+
+    Returns:
+        int: Number of expenses updated (archived ones included)
+    """
+    updated = sum(
+        model.objects.filter(category=category).update(**snapshot_of(None))
+        for model in (Expense, ExpenseArchive)
+    )
+    if updated:
+        _invalidate_users([category.user_id])
+    return updated
+
+
+def drifted_expenses(user_id: Optional[int] = None) -> QuerySet:
+    """
+    Expenses whose snapshot doesn't match their category.
+
+    Args:
+        user_id: Only check this user's expenses (all users if None)
+
+    Returns:
+        QuerySet: The drifted expenses
+    """
+    expenses = Expense.objects.all()
+    if user_id is not None:
+        expenses = expenses.filter(user_id=user_id)
+
+    uncategorized_drift = Q(category__isnull=True) & (
+        Q(category_name__isnull=False) | Q(category_color__isnull=False)
+    )
+    categorized_drift = Q(category__isnull=False) & (
+        Q(category_name__isnull=True)
+        | Q(category_color__isnull=True)
+        | ~Q(category_name=F('category__name'))
+        | ~Q(category_color=F('category__color_code'))
+    )
+    return expenses.filter(uncategorized_drift | categorized_drift)
+
+
+def repair_snapshots(user_id: Optional[int] = None) -> int:
+    """
+    Rewrite the snapshot of every drifted expense from its category.
+
+    Args:
+        user_id: Only repair this user's expenses (all users if None)
+
+    Returns:
+        int: Number of expenses repaired
+    """
+    drifted = drifted_expenses(user_id)
+    affected_users = list(drifted.order_by().values_list('user_id', flat=True).distinct())
+
+    categories = Category.objects.filter(pk=OuterRef('category_id'))
+    # Uncategorized expenses match no category, so both subqueries give NULL
+    repaired = drifted.update(
+        category_name=Subquery(categories.values('name')[:1]),
+        category_color=Subquery(categories.values('color_code')[:1]),
+    )
+    _invalidate_users(affected_users)
+    return repaired
@@ -0,0 +1,53 @@
+"""
+Title suggestions for search-as-you-type on the expense form.
+"""
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from .db_routing import ReplicaReadMixin
+from .helpers import error_response, safe_int, success_response
+from .models import Expense
+from .title_matching import suggest_titles, trigram_index_supported
+
+
+MIN_SUGGESTION_QUERY = 2
+MAX_SUGGESTIONS = 20
+
+
+class TitleSuggestionView(ReplicaReadMixin, APIView):
+    """
+    Suggest titles the user has used before, fuzzily matching what they type.
+
+    Query Parameters:
+    - q: Partial title (at least 2 characters; shorter queries get no suggestions)
+    - limit: Maximum number of suggestions (default 10, clamped to 1-20)
+
+    Returns titles ranked by trigram word similarity, then by how often
+    they were used.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            query = request.query_params.get('q', '').strip()
+            limit = min(max(safe_int(request.query_params.get('limit'), 10), 1), MAX_SUGGESTIONS)
+
+            suggestions = []
+            if len(query) >= MIN_SUGGESTION_QUERY:
+                suggestions = suggest_titles(request.user, query, limit=limit)
+
+            return success_response(
+                data=suggestions,
+                meta={
+                    "query": query,
+                    "matching": "pg_trgm" if trigram_index_supported(Expense.objects.db) else "in-process",
+                },
+            )
+
+        except Exception as e:
+            return error_response(
+                message="Failed to suggest titles",
+                detail=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
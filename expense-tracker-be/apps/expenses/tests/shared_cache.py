@@ -0,0 +1,39 @@
+"""
+Test helpers for the analytics state cache as deployed: a database table
+shared by every API process.
+"""
+from django.conf import settings
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.test import override_settings
+
+ANALYTICS_STATE_TABLE = 'analytics_state'
+
+SHARED_CACHES = {
+    **settings.CACHES,
+    'analytics_state': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': ANALYTICS_STATE_TABLE,
+        'TIMEOUT': None,
+    },
+}
+
+
+class SharedAnalyticsCacheMixin:
+    """Run a test case against the database state cache."""
+
+    def setUp(self):
+        override = override_settings(CACHES=SHARED_CACHES)
+        override.enable()
+        self.addCleanup(override.disable)
+        # The test databases were created for the local memory cache
+        call_command('createcachetable', database='default', verbosity=0)
+        super().setUp()
+
+
+def other_worker_cache() -> DatabaseCache:
+    """
+    A connection to the state cache that shares no state with this
+    process's, like the one of another gunicorn worker.
+    """
+    return DatabaseCache(ANALYTICS_STATE_TABLE, {'TIMEOUT': None})
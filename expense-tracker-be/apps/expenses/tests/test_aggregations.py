@@ -0,0 +1,134 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from apps.expenses.aggregations import DatabaseSpendingSource, SpendingWindow, aggregate_periods, aggregate_periods_by
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.models import Budget, Category, Expense
+
+User = get_user_model()
+
+
+class AggregatePeriodsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='agg', password='password')
+        self.today = date.today()
+        for days_ago, amount in [(0, '10.00'), (1, '20.00'), (40, '5.00')]:
+            Expense.objects.create(
+                user=self.user,
+                title='Item',
+                amount=Decimal(amount),
+                date=self.today - timedelta(days=days_ago),
+            )
+
+    def test_totals_and_counts_per_period(self):
+        totals = aggregate_periods(Expense.objects.filter(user=self.user), {
+            "today": (self.today, self.today),
+            "two_days": (self.today - timedelta(days=1), self.today),
+            "open_ended": (self.today - timedelta(days=60), None),
+        })
+        self.assertEqual(totals["today"], {"total": Decimal('10.00'), "count": 1})
+        self.assertEqual(totals["two_days"], {"total": Decimal('30.00'), "count": 2})
+        self.assertEqual(totals["open_ended"], {"total": Decimal('35.00'), "count": 3})
+
+    def test_empty_period_defaults_to_zero(self):
+        far_past = self.today - timedelta(days=1000)
+        totals = aggregate_periods(Expense.objects.filter(user=self.user), {
+            "empty": (far_past, far_past),
+        })
+        self.assertEqual(totals["empty"], {"total": Decimal('0'), "count": 0})
+
+    def test_single_query_regardless_of_period_count(self):
+        queryset = Expense.objects.filter(user=self.user)
+        periods = {
+            f"day_{i}": (self.today - timedelta(days=i), self.today - timedelta(days=i))
+            for i in range(30)
+        }
+        with self.assertNumQueries(1):
+            aggregate_periods(queryset, periods)
+
+    def test_grouped_periods_in_one_query(self):
+        food = Category.objects.create(user=self.user, name='Food')
+        Expense.objects.create(user=self.user, category=food, title='Lunch', amount=Decimal('7.00'), date=self.today)
+        with self.assertNumQueries(1):
+            groups = aggregate_periods_by(Expense.objects.filter(user=self.user), {
+                "today": (self.today, self.today),
+                "open_ended": (self.today - timedelta(days=60), None),
+            }, group_by=('category__name',), max_field='amount')
+        by_name = {group['category__name']: results for group, results in groups}
+        self.assertEqual(by_name['Food']['today'], {"total": Decimal('7.00'), "count": 1, "max": Decimal('7.00')})
+        self.assertEqual(by_name[None]['open_ended']['total'], Decimal('35.00'))
+
+    def test_sources_agree_on_period_and_category_totals(self):
+        food = Category.objects.create(user=self.user, name='Food')
+        Expense.objects.create(user=self.user, category=food, title='Lunch', amount=Decimal('7.00'), date=self.today)
+        periods = {
+            "month": (self.today.replace(day=1), None),
+            "last_60": (self.today - timedelta(days=60), None),
+        }
+        database = DatabaseSpendingSource(self.user).period_category_totals(periods, "last_60", 5)
+        window = SpendingWindow(self.user, self.today - timedelta(days=60)).period_category_totals(periods, "last_60", 5)
+        self.assertEqual(database, window)
+
+
+class DashboardQueryCountTests(APITestCase):
+    """Guard the number of round trips the dashboard endpoints make."""
+
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='dash', password='password')
+        self.client.force_authenticate(user=self.user)
+        today = date.today()
+        food = Category.objects.create(user=self.user, name='Food')
+        rent = Category.objects.create(user=self.user, name='Rent')
+        Budget.objects.create(user=self.user, month=today.replace(day=1), budget_amount=Decimal('1000.00'))
+        Expense.objects.create(user=self.user, category=food, title='Lunch', amount=Decimal('12.50'), date=today)
+        Expense.objects.create(user=self.user, category=rent, title='Rent', amount=Decimal('500.00'), date=today)
+        Expense.objects.create(
+            user=self.user, category=food, title='Dinner', amount=Decimal('30.00'),
+            date=today.replace(day=1) - timedelta(days=1),
+        )
+
+    def test_dashboard_summary_query_count(self):
+        # period totals with the category breakdown, budget, top and recent expenses
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['spending']['total_today'], 512.5)
+        self.assertEqual(response.data['comparison']['last_month_total'], 30.0)
+        self.assertEqual(response.data['top_category']['name'], 'Rent')
+
+    def test_top_and_recent_lists_from_one_query(self):
+        month_start = date.today().replace(day=1)
+        for amount in range(1, 7):
+            Expense.objects.create(user=self.user, title=f'Small {amount}', amount=Decimal(amount), date=month_start)
+        response = self.client.get('/api/dashboard/summary/')
+
+        # Last month's dinner is neither this month's top nor among the newest
+        top = [item['amount'] for item in response.data['top_expenses']]
+        self.assertEqual(top, [500.0, 12.5, 6.0, 5.0, 4.0])
+        recent = [item['title'] for item in response.data['recent_expenses']]
+        newest_first = ['Small 6', 'Small 5', 'Small 4']
+        if month_start == date.today():
+            newest_first += ['Small 3', 'Small 2']
+        else:
+            newest_first = ['Rent', 'Lunch'] + newest_first
+        self.assertEqual(recent, newest_first)
+
+    def test_weekly_spending_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/weekly-spending/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 7)
+        self.assertEqual(response.data['summary']['highest_spending_amount'], 512.5)
+
+    def test_budget_alerts_query_count(self):
+        # daily rollup totals, monthly rollup totals, budget month/year totals
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/alerts/budget/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['month']['budget'], 1000.0)
+        self.assertEqual(response.data['data']['day']['expense'], 512.5)
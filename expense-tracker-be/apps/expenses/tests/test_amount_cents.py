@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APITestCase
+
+from apps.expenses.helpers import cents_to_float, format_cents, to_cents
+from apps.expenses.models import Budget, DailySpendingRollup, Expense, MonthlySpendingRollup
+from apps.expenses.rollups import rebuild_rollups
+
+User = get_user_model()
+
+
+class CentsConversionTests(SimpleTestCase):
+    def test_to_cents(self):
+        self.assertEqual(to_cents(Decimal('12.34')), 1234)
+        self.assertEqual(to_cents('0.1'), 10)
+        self.assertEqual(to_cents(19.99), 1999)
+        self.assertEqual(to_cents(Decimal('0.005')), 1)
+        self.assertEqual(to_cents(None), 0)
+
+    def test_cents_to_float_matches_decimal_conversion(self):
+        for amount in ('0.01', '0.10', '12.34', '99999999.99'):
+            with self.subTest(amount=amount):
+                self.assertEqual(cents_to_float(to_cents(Decimal(amount))), float(Decimal(amount)))
+        self.assertEqual(cents_to_float(None), 0.0)
+
+    def test_format_cents(self):
+        self.assertEqual(format_cents(123456), '1234.56')
+        self.assertEqual(format_cents(5), '0.05')
+        self.assertEqual(format_cents(-250), '-2.50')
+
+
+class AmountCentsStorageTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cents', password='password')
+
+    def test_save_keeps_cents_in_sync(self):
+        expense = Expense.objects.create(user=self.user, title='Lunch', amount=Decimal('12.50'), date=date(2025, 3, 1))
+        self.assertEqual(Expense.objects.get(pk=expense.pk).amount_cents, 1250)
+
+        expense.amount = Decimal('7.05')
+        expense.save(update_fields=['amount'])
+        self.assertEqual(Expense.objects.get(pk=expense.pk).amount_cents, 705)
+
+        budget = Budget.objects.create(user=self.user, month=date(2025, 3, 1), budget_amount=Decimal('1000.00'))
+        self.assertEqual(Budget.objects.get(pk=budget.pk).budget_amount_cents, 100000)
+
+    def test_rollup_cents_match_rebuild(self):
+        day = date(2025, 3, 1)
+        first = Expense.objects.create(user=self.user, title='A', amount=Decimal('0.10'), date=day)
+        Expense.objects.create(user=self.user, title='B', amount=Decimal('0.20'), date=day)
+        first.amount = Decimal('1.15')
+        first.save()
+
+        self.assertEqual(DailySpendingRollup.objects.get(user=self.user).total_cents, 135)
+        self.assertEqual(MonthlySpendingRollup.objects.get(user=self.user).total_cents, 135)
+
+        rebuild_rollups(user_id=self.user.pk)
+        self.assertEqual(DailySpendingRollup.objects.get(user=self.user).total_cents, 135)
+        self.assertEqual(MonthlySpendingRollup.objects.get(user=self.user).total_cents, 135)
+
+
+class ExportCentsTests(APITestCase):
+    def test_csv_totals_are_exact(self):
+        user = User.objects.create_user(username='export-cents', password='password')
+        self.client.force_authenticate(user=user)
+        for _ in range(10):
+            Expense.objects.create(user=user, title='Coffee', amount=Decimal('0.10'), date=date(2025, 1, 1))
+
+        response = self.client.get('/api/export/', {'export_format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Total Amount: PHP 1.00', content)
+        self.assertIn(',0.1,', content)
@@ -0,0 +1,141 @@
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import (
+    bump_data_version,
+    clear_analytics_cache,
+    get_analytics_cache,
+    get_data_version,
+    get_state_cache,
+)
+from apps.expenses.models import Budget, Category, DailySpendingRollup, Expense
+from apps.expenses.rollups import rebuild_rollups
+from apps.expenses.tests.shared_cache import SharedAnalyticsCacheMixin, other_worker_cache
+
+User = get_user_model()
+
+
+class AnalyticsCacheTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='cache', password='password')
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Coffee', amount=Decimal('5.00'), date=date.today())
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.client.get('/api/dashboard/summary/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get('/api/analytics/monthly-trend/', {'months': 3})
+        with self.assertNumQueries(1):
+            self.client.get('/api/analytics/monthly-trend/', {'months': 6})
+
+    def test_expense_write_invalidates_cache(self):
+        self.client.get('/api/dashboard/summary/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/expenses/', {
+                'title': 'Lunch', 'amount': '10.00', 'date': str(date.today()),
+            })
+        self.assertEqual(response.status_code, 201)
+        summary = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(summary.data['spending']['total_today'], 15.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/expenses/{response.data['id']}/")
+        summary = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(summary.data['spending']['total_today'], 5.0)
+
+    def test_budget_write_invalidates_cache(self):
+        self.client.get('/api/alerts/budget/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/budgets/', {
+                'month': str(date.today().replace(day=1)), 'budget_amount': '300.00',
+            })
+        alerts = self.client.get('/api/alerts/budget/')
+        self.assertEqual(alerts.data['data']['month']['budget'], 300.0)
+
+    def test_category_write_invalidates_cache(self):
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/categories/', {'name': 'Food'})
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_invalidation_waits_for_commit(self):
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Expense.objects.create(user=self.user, title='Tea', amount=Decimal('2.00'), date=date.today())
+            # A read before the commit must not cache under a new version
+            self.assertEqual(get_data_version(self.user.pk), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_user_deletion_skips_per_row_invalidation(self):
+        Budget.objects.create(user=self.user, month=date.today().replace(day=1), budget_amount=Decimal('100.00'))
+        Category.objects.create(user=self.user, name='Food')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.delete()
+        self.assertEqual(callbacks, [])
+
+    def test_evicted_version_is_reseeded(self):
+        version = get_data_version(self.user.pk)
+        get_state_cache().delete(f'analytics:version:{self.user.pk}')
+        bump_data_version(self.user.pk)
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_rollup_rebuild_invalidates_cache(self):
+        self.client.get('/api/dashboard/summary/')
+        # A bulk update sends no signals - the rebuild picks it up
+        Expense.objects.filter(user=self.user).update(amount=Decimal('8.00'), amount_cents=800)
+        rebuild_rollups()
+        summary = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(summary.data['spending']['total_today'], 8.0)
+
+    def test_payload_eviction_keeps_versions(self):
+        version = get_data_version(self.user.pk)
+        small = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'analytics-small',
+            'OPTIONS': {'MAX_ENTRIES': 2},
+        }
+        with override_settings(CACHES={**settings.CACHES, 'analytics': small}):
+            for months in range(1, 8):
+                self.client.get('/api/analytics/monthly-trend/', {'months': months})
+            self.assertLess(len(get_analytics_cache()._cache), 7)  # Payloads were evicted
+        self.assertEqual(get_data_version(self.user.pk), version)
+
+    @override_settings(ANALYTICS_CACHE_ENABLED=False)
+    def test_process_local_cache_with_several_workers_is_off(self):
+        self.client.get('/api/dashboard/summary/')
+        DailySpendingRollup.objects.filter(user=self.user).update(total=Decimal('7.00'), total_cents=700)
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.data['spending']['total_today'], 7.0)
+        self.assertNotIn('ETag', response)
+
+
+class SharedAnalyticsCacheTests(SharedAnalyticsCacheMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='shared-cache', password='password')
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Coffee', amount=Decimal('5.00'), date=date.today())
+
+    def test_version_bumped_by_another_worker_invalidates(self):
+        self.client.get('/api/dashboard/summary/')
+        with self.assertNumQueries(1):  # The version - payloads stay in process
+            self.client.get('/api/dashboard/summary/')
+
+        # A write handled by another process (signals skipped here)
+        DailySpendingRollup.objects.filter(user=self.user).update(total=Decimal('7.00'), total_cents=700)
+        other_worker_cache().incr(f'analytics:version:{self.user.pk}')
+
+        summary = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(summary.data['spending']['total_today'], 7.0)
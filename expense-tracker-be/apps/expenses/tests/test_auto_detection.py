@@ -1,7 +1,9 @@
 from datetime import date, timedelta
 from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
 from rest_framework.test import APITestCase
 from rest_framework import status
+from apps.expenses.helpers import normalize_title
 from apps.expenses.models import Expense
 
 User = get_user_model()
@@ -111,3 +113,52 @@ class AutoDetectionTests(APITestCase):
         response = self.client.post(self.url, data)
         expense = Expense.objects.get(id=response.data['id'])
         self.assertFalse(expense.is_recurring)
+
+    def test_title_variants_match(self):
+        """Case, padding and punctuation differences still match the history."""
+        Expense.objects.create(
+            user=self.user,
+            title='NETFLIX.',
+            amount=15.00,
+            date=date.today() - timedelta(days=30),
+        )
+
+        response = self.client.post(self.url, {
+            'title': ' netflix ',
+            'amount': 15.00,
+            'date': str(date.today()),
+        })
+        expense = Expense.objects.get(id=response.data['id'])
+        self.assertEqual(expense.normalized_title, 'netflix')
+        self.assertTrue(expense.is_recurring)
+        self.assertEqual(expense.recurring_frequency, 'monthly')
+
+    def test_recurring_list_groups_title_variants(self):
+        for days_ago, title in [(60, 'Netflix'), (30, 'netflix '), (0, 'NETFLIX')]:
+            Expense.objects.create(
+                user=self.user,
+                title=title,
+                amount=15.00,
+                date=date.today() - timedelta(days=days_ago),
+                is_recurring=True,
+                recurring_frequency='monthly',
+            )
+
+        response = self.client.get('/api/expenses/recurring/')
+        self.assertEqual(len(response.data['monthly']), 1)
+        self.assertEqual(response.data['monthly'][0]['occurrences'], 3)
+
+    def test_partial_save_keeps_normalized_title_in_sync(self):
+        expense = Expense.objects.create(user=self.user, title='Gym', amount=30.00, date=date.today())
+        expense.title = 'Gym Membership'
+        expense.save(update_fields=['title'])
+        expense.refresh_from_db()
+        self.assertEqual(expense.normalized_title, 'gym membership')
+
+
+class NormalizeTitleTests(SimpleTestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_title('  Netflix   Premium!! '), 'netflix premium')
+        self.assertEqual(normalize_title('AT&T_bill'), 'at t bill')
+        self.assertEqual(normalize_title('STRASSE'), normalize_title('Straße'))
+        self.assertEqual(normalize_title(None), '')
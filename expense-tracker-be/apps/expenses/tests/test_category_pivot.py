@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.models import Category, Expense
+
+User = get_user_model()
+
+
+class CategoryPivotTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='pivot', password='password')
+        self.client.force_authenticate(user=self.user)
+        rent = Category.objects.create(user=self.user, name='Rent')
+        food = Category.objects.create(user=self.user, name='Food')
+        fun = Category.objects.create(user=self.user, name='Fun')
+        for category, day, amount in [
+            (rent, date(2025, 1, 1), '500.00'),
+            (rent, date(2025, 3, 1), '500.00'),
+            (food, date(2025, 1, 5), '40.00'),
+            (food, date(2025, 1, 20), '10.00'),
+            (fun, date(2025, 2, 14), '30.00'),
+            (None, date(2025, 3, 9), '5.00'),
+            (food, date(2024, 12, 31), '99.00'),
+        ]:
+            Expense.objects.create(user=self.user, category=category, title='Item', amount=Decimal(amount), date=day)
+
+    def test_matrix_layout(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/category-breakdown/', {
+                'pivot': 'month', 'start': '2025-01', 'end': '2025-03',
+            })
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(data['months'], ['2025-01', '2025-02', '2025-03'])
+        self.assertEqual([c['name'] for c in data['categories']], ['Rent', 'Food', 'Fun', 'Uncategorized'])
+        self.assertEqual(response.data['meta']['shape'], [4, 3])
+        self.assertEqual(data['values'], [
+            500.0, 0.0, 500.0,
+            50.0, 0.0, 0.0,
+            0.0, 30.0, 0.0,
+            0.0, 0.0, 5.0,
+        ])
+        self.assertEqual(response.data['summary']['month_totals'], [550.0, 30.0, 505.0])
+        self.assertEqual(response.data['summary']['total'], 1085.0)
+
+    def test_categories_beyond_top_are_merged(self):
+        response = self.client.get('/api/analytics/category-breakdown/', {
+            'pivot': 'month', 'start': '2025-01', 'end': '2025-03', 'top': '2',
+        })
+        data = response.data['data']
+        self.assertEqual([c['name'] for c in data['categories']], ['Rent', 'Food', 'Other'])
+        self.assertEqual(data['categories'][-1]['merged'], 2)
+        self.assertEqual(data['values'][6:], [0.0, 30.0, 5.0])
+
+    def test_invalid_pivot(self):
+        for params in ({'pivot': 'week'}, {'pivot': 'month', 'start': '2025-06', 'end': '2025-01'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/analytics/category-breakdown/', params)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,115 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.expenses.benchmarking import seed_benchmark_user
+from apps.expenses.cache import clear_analytics_cache, get_data_version
+from apps.expenses.models import Category, Expense
+from apps.expenses.snapshots import clear_category_snapshots, drifted_expenses, refresh_category_snapshots
+
+User = get_user_model()
+
+
+class CategorySnapshotTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='snapshot', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(user=self.user, name='Food', color_code='#00FF00')
+        for title in ('Lunch', 'Dinner'):
+            Expense.objects.create(
+                user=self.user, category=self.food, title=title, amount=Decimal('10.00'), date=date.today()
+            )
+        self.loose = Expense.objects.create(user=self.user, title='Misc', amount=Decimal('1.00'), date=date.today())
+
+    def snapshots(self):
+        return set(Expense.objects.filter(user=self.user).values_list('category_name', 'category_color'))
+
+    def test_save_copies_category(self):
+        self.assertEqual(self.snapshots(), {('Food', '#00FF00'), (None, None)})
+
+        self.loose.category = self.food
+        self.loose.save(update_fields=['category'])
+        self.assertEqual(Expense.objects.get(pk=self.loose.pk).category_name, 'Food')
+
+    def test_rename_updates_expenses_in_one_statement(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.patch(f'/api/categories/{self.food.pk}/', {'name': 'Groceries', 'color_code': '#123456'})
+        self.assertEqual(response.status_code, 200)
+
+        expense_updates = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('UPDATE "expenses_expense"')
+        ]
+        self.assertEqual(len(expense_updates), 1)
+        self.assertEqual(self.snapshots(), {('Groceries', '#123456'), (None, None)})
+
+    def test_description_change_leaves_expenses_alone(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.client.patch(f'/api/categories/{self.food.pk}/', {'description': 'Meals'})
+        self.assertFalse([q for q in captured.captured_queries if q['sql'].startswith('UPDATE "expenses_expense"')])
+
+    def test_delete_clears_snapshot(self):
+        self.client.delete(f'/api/categories/{self.food.pk}/')
+        self.assertEqual(self.snapshots(), {(None, None)})
+
+    def test_reads_are_join_free(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/expenses/')
+        self.assertEqual({item['category_name'] for item in response.data}, {'Food', None})
+
+        expense_selects = [q['sql'] for q in captured.captured_queries if 'FROM "expenses_expense"' in q['sql']]
+        self.assertTrue(expense_selects)
+        for sql in expense_selects:
+            self.assertNotIn('expenses_category', sql)
+
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual({item['category'] for item in response.data['recent_expenses']}, {'Food', None})
+
+    def test_check_command_repairs_drift(self):
+        Expense.objects.filter(pk=self.loose.pk).update(category_name='Stale')
+        Expense.objects.filter(category=self.food).update(category_color='#000000')
+        self.assertEqual(drifted_expenses(self.user.pk).count(), 3)
+
+        out = StringIO()
+        call_command('check_category_snapshots', stdout=out)
+        self.assertIn('3 expenses have a stale category snapshot', out.getvalue())
+        self.assertEqual(drifted_expenses().count(), 3)
+
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('check_category_snapshots', '--repair', stdout=StringIO())
+        self.assertFalse(drifted_expenses().exists())
+        self.assertEqual(self.snapshots(), {('Food', '#00FF00'), (None, None)})
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_bulk_snapshot_updates_invalidate_cache(self):
+        self.client.get('/api/dashboard/summary/')
+        # Renamed without signals, so only the snapshot refresh invalidates
+        Category.objects.filter(pk=self.food.pk).update(name='Groceries')
+        self.food.refresh_from_db()
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            refresh_category_snapshots(self.food)
+            # Not before the commit - a read now would cache the old name
+            self.assertEqual(get_data_version(self.user.pk), version)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual({item['category'] for item in response.data['recent_expenses']}, {'Groceries', None})
+
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            clear_category_snapshots(self.food)
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_benchmark_seed_has_consistent_snapshots(self):
+        user = seed_benchmark_user(50, days=30)
+        self.assertTrue(Expense.objects.filter(user=user, category_name__isnull=False).exists())
+        self.assertFalse(drifted_expenses(user.pk).exists())
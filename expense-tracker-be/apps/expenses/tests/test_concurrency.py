@@ -0,0 +1,44 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.expenses.concurrency import can_run_concurrently, run_concurrently
+
+
+class RunConcurrentlyTests(SimpleTestCase):
+    def test_tasks_run_on_pool_threads(self):
+        caller = threading.get_ident()
+        with mock.patch('apps.expenses.concurrency.can_run_concurrently', return_value=True):
+            results = run_concurrently({
+                "a": threading.get_ident,
+                "b": threading.get_ident,
+            }, max_workers=2)
+        self.assertEqual(list(results), ["a", "b"])
+        self.assertNotIn(caller, results.values())
+
+    def test_task_exception_is_raised(self):
+        def fail():
+            raise ValueError("boom")
+
+        with mock.patch('apps.expenses.concurrency.can_run_concurrently', return_value=True):
+            with self.assertRaises(ValueError):
+                run_concurrently({"ok": lambda: 1, "fail": fail}, max_workers=2)
+
+    def test_workers_keep_persistent_connections(self):
+        # Workers recycle connections like a request does instead of closing them
+        with mock.patch('apps.expenses.concurrency.can_run_concurrently', return_value=True), \
+                mock.patch('apps.expenses.concurrency.close_old_connections') as close_old:
+            run_concurrently({"a": lambda: 1, "b": lambda: 2}, max_workers=2)
+        self.assertEqual(close_old.call_count, 4)
+
+    def test_single_worker_runs_on_caller_thread(self):
+        caller = threading.get_ident()
+        results = run_concurrently({"a": threading.get_ident, "b": threading.get_ident}, max_workers=1)
+        self.assertEqual(set(results.values()), {caller})
+
+
+class CanRunConcurrentlyTests(TestCase):
+    def test_sequential_inside_transaction(self):
+        # TestCase wraps every test in a transaction other connections can't see
+        self.assertFalse(can_run_concurrently())
@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.models import Expense
+from apps.expenses.tests.shared_cache import SharedAnalyticsCacheMixin, other_worker_cache
+
+User = get_user_model()
+
+CONDITIONAL_ENDPOINTS = [
+    '/api/dashboard/summary/',
+    '/api/analytics/category-breakdown/',
+    '/api/analytics/weekly-spending/',
+    '/api/analytics/monthly-trend/',
+    '/api/expenses/',
+]
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='etag', password='password')
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Coffee', amount=Decimal('5.00'), date=date.today())
+
+    def test_matching_etag_returns_304_without_queries(self):
+        for url in CONDITIONAL_ENDPOINTS:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_weak_and_listed_etags_match(self):
+        etag = self.client.get('/api/expenses/')['ETag']
+        response = self.client.get('/api/expenses/', HTTP_IF_NONE_MATCH=f'"stale", W/{etag}')
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/dashboard/summary/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/expenses/', {'title': 'Tea', 'amount': '3.00', 'date': str(date.today())})
+
+        response = self.client.get('/api/dashboard/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_params_change_etag(self):
+        first = self.client.get('/api/analytics/monthly-trend/', {'months': 3})['ETag']
+        second = self.client.get('/api/analytics/monthly-trend/', {'months': 6})['ETag']
+        self.assertNotEqual(first, second)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get('/api/expenses/')['ETag']
+        other = User.objects.create_user(username='other', password='password')
+        self.client.force_authenticate(user=other)
+        response = self.client.get('/api/expenses/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ANALYTICS_CACHE_ENABLED=False)
+    def test_no_etags_without_a_shared_cache(self):
+        for url in CONDITIONAL_ENDPOINTS:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('ETag', response)
+
+
+class SharedVersionConditionalGetTests(SharedAnalyticsCacheMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='shared-etag', password='password')
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Coffee', amount=Decimal('5.00'), date=date.today())
+
+    def test_write_in_another_worker_changes_etag(self):
+        for url in CONDITIONAL_ENDPOINTS:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+                other_worker_cache().incr(f'analytics:version:{self.user.pk}')
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.models import Budget, Category, Expense
+
+User = get_user_model()
+
+
+class DashboardBundleTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='bundle', password='password')
+        self.client.force_authenticate(user=self.user)
+        today = date.today()
+        food = Category.objects.create(user=self.user, name='Food', color_code='#F59E0B')
+        rent = Category.objects.create(user=self.user, name='Rent')
+        Budget.objects.create(user=self.user, month=today.replace(day=1), budget_amount=Decimal('1000.00'))
+        Expense.objects.create(user=self.user, category=food, title='Lunch', amount=Decimal('12.50'), date=today)
+        Expense.objects.create(user=self.user, category=rent, title='Rent', amount=Decimal('500.00'), date=today)
+        Expense.objects.create(user=self.user, title='Misc', amount=Decimal('7.25'), date=today)
+        Expense.objects.create(
+            user=self.user, category=food, title='Dinner', amount=Decimal('30.00'),
+            date=today.replace(day=1) - timedelta(days=1),
+        )
+        Expense.objects.create(
+            user=self.user, category=food, title='Gym', amount=Decimal('45.00'),
+            date=today - timedelta(days=120), is_recurring=True, recurring_frequency='monthly',
+        )
+
+    def test_sections_match_standalone_endpoints(self):
+        response = self.client.get('/api/dashboard/bundle/', {'months': '12'})
+        self.assertEqual(response.status_code, 200)
+        bundle = response.data['data']
+
+        standalone = {
+            'summary': ('/api/dashboard/summary/', {}),
+            'category_breakdown': ('/api/analytics/category-breakdown/', {}),
+            'weekly_spending': ('/api/analytics/weekly-spending/', {}),
+            'monthly_trend': ('/api/analytics/monthly-trend/', {'months': '12'}),
+            'budget_alerts': ('/api/alerts/budget/', {}),
+            'recurring': ('/api/expenses/recurring/', {}),
+        }
+        for section, (url, params) in standalone.items():
+            with self.subTest(section=section):
+                self.assertEqual(bundle[section], self.client.get(url, params).data)
+
+    def test_sections_subset(self):
+        response = self.client.get('/api/dashboard/bundle/', {'sections': 'weekly_spending,budget_alerts'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['data']), ['weekly_spending', 'budget_alerts'])
+        self.assertEqual(response.data['meta']['sections'], ['weekly_spending', 'budget_alerts'])
+
+    def test_unknown_section_is_rejected(self):
+        response = self.client.get('/api/dashboard/bundle/', {'sections': 'summary,bogus'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count(self):
+        # daily rollups, budgets, top and recent expenses, recurring
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/dashboard/bundle/')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,110 @@
+import csv
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from apps.expenses.archive import archive_expenses, restore_expenses
+from apps.expenses.cache import clear_analytics_cache, get_data_version
+from apps.expenses.models import Category, DailySpendingRollup, Expense, ExpenseArchive, MonthlySpendingRollup
+from apps.expenses.rollups import rebuild_rollups
+
+User = get_user_model()
+
+
+class ExpenseArchiveTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='archive', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(user=self.user, name='Food')
+        self.old = [
+            Expense.objects.create(user=self.user, category=self.food, title='Old lunch',
+                                   amount=Decimal('12.50'), date=date(2019, 3, 1)),
+            Expense.objects.create(user=self.user, title='Old rent', amount=Decimal('800.00'), date=date(2020, 6, 1)),
+        ]
+        self.recent = Expense.objects.create(
+            user=self.user, category=self.food, title='New lunch', amount=Decimal('9.00'), date=date(2025, 2, 1)
+        )
+
+    def rollups(self):
+        fields = ('category_id', 'total', 'total_cents', 'count', 'min_amount', 'max_amount')
+        return (
+            sorted(DailySpendingRollup.objects.filter(user=self.user).values_list('date', *fields), key=str),
+            sorted(MonthlySpendingRollup.objects.filter(user=self.user).values_list('month', *fields), key=str),
+        )
+
+    def export_titles(self, **params):
+        response = self.client.get('/api/export/', {'export_format': 'csv', **params})
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+        header = rows.index(['ID', 'Date', 'Title', 'Description', 'Category', 'Amount', 'Recurring', 'Frequency'])
+        return [row[2] for row in rows[header + 1:] if len(row) == 8]
+
+    def test_archive_moves_rows_and_keeps_rollups(self):
+        before = self.rollups()
+        version = get_data_version(self.user.pk)
+        created_at = self.old[0].created_at
+
+        self.assertEqual(archive_expenses(date(2021, 1, 1), batch_size=1), 2)
+
+        # No delete signals, but the owner's cached payloads are still invalidated
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+        self.assertEqual(list(Expense.objects.filter(user=self.user)), [self.recent])
+        archived = ExpenseArchive.objects.get(pk=self.old[0].pk)
+        self.assertEqual((archived.title, archived.amount_cents, archived.category_name), ('Old lunch', 1250, 'Food'))
+        self.assertEqual(archived.created_at, created_at)
+        self.assertEqual(self.rollups(), before)
+
+        # A rebuild counts the archived expenses too
+        rebuild_rollups(user_id=self.user.pk)
+        self.assertEqual(self.rollups(), before)
+
+    def test_export_unions_archive_when_range_reaches_it(self):
+        archive_expenses(date(2021, 1, 1))
+
+        self.assertEqual(self.export_titles(), ['New lunch', 'Old rent', 'Old lunch'])
+        self.assertEqual(self.export_titles(start_date='2020-01-01', end_date='2025-12-31'), ['New lunch', 'Old rent'])
+        self.assertEqual(self.export_titles(start_date='2024-01-01'), ['New lunch'])
+        self.assertEqual(self.export_titles(category=self.food.pk), ['New lunch', 'Old lunch'])
+
+    def test_deleting_live_expense_keeps_archived_extremes(self):
+        archive_expenses(date(2021, 1, 1))
+        # Back-dated onto an archived day
+        extra = Expense.objects.create(user=self.user, title='Snack', amount=Decimal('1.00'), date=date(2020, 6, 1))
+        extra.delete()
+
+        bucket = DailySpendingRollup.objects.get(user=self.user, date=date(2020, 6, 1), category=None)
+        self.assertEqual((bucket.count, bucket.min_amount, bucket.max_amount), (1, Decimal('800.00'), Decimal('800.00')))
+
+    def test_category_rename_reaches_archive(self):
+        archive_expenses(date(2021, 1, 1))
+        self.client.patch(f'/api/categories/{self.food.pk}/', {'name': 'Groceries'})
+        self.assertEqual(ExpenseArchive.objects.get(pk=self.old[0].pk).category_name, 'Groceries')
+
+    def test_restore_brings_rows_back(self):
+        before = self.rollups()
+        archive_expenses(date(2021, 1, 1))
+
+        self.assertEqual(restore_expenses(user_id=self.user.pk, start=date(2020, 1, 1)), 1)
+        self.assertTrue(Expense.objects.filter(pk=self.old[1].pk, title='Old rent').exists())
+
+        out = StringIO()
+        call_command('restore_archived_expenses', stdout=out)
+        self.assertIn('Restored 1 archived expenses', out.getvalue())
+        self.assertFalse(ExpenseArchive.objects.exists())
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.rollups(), before)
+
+    def test_archive_command(self):
+        out = StringIO()
+        call_command('archive_expenses', '--before', '2021-01-01', '--dry-run', stdout=out)
+        self.assertIn('2 expenses dated before 2021-01-01 would be archived', out.getvalue())
+        self.assertFalse(ExpenseArchive.objects.exists())
+
+        call_command('archive_expenses', '--before', '2021-01-01', stdout=StringIO())
+        self.assertEqual(ExpenseArchive.objects.count(), 2)
@@ -0,0 +1,118 @@
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.expenses.export_jobs import cleanup_export_jobs, export_file_path
+from apps.expenses.models import ExportJob, Expense
+
+User = get_user_model()
+
+
+class ExportJobTests(APITestCase):
+    def setUp(self):
+        self.storage = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage, ignore_errors=True)
+        settings_override = override_settings(EXPORT_STORAGE_DIR=self.storage, EXPORT_JOBS_PER_USER=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='jobs', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, title in ((1, 'Rent'), (2, 'Groceries')):
+            Expense.objects.create(user=self.user, title=title, amount=Decimal('12.50'), date=date(2025, 3, day))
+
+    def submit(self, **data):
+        return self.client.post('/api/export/jobs/', data, format='json')
+
+    def work(self):
+        out = StringIO()
+        call_command('run_export_worker', '--once', stdout=out, stderr=out)
+        return out.getvalue()
+
+    def test_job_runs_and_downloads(self):
+        response = self.submit(export_format='csv', start_date='2025-03-02', end_date='2025-03-31')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['data']['id']
+        self.assertEqual((response.data['data']['status'], response.data['data']['download_url']), ('pending', None))
+
+        self.assertIn(f'Export job {job_id} (csv) completed', self.work())
+
+        job = self.client.get(f'/api/export/jobs/{job_id}/').data['data']
+        self.assertEqual((job['status'], job['progress'], job['rows_total'], job['rows_written']), ('completed', 100, 1, 1))
+        self.assertEqual(job['filters_applied'], ['Start Date: 2025-03-02', 'End Date: 2025-03-31'])
+
+        response = self.client.get(job['download_url'])
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Groceries', content)
+        self.assertNotIn('Rent', content)
+        self.assertEqual(len(content.encode()), job['file_size'])
+
+    def test_pdf_and_xlsx_jobs(self):
+        pdf = self.submit(export_format='pdf').data['data']['id']
+        xlsx = self.submit(export_format='xlsx').data['data']['id']
+        self.work()
+
+        self.assertTrue(b''.join(self.client.get(f'/api/export/jobs/{pdf}/download/').streaming_content).startswith(b'%PDF'))
+        self.assertTrue(b''.join(self.client.get(f'/api/export/jobs/{xlsx}/download/').streaming_content).startswith(b'PK'))
+
+    def test_validation_and_limits(self):
+        response = self.submit(export_format='doc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Supported formats', response.data['error'])
+
+        self.assertEqual(self.submit().status_code, 202)
+        self.assertEqual(self.submit().status_code, 202)
+        self.assertEqual(self.submit().status_code, 429)
+
+        job = ExportJob.objects.filter(user=self.user).first()
+        self.assertEqual(self.client.get(f'/api/export/jobs/{job.pk}/download/').status_code, 409)
+        self.assertEqual(self.client.delete(f'/api/export/jobs/{job.pk}/').status_code, 204)
+        self.assertEqual(self.submit().status_code, 202)
+
+    @unittest.skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE')
+    def test_submission_locks_the_user_before_counting(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.submit().status_code, 202)
+        sql = [query['sql'] for query in queries]
+        lock = next(i for i, query in enumerate(sql) if 'FOR UPDATE' in query)
+        count = next(i for i, query in enumerate(sql) if 'COUNT(' in query and 'expenses_exportjob' in query)
+        self.assertLess(lock, count)
+
+    def test_jobs_are_private(self):
+        job_id = self.submit().data['data']['id']
+        other = User.objects.create_user(username='other-jobs', password='password')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(f'/api/export/jobs/{job_id}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/export/jobs/').data['data'], [])
+
+    def test_cleanup_expires_files_and_abandoned_jobs(self):
+        job_id = self.submit().data['data']['id']
+        self.work()
+        job = ExportJob.objects.get(pk=job_id)
+        self.assertTrue(export_file_path(job).exists())
+
+        stale = ExportJob.objects.create(
+            user=self.user, export_format='pdf', status=ExportJob.STATUS_RUNNING,
+            started_at=timezone.now() - timedelta(days=1),
+        )
+        ExportJob.objects.filter(pk=job_id).update(expires_at=timezone.now())
+
+        self.assertEqual(cleanup_export_jobs(), {"expired": 1, "abandoned": 1, "deleted": 0})
+        self.assertFalse(export_file_path(job).exists())
+        self.assertEqual(self.client.get(f'/api/export/jobs/{job_id}/download/').status_code, 410)
+        self.assertEqual(ExportJob.objects.get(pk=stale.pk).status, ExportJob.STATUS_FAILED)
+
+        ExportJob.objects.update(finished_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(cleanup_export_jobs()['deleted'], 2)
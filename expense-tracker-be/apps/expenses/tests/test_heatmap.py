@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.helpers import intensity_level, quantile_thresholds
+from apps.expenses.models import Expense
+
+User = get_user_model()
+
+
+class IntensityLevelTests(SimpleTestCase):
+    def test_levels_follow_quartiles(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+        thresholds = quantile_thresholds(values)
+        self.assertEqual(len(thresholds), 3)
+        self.assertEqual(intensity_level(0, thresholds), 0)
+        self.assertEqual(intensity_level(1.0, thresholds), 1)
+        self.assertEqual(intensity_level(8.0, thresholds), 4)
+
+    def test_single_value_is_top_level(self):
+        thresholds = quantile_thresholds([12.5])
+        self.assertEqual(intensity_level(12.5, thresholds), 4)
+        self.assertEqual(quantile_thresholds([]), [])
+
+    def test_equal_values_are_top_level(self):
+        thresholds = quantile_thresholds([9.0, 9.0, 9.0, 9.0, 9.0])
+        self.assertEqual([intensity_level(9.0, thresholds) for _ in range(5)], [4] * 5)
+
+    def test_ties_below_the_top_keep_their_quantile(self):
+        thresholds = quantile_thresholds([2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 10.0, 20.0])
+        self.assertEqual(intensity_level(2.0, thresholds), 1)
+        self.assertEqual(intensity_level(20.0, thresholds), 4)
+
+
+class SpendingHeatmapTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='heatmap', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, amount in [
+            (date(2024, 1, 1), '5.00'),
+            (date(2024, 1, 1), '5.00'),
+            (date(2024, 3, 15), '20.00'),
+            (date(2024, 7, 4), '80.00'),
+            (date(2024, 12, 31), '40.00'),
+            (date(2025, 1, 1), '999.00'),
+        ]:
+            Expense.objects.create(user=self.user, title='Item', amount=Decimal(amount), date=day)
+
+    def test_full_year_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/heatmap/', {'year': '2024'})
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(len(data), 366)
+        self.assertEqual(data[0], {"date": "2024-01-01", "total": 10.0, "count": 2, "level": 1})
+        self.assertEqual(data[1]['level'], 0)
+        self.assertEqual(response.data['summary']['total'], 150.0)
+        self.assertEqual(response.data['summary']['days_with_spending'], 4)
+        self.assertEqual(response.data['summary']['busiest_day'], '2024-07-04')
+        levels = {item['date']: item['level'] for item in data if item['level']}
+        self.assertEqual(levels['2024-07-04'], 4)
+
+    def test_explicit_range(self):
+        response = self.client.get('/api/analytics/heatmap/', {'start': '2024-12-31', 'end': '2025-01-01'})
+        self.assertEqual([item['total'] for item in response.data['data']], [40.0, 999.0])
+
+    def test_invalid_ranges(self):
+        for params in ({'year': '1900'}, {'start': '2020-01-01', 'end': '2024-12-31'}, {'start': 'soon'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/analytics/heatmap/', params)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,133 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.expenses.models import Category, Expense
+
+from apps.expenses.partitioning import (
+    create_year_partitions,
+    existing_partition_years,
+    is_partitioned,
+    partition_name,
+    partitioning_supported,
+)
+from apps.expenses.search import SEARCH_INDEX_NAME
+from apps.expenses.title_matching import TITLE_INDEX_NAME
+
+
+class PartitioningFallbackTests(TestCase):
+    """Without PostgreSQL partitioning everything degrades to a no-op."""
+
+    def setUp(self):
+        if partitioning_supported(connection):
+            self.skipTest('Fallback behaviour only applies without partitioning support')
+
+    def test_inspection_reports_a_regular_table(self):
+        self.assertFalse(is_partitioned('expenses_expense'))
+        self.assertEqual(existing_partition_years('expenses_expense'), [])
+
+    def test_partition_creation_is_a_no_op(self):
+        self.assertEqual(create_year_partitions('expenses_expense', [2025, 2026]), [])
+
+    def test_command_does_nothing(self):
+        out = StringIO()
+        call_command('manage_expense_partitions', '--convert', stdout=out)
+        self.assertIn('does not support table partitioning', out.getvalue())
+
+
+class PartitionNameTests(SimpleTestCase):
+    def test_partition_name(self):
+        self.assertEqual(partition_name('expenses_expense', 2025), 'expenses_expense_y2025')
+
+
+@unittest.skipUnless(partitioning_supported(connection), 'needs PostgreSQL partitioning')
+class PartitionConversionTests(TestCase):
+    """Converting a populated table keeps its rows, ids, keys and indexes."""
+
+    table = 'expenses_expense'
+
+    def setUp(self):
+        if is_partitioned(self.table):
+            self.skipTest('The test database was migrated with EXPENSE_PARTITIONING on')
+        self.user = get_user_model().objects.create_user(
+            username='partitioned', email='partitioned@example.com', password='pass123!'
+        )
+        self.category = Category.objects.create(user=self.user, name='Food')
+        Expense.objects.bulk_create([
+            Expense(
+                user=self.user,
+                category=self.category,
+                title=f'Expense {day}',
+                amount=Decimal('10.00'),
+                amount_cents=1000,
+                date=day,
+            )
+            for day in [date(2024, 3, 1), date(2024, 11, 30), date(2025, 1, 1), date(2025, 6, 15)]
+        ])
+        self.max_id = Expense.objects.order_by('-id').values_list('id', flat=True).first()
+        self.constraints = self.constraint_definitions()
+
+        call_command('manage_expense_partitions', '--convert', stdout=StringIO())
+
+    def fetch(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def constraint_definitions(self):
+        return set(self.fetch(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('f', 'c')",
+            [self.table],
+        ))
+
+    def test_rows_are_kept(self):
+        self.assertTrue(is_partitioned(self.table))
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 4)
+        self.assertEqual(
+            self.fetch(f'SELECT COUNT(*) FROM {partition_name(self.table, 2024)}'), [(2,)]
+        )
+        self.assertIn(2025, existing_partition_years(self.table))
+
+    def test_ids_continue_after_the_copied_rows(self):
+        expense = Expense.objects.create(
+            user=self.user, title='New', amount=Decimal('1.00'), date=date(2025, 7, 1)
+        )
+        self.assertGreater(expense.pk, self.max_id)
+
+    def test_foreign_keys_are_recreated(self):
+        referenced = {
+            row[0] for row in self.fetch(
+                "SELECT confrelid::regclass::text FROM pg_constraint "
+                "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+                [self.table],
+            )
+        }
+        self.assertEqual(referenced, {get_user_model()._meta.db_table, Category._meta.db_table})
+
+    def test_constraints_keep_their_names_and_definitions(self):
+        self.assertTrue(self.constraints)
+        self.assertEqual(self.constraint_definitions(), self.constraints)
+
+    def test_indexes_are_recreated(self):
+        indexes = {
+            row[0] for row in self.fetch('SELECT indexname FROM pg_indexes WHERE tablename = %s', [self.table])
+        }
+        for index in Expense._meta.indexes:
+            self.assertIn(index.name, indexes)
+        self.assertIn(SEARCH_INDEX_NAME, indexes)
+        self.assertIn(TITLE_INDEX_NAME, indexes)
+
+    def test_date_range_reads_one_partition(self):
+        plan = Expense.objects.filter(
+            user=self.user, date__gte=date(2025, 1, 1), date__lt=date(2025, 7, 1)
+        ).explain()
+        self.assertIn(partition_name(self.table, 2025), plan)
+        self.assertNotIn(partition_name(self.table, 2024), plan)
+        self.assertNotIn(f'{self.table}_default', plan)
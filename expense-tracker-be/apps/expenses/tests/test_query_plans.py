@@ -0,0 +1,105 @@
+import random
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.models import Category, Expense
+
+User = get_user_model()
+
+# A plan step reading the whole expense table instead of seeking an index
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN "?expenses_expense"?(?!\s+USING)'),
+    'postgresql': re.compile(r'Seq Scan on "?expenses_expense"?'),
+}
+
+
+class ExpenseQueryPlanTests(APITestCase):
+    """Every expense query of the hot endpoints must be an index seek."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        today = date.today()
+        users = [User.objects.create_user(username=f'plan{i}', password='password') for i in range(20)]
+        cls.user = users[0]
+        categories = {user.pk: Category.objects.create(user=user, name='Food') for user in users}
+        Expense.objects.bulk_create(
+            Expense(
+                user=user,
+                category=categories[user.pk] if rng.random() < 0.7 else None,
+                title=title,
+                normalized_title=title.casefold(),
+                amount=Decimal(rng.randint(100, 9999)) / 100,
+                date=today - timedelta(days=rng.randrange(730)),
+                is_recurring=rng.random() < 0.05,
+                recurring_frequency='monthly',
+            )
+            for user in users
+            for title in (rng.choice(['Coffee', 'Netflix', 'Rent', 'Fuel']) for _ in range(250))
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        clear_analytics_cache()
+        self.client.force_authenticate(user=self.user)
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Only a missing index may make the planner pick a full scan
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+            else:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def assert_no_full_scans(self, request):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f'No plan check for {connection.vendor}')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = request()
+            if response.streaming:
+                # Streamed responses query while their content is read
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400)
+
+        expense_queries = [
+            query['sql'] for query in captured.captured_queries
+            if 'expenses_expense' in query['sql'] and query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+        self.assertTrue(expense_queries)
+        for sql in expense_queries:
+            plan = self.explain(sql)
+            self.assertIsNone(pattern.search(plan), f'Full scan of expenses_expense:\n{sql}\n{plan}')
+
+    def test_expense_list(self):
+        self.assert_no_full_scans(lambda: self.client.get('/api/expenses/', {'ordering': '-date'}))
+
+    def test_expense_list_by_category(self):
+        category = Category.objects.get(user=self.user)
+        self.assert_no_full_scans(lambda: self.client.get('/api/expenses/', {'category': category.pk}))
+
+    def test_dashboard_summary(self):
+        self.assert_no_full_scans(lambda: self.client.get('/api/dashboard/summary/'))
+
+    def test_recurring_expenses(self):
+        self.assert_no_full_scans(lambda: self.client.get('/api/expenses/recurring/'))
+
+    def test_export_date_range(self):
+        start = (date.today() - timedelta(days=90)).isoformat()
+        self.assert_no_full_scans(lambda: self.client.get('/api/export/', {'export_format': 'csv', 'start_date': start}))
+
+    def test_create_with_recurring_detection(self):
+        self.assert_no_full_scans(lambda: self.client.post('/api/expenses/', {
+            'title': 'Netflix', 'amount': '15.99', 'date': date.today().isoformat(),
+        }))
@@ -0,0 +1,112 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.db_routing import ReadReplicaRouter, is_pinned_to_primary, pin_reads_to_primary
+from apps.expenses.models import DailySpendingRollup, Expense
+from apps.expenses.tests.shared_cache import SharedAnalyticsCacheMixin, other_worker_cache
+
+User = get_user_model()
+
+
+HAS_REPLICA = 'replica' in settings.DATABASES
+
+
+@unittest.skipUnless(HAS_REPLICA, 'needs a replica database (config.test_settings)')
+@override_settings(DATABASE_REPLICA_ALIAS='replica', DATABASE_REPLICA_PIN_SECONDS=60)
+class ReadReplicaRoutingTests(APITestCase):
+    databases = {'default', 'replica'} if HAS_REPLICA else {'default'}
+
+    def setUp(self):
+        clear_analytics_cache()
+        self.today = date.today()
+        self.user = User.objects.create_user(username='replica', password='password')
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Lunch', amount=Decimal('10.00'), date=self.today)
+
+        # The stand-in replica holds different numbers, so each response
+        # shows which database it was read from
+        User.objects.db_manager('replica').create_user(id=self.user.pk, username='replica', password='password')
+        DailySpendingRollup.objects.using('replica').create(
+            user_id=self.user.pk, date=self.today, total=Decimal('99.00'), total_cents=9900,
+            count=1, min_amount=Decimal('99.00'), max_amount=Decimal('99.00'),
+        )
+        clear_analytics_cache()
+
+    def weekly_total(self):
+        response = self.client.get('/api/analytics/weekly-spending/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['summary']['total']
+
+    def test_analytics_reads_go_to_replica(self):
+        with CaptureQueriesContext(connections['default']) as primary:
+            self.assertEqual(self.weekly_total(), 99.0)
+        self.assertFalse([q for q in primary.captured_queries if 'rollup' in q['sql']])
+
+    def test_other_endpoints_read_primary(self):
+        response = self.client.get('/api/expenses/')
+        self.assertEqual([item['title'] for item in response.data], ['Lunch'])
+
+    def test_writer_is_pinned_to_primary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/expenses/', {
+                'title': 'Coffee', 'amount': '5.00', 'date': self.today.isoformat(),
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Expense.objects.using('replica').exists())
+        self.assertTrue(is_pinned_to_primary(self.user.pk))
+
+        self.assertEqual(self.weekly_total(), 15.0)
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/expenses/', {'title': 'Coffee', 'amount': '5.00', 'date': self.today.isoformat()})
+        self.assertFalse(is_pinned_to_primary(self.user.pk))
+        self.assertEqual(self.weekly_total(), 99.0)
+
+    @override_settings(ANALYTICS_CACHE_ENABLED=False)
+    def test_unshared_cache_reads_primary(self):
+        self.assertEqual(self.weekly_total(), 10.0)
+
+
+class SharedCacheReadReplicaRoutingTests(SharedAnalyticsCacheMixin, ReadReplicaRoutingTests):
+    """The routing tests against the database cache, with pins crossing workers."""
+
+    def test_pin_set_by_another_worker(self):
+        other_worker_cache().set(f'replica:pinned:{self.user.pk}', True, timeout=60)
+        self.assertEqual(self.weekly_total(), 10.0)
+
+    def test_write_pins_reads_of_another_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/expenses/', {'title': 'Coffee', 'amount': '5.00', 'date': self.today.isoformat()})
+        with mock.patch('apps.expenses.db_routing.get_state_cache', other_worker_cache):
+            self.assertEqual(self.weekly_total(), 15.0)
+
+    def test_cache_is_read_from_primary(self):
+        router = ReadReplicaRouter()
+        with mock.patch('apps.expenses.db_routing._read_alias') as read_alias:
+            read_alias.get.return_value = 'replica'
+            self.assertEqual(router.db_for_read(other_worker_cache().cache_model_class), 'default')
+            self.assertEqual(router.db_for_read(Expense), 'replica')
+
+
+class ReadReplicaRouterTests(unittest.TestCase):
+    def test_without_request_routing(self):
+        router = ReadReplicaRouter()
+        self.assertIsNone(router.db_for_read(Expense))
+        self.assertEqual(router.db_for_write(Expense, instance=Expense()), 'default')
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_pinning_is_noop_without_replica(self):
+        pin_reads_to_primary(12345)
+        self.assertFalse(is_pinned_to_primary(12345))
@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.expenses.models import Category, DailySpendingRollup, Expense, MonthlySpendingRollup
+
+User = get_user_model()
+
+
+class DailySpendingRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='rollup', password='password')
+        self.food = Category.objects.create(user=self.user, name='Food')
+        self.rent = Category.objects.create(user=self.user, name='Rent')
+        self.today = date.today()
+
+    def _bucket(self, day, category):
+        return DailySpendingRollup.objects.filter(user=self.user, date=day, category=category).first()
+
+    def _month_bucket(self, day, category):
+        return MonthlySpendingRollup.objects.filter(
+            user=self.user, month=day.replace(day=1), category=category
+        ).first()
+
+    def _snapshot(self):
+        fields = ('category_id', 'total', 'total_cents', 'count', 'min_amount', 'max_amount')
+        return (
+            sorted(DailySpendingRollup.objects.filter(user=self.user).values_list('date', *fields), key=str),
+            sorted(MonthlySpendingRollup.objects.filter(user=self.user).values_list('month', *fields), key=str),
+        )
+
+    def test_create_adds_to_bucket(self):
+        Expense.objects.create(user=self.user, category=self.food, title='A', amount=Decimal('10.00'), date=self.today)
+        Expense.objects.create(user=self.user, category=self.food, title='B', amount=Decimal('4.50'), date=self.today)
+
+        bucket = self._bucket(self.today, self.food)
+        self.assertEqual(bucket.total, Decimal('14.50'))
+        self.assertEqual(bucket.count, 2)
+        self.assertEqual(bucket.min_amount, Decimal('4.50'))
+        self.assertEqual(bucket.max_amount, Decimal('10.00'))
+
+    def test_update_moves_between_dates_and_categories(self):
+        expense = Expense.objects.create(
+            user=self.user, category=self.food, title='A', amount=Decimal('10.00'), date=self.today
+        )
+        yesterday = self.today - timedelta(days=1)
+
+        expense.date = yesterday
+        expense.category = self.rent
+        expense.amount = Decimal('12.00')
+        expense.save()
+
+        self.assertIsNone(self._bucket(self.today, self.food))
+        bucket = self._bucket(yesterday, self.rent)
+        self.assertEqual((bucket.total, bucket.count), (Decimal('12.00'), 1))
+
+    def test_delete_refreshes_extremes(self):
+        small = Expense.objects.create(user=self.user, title='A', amount=Decimal('1.00'), date=self.today)
+        Expense.objects.create(user=self.user, title='B', amount=Decimal('5.00'), date=self.today)
+        Expense.objects.create(user=self.user, title='C', amount=Decimal('9.00'), date=self.today)
+
+        small.delete()
+
+        bucket = self._bucket(self.today, None)
+        self.assertEqual((bucket.total, bucket.count), (Decimal('14.00'), 2))
+        self.assertEqual(bucket.min_amount, Decimal('5.00'))
+
+    def test_deleting_last_expense_removes_bucket(self):
+        expense = Expense.objects.create(user=self.user, title='A', amount=Decimal('1.00'), date=self.today)
+        expense.delete()
+        self.assertFalse(DailySpendingRollup.objects.filter(user=self.user).exists())
+
+    def test_monthly_tier_follows_daily_tier(self):
+        first = Expense.objects.create(user=self.user, title='A', amount=Decimal('2.00'), date=self.today.replace(day=1))
+        Expense.objects.create(user=self.user, title='B', amount=Decimal('8.00'), date=self.today)
+
+        bucket = self._month_bucket(self.today, None)
+        self.assertEqual((bucket.total, bucket.count), (Decimal('10.00'), 2))
+        self.assertEqual((bucket.min_amount, bucket.max_amount), (Decimal('2.00'), Decimal('8.00')))
+
+        first.delete()
+        bucket = self._month_bucket(self.today, None)
+        self.assertEqual((bucket.total, bucket.count), (Decimal('8.00'), 1))
+        self.assertEqual(bucket.min_amount, Decimal('8.00'))
+
+    def test_back_dating_only_touches_the_affected_month(self):
+        expense = Expense.objects.create(user=self.user, title='A', amount=Decimal('5.00'), date=self.today)
+        last_year = date(self.today.year - 1, 6, 15)
+
+        expense.date = last_year
+        expense.save()
+
+        self.assertIsNone(self._month_bucket(self.today, None))
+        self.assertEqual(self._month_bucket(last_year, None).total, Decimal('5.00'))
+
+    def test_deleting_category_moves_rollups_to_uncategorized(self):
+        Expense.objects.create(user=self.user, category=self.food, title='A', amount=Decimal('3.00'), date=self.today)
+        Expense.objects.create(user=self.user, title='B', amount=Decimal('2.00'), date=self.today)
+
+        self.food.delete()
+
+        bucket = self._bucket(self.today, None)
+        self.assertEqual((bucket.total, bucket.count), (Decimal('5.00'), 2))
+        self.assertEqual(DailySpendingRollup.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self._month_bucket(self.today, None).total, Decimal('5.00'))
+
+    def test_deleting_user_cascades(self):
+        Expense.objects.create(user=self.user, category=self.food, title='A', amount=Decimal('3.00'), date=self.today)
+        self.user.delete()
+        self.assertFalse(DailySpendingRollup.objects.exists())
+
+    def test_rebuild_matches_incremental_maintenance(self):
+        for offset, category, amount in [(0, self.food, '3.00'), (0, self.food, '7.25'), (2, self.rent, '500.00'), (2, None, '1.00')]:
+            Expense.objects.create(
+                user=self.user, category=category, title='X', amount=Decimal(amount),
+                date=self.today - timedelta(days=offset),
+            )
+        maintained = self._snapshot()
+
+        DailySpendingRollup.objects.all().delete()
+        MonthlySpendingRollup.objects.all().delete()
+        call_command('rebuild_spending_rollups', stdout=StringIO())
+
+        self.assertEqual(self._snapshot(), maintained)
@@ -0,0 +1,57 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from apps.expenses.models import Expense
+from apps.expenses.search import prefix_query
+
+User = get_user_model()
+
+
+class ExpenseSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='search', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, title, description in (
+            (1, 'Groceries', 'Weekly market run'),
+            (2, 'Electricity bill', 'Meralco'),
+            (3, 'Coffee', 'Groceries were closed'),
+        ):
+            Expense.objects.create(
+                user=self.user, title=title, description=description,
+                amount=Decimal('10.00'), date=date(2025, 1, day),
+            )
+
+    def search(self, term, **params):
+        response = self.client.get('/api/expenses/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.data]
+
+    def test_prefix_query_only_passes_words(self):
+        query = prefix_query(["groc's", '&!bill'])
+        self.assertEqual(query.source_expressions[-1].value, "'groc':* & 's':* & 'bill':*")
+        self.assertIsNone(prefix_query(['&|!']))
+
+    def test_search_matches_title_and_description(self):
+        self.assertEqual(set(self.search('groceries')), {'Groceries', 'Coffee'})
+        self.assertEqual(self.search('meralco'), ['Electricity bill'])
+        self.assertEqual(self.search('groc', ordering='date'), ['Groceries', 'Coffee'])
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'SQLite fallback')
+    def test_fallback_keeps_substring_matching(self):
+        self.assertIsNone(Expense.objects.filter(user=self.user).values_list('search_vector', flat=True).first())
+        self.assertEqual(self.search('tricity'), ['Electricity bill'])
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'needs PostgreSQL full-text search')
+    def test_title_matches_rank_first(self):
+        # A title hit (weight A) outranks a description hit (weight B)
+        self.assertEqual(self.search('groceries'), ['Groceries', 'Coffee'])
+
+        expense = Expense.objects.get(title='Coffee')
+        expense.title = 'Meralco refund'
+        expense.save(update_fields=['title'])
+        self.assertEqual(self.search('meralco')[0], 'Meralco refund')
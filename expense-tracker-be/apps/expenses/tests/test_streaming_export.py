@@ -0,0 +1,222 @@
+import csv
+import json
+import re
+import unittest
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+from rest_framework.test import APITestCase
+
+from apps.expenses.archive import archive_expenses
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses import exporters, pdf_report
+from apps.expenses.export_rows import ExportRows
+from apps.expenses.exporters import write_pdf
+from apps.expenses.models import Category, Expense
+
+User = get_user_model()
+
+HAS_REPLICA = 'replica' in settings.DATABASES
+
+
+class StreamingCsvExportTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='stream', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, amount in ((1, '10.00'), (2, '20.50'), (3, '4.25')):
+            Expense.objects.create(user=self.user, title=f'Day {day}', amount=Decimal(amount), date=date(2020, 1, day))
+
+    def test_csv_is_streamed_with_running_totals(self):
+        response = self.client.get('/api/export/', {'export_format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as captured:
+            first = next(chunks)
+        self.assertTrue(first.startswith(b'SpendWise - Expense Report'))
+        self.assertEqual(len(captured), 0)
+
+        rows = list(csv.reader(StringIO((first + b''.join(chunks)).decode())))
+        self.assertIn(['Total Records: 3'], rows)
+        header = rows.index(['ID', 'Date', 'Title', 'Description', 'Category', 'Amount', 'Recurring', 'Frequency'])
+        self.assertEqual([row[2] for row in rows[header + 1:header + 4]], ['Day 3', 'Day 2', 'Day 1'])
+        self.assertEqual(rows[-3:], [['Total Amount: PHP 34.75'], ['Number of Expenses: 3'], ['Average Amount: PHP 11.58']])
+
+    def test_rows_merge_archive_in_small_chunks(self):
+        archive_expenses(date(2020, 1, 2))
+        rows = ExportRows(self.user, {}, chunk_size=1)
+        self.assertEqual(rows.count(), 3)
+        self.assertEqual([(row.title, row.amount_cents) for row in rows], [('Day 3', 425), ('Day 2', 2050), ('Day 1', 1000)])
+
+    def test_empty_export(self):
+        response = self.client.get('/api/export/', {'export_format': 'csv', 'start_date': '2024-01-01'})
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Total Records: 0', content)
+        self.assertIn('No expenses found matching your criteria', content)
+
+
+class XlsxExportTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='xlsx', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, amount in ((1, '10.00'), (2, '20.50'), (3, '4.25')):
+            Expense.objects.create(user=self.user, title=f'Day {day}', amount=Decimal(amount), date=date(2020, 1, day))
+        Expense.objects.create(
+            user=self.user, title='A much longer expense title', amount=Decimal('1.00'), date=date(2019, 1, 1)
+        )
+
+    def export(self):
+        response = self.client.get('/api/export/', {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return load_workbook(BytesIO(b''.join(response.streaming_content)))['Expenses']
+
+    def test_write_only_workbook(self):
+        sheet = self.export()
+        self.assertEqual(sheet['A4'].value, 'Total Records: 4')
+        self.assertEqual([cell.value for cell in sheet[6]][:3], ['ID', 'Date', 'Title'])
+        self.assertEqual(sheet['A6'].style, 'export_header')
+        self.assertEqual([sheet.cell(row=row, column=3).value for row in range(7, 11)],
+                         ['Day 3', 'Day 2', 'Day 1', 'A much longer expense title'])
+        self.assertEqual(sheet['F7'].number_format, '"PHP" #,##0.00')
+        self.assertEqual(sheet['B13'].value, 35.75)
+        self.assertEqual(sheet['B14'].value, 4)
+        self.assertEqual(sheet.column_dimensions['C'].width, len('A much longer expense title') + 2)
+
+    @mock.patch('apps.expenses.exporters.XLSX_WIDTH_SAMPLE', 2)
+    def test_widths_from_sample(self):
+        sheet = self.export()
+        self.assertEqual(sheet['A4'].value, 'Total Records: 4')
+        self.assertEqual(sheet.cell(row=10, column=3).value, 'A much longer expense title')
+        self.assertEqual(sheet.column_dimensions['C'].width, len('Title') + 2)
+        self.assertEqual(sheet['B14'].value, 4)
+
+
+class PdfExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pdf', password='password')
+        food = Category.objects.create(user=self.user, name='Food')
+        Expense.objects.create(user=self.user, title='Lunch', amount=Decimal('10.00'), date=date(2020, 1, 1), category=food)
+        Expense.objects.create(user=self.user, title='Dinner', amount=Decimal('5.50'), date=date(2025, 1, 2), category=food)
+        Expense.objects.create(user=self.user, title='Parking', amount=Decimal('2.25'), date=date(2025, 1, 3))
+
+    def test_summary_is_aggregated_by_the_database(self):
+        archive_expenses(date(2021, 1, 1))
+        with mock.patch('apps.expenses.exporters.pdf_report.report_head', wraps=pdf_report.report_head) as head:
+            write_pdf(ExportRows(self.user, {}), [], BytesIO())
+        self.assertEqual(head.call_args.args[1:], (3, 17.75, {'Food': 15.5, 'Uncategorized': 2.25}))
+
+    def test_transactions_fill_whole_pages(self):
+        per_page = pdf_report.rows_per_page(pdf_report.PAGE_SIZE[1] - 2 * pdf_report.PAGE_MARGIN - 12)
+        count = 2 * per_page + 1
+        rows = (pdf_report.transaction_cells(number, [0, '2025-01-01', 'Title', '', 'Food', 1.0, 'No', 'N/A'])
+                for number in range(1, count + 1))
+        output = BytesIO()
+        pdf_report.render(output, [], rows, count)
+        self.assertEqual(len(re.findall(rb'/Type /Page\b(?!s)', output.getvalue())), 3)
+
+    def test_cells_stay_on_one_line(self):
+        cells = pdf_report.transaction_cells(7, [1, '2025-01-01', 'Rent', 'First line\nsecond', 'Home', 1234.5, 'No', 'N/A'])
+        self.assertEqual(cells, ('7', '2025-01-01', 'Rent', 'First line second', 'Home', 'PHP 1,234.50', 'No'))
+
+    @mock.patch('apps.expenses.pdf_report.PAGES_PER_PART', 1)
+    def test_parallel_render_matches_sequential(self):
+        count = 60
+        head = pdf_report.report_head([], count, 60.0, {'Food': 60.0})
+
+        def rows():
+            return (pdf_report.transaction_cells(number, [0, '2025-01-01', 'Title', '', 'Food', 1.0, 'No', 'N/A'])
+                    for number in range(1, count + 1))
+
+        sequential, parallel = BytesIO(), BytesIO()
+        pdf_report.render(sequential, head, rows(), count)
+        pdf_report.render_parallel(parallel, head, rows(), count, workers=2)
+
+        from pypdf import PdfReader
+        pages = [[page.extract_text() for page in PdfReader(output).pages] for output in (sequential, parallel)]
+        self.assertEqual(len(pages[0]), len(pages[1]))
+        numbers = [int(n) for text in pages[1] for n in re.findall(r'(\d+)\n2025-01-01', text)]
+        self.assertEqual(numbers, list(range(1, count + 1)))
+        self.assertIn('automatically generated by SpendWise', pages[1][-1])
+
+
+class AnalyticsExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='columnar', password='password')
+        self.client.force_authenticate(user=self.user)
+        food = Category.objects.create(user=self.user, name='Food')
+        Expense.objects.create(
+            user=self.user, title='Lunch', description='Team lunch', amount=Decimal('10.05'),
+            date=date(2020, 1, 1), category=food, is_recurring=True, recurring_frequency='weekly',
+        )
+        Expense.objects.create(user=self.user, title='Parking', amount=Decimal('2.25'), date=date(2025, 1, 3))
+        archive_expenses(date(2021, 1, 1))
+
+    def export(self, export_format):
+        response = self.client.get('/api/export/', {'export_format': export_format})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_is_streamed_rows_only(self):
+        records = [json.loads(line) for line in self.export('ndjson').decode().splitlines()]
+        self.assertEqual(records[0]['title'], 'Parking')
+        self.assertEqual((records[0]['category'], records[0]['recurring_frequency']), (None, None))
+        self.assertEqual(
+            {key: value for key, value in records[1].items() if key != 'id'},
+            {'date': '2020-01-01', 'title': 'Lunch', 'description': 'Team lunch', 'category': 'Food',
+             'amount': '10.05', 'is_recurring': True, 'recurring_frequency': 'weekly'},
+        )
+
+    def test_parquet_and_arrow_columns_are_typed(self):
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        tables = [
+            pyarrow.parquet.read_table(BytesIO(self.export('parquet'))),
+            pyarrow.ipc.open_file(BytesIO(self.export('arrow'))).read_all(),
+        ]
+        for table in tables:
+            self.assertEqual(table.schema, exporters.arrow_schema())
+            self.assertEqual(table.column('amount').to_pylist(), [Decimal('2.25'), Decimal('10.05')])
+            self.assertEqual(table.column('date').to_pylist(), [date(2025, 1, 3), date(2020, 1, 1)])
+            self.assertEqual(table.column('category').to_pylist(), [None, 'Food'])
+
+    @mock.patch('apps.expenses.exporters.pyarrow', None)
+    def test_columnar_formats_need_pyarrow(self):
+        response = self.client.get('/api/export/', {'export_format': 'parquet'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Format unavailable')
+        self.assertEqual(self.client.post('/api/export/jobs/', {'export_format': 'arrow'}, format='json').status_code, 400)
+
+
+@unittest.skipUnless(HAS_REPLICA, 'needs a replica database (config.test_settings)')
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class StreamingExportReplicaTests(APITestCase):
+    databases = {'default', 'replica'} if HAS_REPLICA else {'default'}
+
+    def test_stream_keeps_reading_the_replica(self):
+        clear_analytics_cache()
+        user = User.objects.create_user(username='stream-replica', password='password')
+        self.client.force_authenticate(user=user)
+        User.objects.db_manager('replica').create_user(id=user.pk, username='stream-replica', password='password')
+        Expense.objects.using('replica').bulk_create([Expense(
+            user_id=user.pk, title='Replica lunch', normalized_title='replica lunch',
+            amount=Decimal('7.00'), amount_cents=700, date=date(2025, 1, 1),
+        )])
+
+        # The view's replica routing ends before the body is read
+        response = self.client.get('/api/export/', {'export_format': 'csv'})
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Replica lunch', content)
+        self.assertIn('Total Amount: PHP 7.00', content)
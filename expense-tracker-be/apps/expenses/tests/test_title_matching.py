@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from apps.expenses.models import Expense
+from apps.expenses.title_matching import cluster_titles, similarity, trigrams, word_similarity
+
+User = get_user_model()
+
+
+class TrigramTests(SimpleTestCase):
+    def test_trigrams_follow_pg_trgm(self):
+        self.assertEqual(trigrams('Bill!'), {'  b', ' bi', 'bil', 'ill', 'll '})
+        self.assertEqual(trigrams('...'), set())
+
+    def test_similarity(self):
+        self.assertGreater(similarity('meralco bill', 'meralco bill jan'), 0.7)
+        self.assertLess(similarity('meralco bill', 'netflix'), 0.1)
+        self.assertEqual(similarity('', 'netflix'), 0.0)
+        self.assertEqual(word_similarity('mer', 'meralco bill'), 0.75)
+
+    def test_cluster_titles(self):
+        groups = cluster_titles(['meralco bill', 'netflix', 'meralco bill jan', 'netflix premium'], threshold=0.5)
+        self.assertEqual(groups['meralco bill jan'], 'meralco bill')
+        self.assertEqual(groups['netflix'], 'netflix')
+
+
+class FuzzyTitleMatchingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='fuzzy', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.today = date.today()
+        Expense.objects.create(
+            user=self.user, title='Meralco bill', amount=Decimal('2100.00'),
+            date=self.today - timedelta(days=30), is_recurring=True, recurring_frequency='monthly',
+        )
+
+    def add(self, title):
+        response = self.client.post('/api/expenses/', {
+            'title': title, 'amount': '2300.00', 'date': self.today.isoformat(),
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def test_exact_mode_misses_variant(self):
+        self.assertFalse(self.add('Meralco Bill Jan')['is_recurring'])
+
+    @override_settings(EXPENSE_TITLE_MATCHING='fuzzy')
+    def test_fuzzy_detection_and_grouping(self):
+        created = self.add('Meralco Bill Jan')
+        self.assertEqual((created['is_recurring'], created['recurring_frequency']), (True, 'monthly'))
+
+        response = self.client.get('/api/expenses/recurring/')
+        self.assertEqual(len(response.data['monthly']), 1)
+        self.assertEqual(response.data['monthly'][0]['occurrences'], 2)
+
+    def test_title_suggestions(self):
+        Expense.objects.create(user=self.user, title='Netflix', amount=Decimal('549.00'), date=self.today)
+
+        response = self.client.get('/api/expenses/title-suggestions/', {'q': 'mer'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['title'] for item in response.data['data']], ['Meralco bill'])
+        self.assertEqual(response.data['data'][0]['uses'], 1)
+
+        response = self.client.get('/api/expenses/title-suggestions/', {'q': 'm'})
+        self.assertEqual(response.data['data'], [])
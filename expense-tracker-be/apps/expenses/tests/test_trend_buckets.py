@@ -0,0 +1,89 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from apps.expenses.cache import clear_analytics_cache
+from apps.expenses.helpers import bucket_floor, bucket_starts, fit_trend_bucket
+from apps.expenses.models import Expense
+
+User = get_user_model()
+
+
+class TrendBucketHelperTests(SimpleTestCase):
+    def test_bucket_floor(self):
+        day = date(2025, 8, 14)  # a Thursday
+        self.assertEqual(bucket_floor(day, 'week'), date(2025, 8, 11))
+        self.assertEqual(bucket_floor(day, 'quarter'), date(2025, 7, 1))
+        self.assertEqual(bucket_floor(day, 'year'), date(2025, 1, 1))
+
+    def test_bucket_starts_cover_partial_buckets(self):
+        self.assertEqual(
+            bucket_starts(date(2024, 11, 15), date(2025, 2, 3), 'quarter'),
+            [date(2024, 10, 1), date(2025, 1, 1)],
+        )
+
+    def test_long_ranges_are_coarsened(self):
+        self.assertEqual(fit_trend_bucket(date(2024, 1, 1), date(2024, 3, 31), 'day'), 'day')
+        self.assertEqual(fit_trend_bucket(date(2022, 1, 1), date(2024, 12, 31), 'day'), 'month')
+        self.assertEqual(fit_trend_bucket(date(2000, 1, 1), date(2099, 12, 31), 'month'), 'year')
+
+
+class BucketedTrendTests(APITestCase):
+    def setUp(self):
+        clear_analytics_cache()
+        self.user = User.objects.create_user(username='trend', password='password')
+        self.client.force_authenticate(user=self.user)
+        for day, amount in [
+            (date(2023, 1, 10), '10.00'),
+            (date(2023, 2, 20), '15.00'),
+            (date(2024, 6, 5), '40.00'),
+            (date(2024, 6, 30), '2.50'),
+        ]:
+            Expense.objects.create(user=self.user, title='Item', amount=Decimal(amount), date=day)
+
+    def test_month_buckets_are_zero_filled(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/monthly-trend/', {'start': '2023-01', 'end': '2024-12'})
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(len(data), 24)
+        self.assertEqual(data[0]['period'], '2023-01')
+        self.assertEqual(data[0]['total'], 10.0)
+        self.assertEqual(data[2]['total'], 0)
+        self.assertEqual(data[17]['period'], '2024-06')
+        self.assertEqual(data[17]['total'], 42.5)
+        self.assertEqual(data[17]['count'], 2)
+        self.assertEqual(data[17]['smallest_expense'], 2.5)
+        self.assertEqual(response.data['summary']['grand_total'], 67.5)
+
+    def test_quarter_buckets_from_partial_range(self):
+        response = self.client.get('/api/analytics/monthly-trend/', {
+            'start': '2023-01-15', 'end': '2024-06-29', 'bucket': 'quarter',
+        })
+        data = response.data['data']
+        self.assertEqual([item['period'] for item in data][:2], ['2023-Q1', '2023-Q2'])
+        self.assertEqual(data[0]['start_date'], '2023-01-15')
+        self.assertEqual(data[0]['total'], 15.0)
+        self.assertEqual(data[-1]['end_date'], '2024-06-29')
+        self.assertEqual(data[-1]['total'], 40.0)
+
+    def test_long_day_range_is_downsampled(self):
+        response = self.client.get('/api/analytics/monthly-trend/', {
+            'start': '2022-01-01', 'end': '2024-12-31', 'bucket': 'day',
+        })
+        self.assertEqual(response.data['meta']['bucket_requested'], 'day')
+        self.assertEqual(response.data['meta']['bucket'], 'month')
+        self.assertLessEqual(len(response.data['data']), response.data['meta']['max_points'])
+
+    def test_invalid_parameters(self):
+        for params in ({'bucket': 'decade'}, {'start': '2024-13'}, {'start': '2025-01', 'end': '2024-01'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/analytics/monthly-trend/', params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_months_mode_is_unchanged(self):
+        response = self.client.get('/api/analytics/monthly-trend/', {'months': '3'})
+        self.assertEqual(response.data['meta']['months_requested'], 3)
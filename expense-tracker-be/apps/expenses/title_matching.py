@@ -0,0 +1,219 @@
+"""
+Fuzzy (trigram) matching of expense titles.
+
+Users spell the same bill slightly differently ("Meralco bill", "Meralco
+Bill Jan"), which exact matching of normalized titles treats as unrelated.
+Titles are compared by trigram similarity instead - the share of
+three-letter sequences two titles have in common:
+
+- On PostgreSQL through pg_trgm, backed by a GIN index on
+  (user_id, normalized_title gin_trgm_ops) created by migration 0015, so
+  lookups read only the candidate rows of one user
+- Elsewhere in process, over the user's distinct normalized titles, using
+  the same trigram rules as pg_trgm
+
+With settings.EXPENSE_TITLE_MATCHING = 'fuzzy', recurring detection and the
+recurring expense list treat titles at least EXPENSE_TITLE_SIMILARITY alike
+as one series. Title suggestions (search-as-you-type) are always fuzzy.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Count, Max
+
+from .helpers import normalize_title
+from .models import Expense
+
+
+TITLE_INDEX_NAME = 'expense_user_title_trgm_idx'
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def fuzzy_matching_enabled() -> bool:
+    """Whether detection and recurring grouping match titles fuzzily."""
+    return settings.EXPENSE_TITLE_MATCHING == 'fuzzy'
+
+
+def trigram_index_supported(alias: str) -> bool:
+    """Whether the database behind an alias has pg_trgm."""
+    return connections[alias].vendor == 'postgresql'
+
+
+def create_title_index(schema_editor) -> None:
+    """
+    Create the trigram index on expenses_expense (PostgreSQL only).
+
+    Like the search index it can't be declared in Expense.Meta; the
+    migration creates it through here (the partition conversion carries it
+    over from the catalog).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    qn = connection.ops.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(TITLE_INDEX_NAME)} ON {qn('expenses_expense')} "
+        f"USING gin ({qn('user_id')}, {qn('normalized_title')} gin_trgm_ops)"
+    )
+
+
+# =============================================================================
+# IN-PROCESS TRIGRAMS
+# =============================================================================
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Trigrams of a text the way pg_trgm builds them.
+
+    Every alphanumeric word is lowercased and padded with two spaces in
+    front and one behind ("bill" -> "  b", " bi", "bil", "ill", "ll ").
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Set[str]: Its trigrams
+    """
+    result = set()
+    for word in _WORD_RE.findall(text.casefold()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(first: str, second: str) -> float:
+    """Share of trigrams two texts have in common (pg_trgm's similarity())."""
+    first_trigrams, second_trigrams = trigrams(first), trigrams(second)
+    if not first_trigrams or not second_trigrams:
+        return 0.0
+    return len(first_trigrams & second_trigrams) / len(first_trigrams | second_trigrams)
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Share of a query's trigrams found in a text.
+
+    Approximates pg_trgm's word_similarity(), which also credits a query
+    matching only part of the text ("mer" in "meralco bill").
+    """
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return 0.0
+    return len(query_trigrams & trigrams(text)) / len(query_trigrams)
+
+
+def cluster_titles(titles: Iterable[str], threshold: Optional[float] = None) -> Dict[str, str]:
+    """
+    Group similar titles, each under the first title of its group.
+
+    Args:
+        titles: Normalized titles, most important first (e.g. by occurrences)
+        threshold: Minimum similarity (defaults to settings.EXPENSE_TITLE_SIMILARITY)
+
+    Returns:
+        Dict mapping every title to the title representing its group
+    """
+    threshold = settings.EXPENSE_TITLE_SIMILARITY if threshold is None else threshold
+    representatives: List[str] = []
+    groups = {}
+    for title in titles:
+        if title in groups:
+            continue
+        groups[title] = next(
+            (rep for rep in representatives if similarity(rep, title) >= threshold),
+            title,
+        )
+        if groups[title] == title:
+            representatives.append(title)
+    return groups
+
+
+# =============================================================================
+# LOOKUPS
+# =============================================================================
+
+def similar_titles(user, title: str, threshold: Optional[float] = None) -> List[str]:
+    """
+    Normalized titles of a user's expenses similar to a title (the exact one included).
+
+    Args:
+        user: Owner of the expenses
+        title: Title as entered
+        threshold: Minimum similarity (defaults to settings.EXPENSE_TITLE_SIMILARITY;
+            on PostgreSQL the index only returns candidates above pg_trgm's
+            similarity_threshold, 0.3 unless changed)
+
+    Returns:
+        List[str]: Matching normalized titles
+    """
+    threshold = settings.EXPENSE_TITLE_SIMILARITY if threshold is None else threshold
+    normalized = normalize_title(title)
+    if not normalized:
+        return []
+    expenses = Expense.objects.filter(user=user).order_by()
+
+    if trigram_index_supported(expenses.db):
+        # "%" is answered from the trigram index; the similarity re-check
+        # applies the configured threshold
+        matches = expenses.filter(normalized_title__trigram_similar=normalized).annotate(
+            title_similarity=TrigramSimilarity('normalized_title', normalized),
+        ).filter(title_similarity__gte=threshold)
+        return list(matches.values_list('normalized_title', flat=True).distinct())
+
+    candidates = expenses.values_list('normalized_title', flat=True).distinct()
+    return [candidate for candidate in candidates if similarity(candidate, normalized) >= threshold]
+
+
+def suggest_titles(user, query: str, limit: int = 10) -> List[dict]:
+    """
+    Titles a user has used before that match what they are typing.
+
+    Args:
+        user: Owner of the expenses
+        query: Partial title as typed
+        limit: Maximum number of suggestions
+
+    Returns:
+        List of {"title", "uses", "last_used", "similarity"} dicts, best
+        match first, then most used
+    """
+    normalized = normalize_title(query)
+    if not normalized:
+        return []
+    groups = Expense.objects.filter(user=user).order_by()
+
+    if trigram_index_supported(groups.db):
+        rows = groups.filter(normalized_title__trigram_word_similar=normalized).values('normalized_title').annotate(
+            display_title=Max('title'),
+            uses=Count('id'),
+            last_used=Max('date'),
+            match=Max(TrigramWordSimilarity(normalized, 'normalized_title')),
+        ).order_by('-match', '-uses', 'normalized_title')[:limit]
+        rows = list(rows)
+    else:
+        rows = [
+            {**row, 'match': word_similarity(normalized, row['normalized_title'])}
+            for row in groups.values('normalized_title').annotate(
+                display_title=Max('title'),
+                uses=Count('id'),
+                last_used=Max('date'),
+            )
+        ]
+        rows = sorted(
+            (row for row in rows if row['match'] >= settings.EXPENSE_TITLE_WORD_SIMILARITY),
+            key=lambda row: (-row['match'], -row['uses'], row['normalized_title']),
+        )[:limit]
+
+    return [
+        {
+            "title": row['display_title'],
+            "uses": row['uses'],
+            "last_used": row['last_used'],
+            "similarity": round(row['match'], 2),
+        }
+        for row in rows
+    ]
@@ -3,14 +3,18 @@ Views for the expenses app.
 """
 from datetime import date
 
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, filters
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from .cache import conditional_on_user_data
 from .models import Expense, Category, Budget
+from .search import FullTextSearchFilter
 from .serializers import ExpenseSerializer, CategorySerializer, BudgetSerializer
+from .snapshots import refresh_category_snapshots
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -32,13 +36,22 @@ class CategoryViewSet(viewsets.ModelViewSet):
         if self.request.user.is_authenticated:
             serializer.save(user=self.request.user)
 
+    def perform_update(self, serializer):
+        """Save the category and refresh its expenses' name/colour snapshot if either changed"""
+        previous = (serializer.instance.name, serializer.instance.color_code)
+        with transaction.atomic():
+            category = serializer.save()
+            if (category.name, category.color_code) != previous:
+                refresh_category_snapshots(category)
+
 
 class ExpenseViewSet(viewsets.ModelViewSet):
     """ViewSet for Expense model"""
     serializer_class = ExpenseSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = None
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Full-text search on PostgreSQL, ILIKE on search_fields elsewhere
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'date']
     search_fields = ['title', 'description']
     ordering_fields = ['date', 'amount', 'created_at']
@@ -46,9 +59,15 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Return expenses for the current user"""
         if self.request.user.is_authenticated:
-            return Expense.objects.filter(user=self.request.user)
+            # The search vector is only used inside the database
+            return Expense.objects.filter(user=self.request.user).defer('search_vector')
         return Expense.objects.none()
 
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        """List expenses, answering If-None-Match with 304 when nothing changed"""
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Save the expense with the current user and auto-detect recurring pattern"""
         # For demo purposes, we'll use the first user if not authenticated
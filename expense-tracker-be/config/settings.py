@@ -6,6 +6,7 @@ from pathlib import Path
 from decouple import config
 import os
 import socket
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -82,6 +84,14 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=config('POSTGRES_PASSWORD', default='postgres')),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5433'),
+        # Persistent connections: each worker thread keeps its connection
+        # for DB_CONN_MAX_AGE seconds instead of reconnecting per request
+        # (0 reconnects every request, None never expires). Health checks
+        # re-open a connection the server dropped in the meantime before
+        # the request uses it. A process holds at most one connection per
+        # request thread plus DASHBOARD_QUERY_WORKERS.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=lambda v: None if v == 'None' else int(v)),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
@@ -149,6 +159,124 @@ DATABASES = {
 #     }
 # }
 
+# Read replica
+# With DB_REPLICA_HOST set, GET requests of the dashboard, analytics,
+# export, recurring and budget alert endpoints read from this replica
+# (same credentials as the primary). A user's reads stay on the primary
+# for DB_REPLICA_PIN_SECONDS after they write - keep it above the usual
+# replication lag.
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['apps.expenses.db_routing.ReadReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica' if DB_REPLICA_HOST else None
+DATABASE_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Partition the expense table by year (PostgreSQL only). Applied by
+# migration 0010 when set at migrate time, or later with
+# `manage.py manage_expense_partitions --convert`.
+EXPENSE_PARTITIONING = config('EXPENSE_PARTITIONING', default=False, cast=bool)
+
+# Text search configuration of the expense full-text search (PostgreSQL);
+# changing it requires `manage.py rebuild_search_vectors`
+EXPENSE_SEARCH_CONFIG = config('EXPENSE_SEARCH_CONFIG', default='english')
+
+# Title matching of recurring detection and the recurring expense list:
+# 'exact' (normalized titles must be equal) or 'fuzzy' (trigram similarity
+# of at least EXPENSE_TITLE_SIMILARITY - keep it >= 0.3, pg_trgm's index
+# threshold). Title suggestions are always fuzzy; their in-process
+# fallback uses EXPENSE_TITLE_WORD_SIMILARITY like pg_trgm's word threshold.
+EXPENSE_TITLE_MATCHING = config('EXPENSE_TITLE_MATCHING', default='exact')
+EXPENSE_TITLE_SIMILARITY = config('EXPENSE_TITLE_SIMILARITY', default=0.5, cast=float)
+EXPENSE_TITLE_WORD_SIMILARITY = config('EXPENSE_TITLE_WORD_SIMILARITY', default=0.6, cast=float)
+
+# Expenses dated more than this many days ago are moved to the archive
+# table by `manage.py archive_expenses` (run it periodically, e.g. nightly).
+EXPENSE_ARCHIVE_AFTER_DAYS = config('EXPENSE_ARCHIVE_AFTER_DAYS', default=3 * 365, cast=int)
+
+# Background exports (POST /api/export/jobs/), generated by
+# `manage.py run_export_worker` into EXPORT_STORAGE_DIR - a directory the
+# API processes and the worker share. Finished files are kept for
+# EXPORT_JOB_TTL seconds; a user may have EXPORT_JOBS_PER_USER jobs queued
+# or running at once. Jobs running longer than EXPORT_JOB_TIMEOUT seconds
+# are considered abandoned by a stopped worker.
+EXPORT_STORAGE_DIR = config('EXPORT_STORAGE_DIR', default=str(BASE_DIR / 'exports'))
+EXPORT_JOB_TTL = config('EXPORT_JOB_TTL', default=24 * 3600, cast=int)
+EXPORT_JOBS_PER_USER = config('EXPORT_JOBS_PER_USER', default=2, cast=int)
+EXPORT_JOB_TIMEOUT = config('EXPORT_JOB_TIMEOUT', default=3600, cast=int)
+
+# PDF reports of EXPORT_PDF_PARALLEL_ROWS expenses or more are laid out by
+# up to EXPORT_PDF_WORKERS processes (never more than the CPU count; needs
+# pypdf). 1 renders every report in the exporting process.
+EXPORT_PDF_WORKERS = config('EXPORT_PDF_WORKERS', default=4, cast=int)
+EXPORT_PDF_PARALLEL_ROWS = config('EXPORT_PDF_PARALLEL_ROWS', default=20000, cast=int)
+
+# Cache
+# Analytics responses are cached under keys that embed the user's data
+# version, so a payload cache needn't be shared: by default each process
+# keeps its own bounded LRU (LocMemCache). Redis works too
+# (django.core.cache.backends.redis.RedisCache, with an allkeys-lru
+# maxmemory policy).
+#
+# The data versions themselves (cache keys and ETags) and the read-replica
+# pins must be seen by every process and must never be evicted - a culled
+# version is reseeded and a culled pin sends reads to a lagging replica.
+# They live in their own cache: by default the analytics_state database
+# table (run `manage.py createcachetable`), which is never culled.
+ANALYTICS_CACHE_BACKEND = config('ANALYTICS_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+ANALYTICS_STATE_CACHE_BACKEND = config(
+    'ANALYTICS_STATE_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analytics': {
+        'BACKEND': ANALYTICS_CACHE_BACKEND,
+        'LOCATION': config('ANALYTICS_CACHE_LOCATION', default='analytics'),
+    },
+    'analytics_state': {
+        'BACKEND': ANALYTICS_STATE_CACHE_BACKEND,
+        'LOCATION': config('ANALYTICS_STATE_CACHE_LOCATION', default='analytics_state'),
+        'TIMEOUT': None,
+    },
+}
+
+if ANALYTICS_CACHE_BACKEND.endswith(('LocMemCache', 'FileBasedCache', 'DatabaseCache')):
+    CACHES['analytics']['OPTIONS'] = {
+        'MAX_ENTRIES': config('ANALYTICS_CACHE_MAX_ENTRIES', default=5000, cast=int),
+    }
+if ANALYTICS_STATE_CACHE_BACKEND.endswith(('LocMemCache', 'FileBasedCache', 'DatabaseCache')):
+    # One version per user plus short-lived pins - culling by key order
+    # would drop live entries, so it is effectively switched off
+    CACHES['analytics_state']['OPTIONS'] = {'MAX_ENTRIES': sys.maxsize}
+
+# Gunicorn worker processes (gunicorn reads WEB_CONCURRENCY itself). A
+# process-local state cache can't tell the other workers about a write,
+# so with more than one worker analytics caching is switched off:
+# responses are not cached, carry no ETag and every read goes to the
+# primary.
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+ANALYTICS_CACHE_ENABLED = (
+    WEB_CONCURRENCY <= 1 or not ANALYTICS_STATE_CACHE_BACKEND.endswith(('LocMemCache', 'DummyCache'))
+)
+
+ANALYTICS_CACHE_ALIAS = 'analytics'
+ANALYTICS_STATE_CACHE_ALIAS = 'analytics_state'
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Dashboard queries
+# Independent dashboard queries run on a shared pool of this many threads,
+# each holding its own database connection while it works. 1 disables it.
+DASHBOARD_QUERY_WORKERS = config('DASHBOARD_QUERY_WORKERS', default=4, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,64 @@
+"""
+Settings for running the test suite without PostgreSQL.
+
+Two SQLite databases stand in for the primary and the read replica:
+
+    python manage.py test --settings=config.test_settings
+
+The replica is a separate database here (not a test mirror), so the
+routing tests can tell which database a read went to. Replica routing is
+only switched on by the tests that exercise it
+(override_settings(DATABASE_REPLICA_ALIAS='replica')); every other test
+reads and writes the primary.
+
+With TEST_DATABASE=postgresql both are databases on the PostgreSQL
+server from the DB_* settings instead, so the PostgreSQL-only tests
+(partitioning, full-text and trigram search) run too; CI runs the suite
+both ways.
+
+The test run is one process, so the analytics state cache (data versions
+and replica pins) stays in local memory (and out of the query counts);
+the tests of the shared database cache switch to it with
+override_settings.
+"""
+import tempfile
+from pathlib import Path
+
+from decouple import config
+
+from .settings import *  # noqa: F401,F403
+
+# Outside the source tree, so no run leaves database files behind in it
+TEST_DATABASE_DIR = Path(tempfile.gettempdir())
+
+PRIMARY_DATABASE = DATABASES['default']  # noqa: F405
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': TEST_DATABASE_DIR / 'expense-tracker-test-primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': TEST_DATABASE_DIR / 'expense-tracker-test-replica.sqlite3',
+    },
+}
+
+if config('TEST_DATABASE', default='sqlite') == 'postgresql':
+    DATABASES = {
+        'default': PRIMARY_DATABASE,
+        'replica': {**PRIMARY_DATABASE, 'NAME': f"{PRIMARY_DATABASE['NAME']}_replica"},
+    }
+
+DATABASE_REPLICA_ALIAS = None
+
+CACHES['analytics'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'analytics',
+}
+CACHES['analytics_state'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'analytics_state',
+    'TIMEOUT': None,
+}
+ANALYTICS_CACHE_ENABLED = True
@@ -10,10 +10,14 @@ from apps.expenses.dashboard_views import (
     CategoryBreakdownView,
     WeeklySpendingView,
     MonthlyTrendView,
+    SpendingHeatmapView,
+    DashboardBundleView,
 )
 from apps.expenses.export_views import ExportExpensesView
+from apps.expenses.export_job_views import ExportJobDetailView, ExportJobDownloadView, ExportJobListView
 from apps.expenses.budget_alerts_view import BudgetAlertsView
 from apps.expenses.recurring_views import RecurringExpenseListView
+from apps.expenses.suggestion_views import TitleSuggestionView
 
 router = routers.DefaultRouter()
 router.register(r'expenses', ExpenseViewSet, basename='expense')
@@ -25,20 +29,26 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('apps.authentication.urls')),  # non-router views
     path('api/expenses/recurring/', RecurringExpenseListView.as_view(), name='recurring-expenses'),
+    path('api/expenses/title-suggestions/', TitleSuggestionView.as_view(), name='expense-title-suggestions'),
     path('api/', include(router.urls)),
     path('api/stub/expenses/', StubExpenseView.as_view(), name='stub-expenses'),
     
     # Dashboard
     path('api/dashboard/summary/', DashboardSummaryView.as_view(), name='dashboard-summary'),
+    path('api/dashboard/bundle/', DashboardBundleView.as_view(), name='dashboard-bundle'),
     
     # Analytics (Charts)
     path('api/analytics/category-breakdown/', CategoryBreakdownView.as_view(), name='analytics-category-breakdown'),
     path('api/analytics/weekly-spending/', WeeklySpendingView.as_view(), name='analytics-weekly-spending'),
     path('api/analytics/monthly-trend/', MonthlyTrendView.as_view(), name='analytics-monthly-trend'),
+    path('api/analytics/heatmap/', SpendingHeatmapView.as_view(), name='analytics-heatmap'),
 
     
     # Export
     path('api/export/', ExportExpensesView.as_view(), name='export-expenses'),
+    path('api/export/jobs/', ExportJobListView.as_view(), name='export-jobs'),
+    path('api/export/jobs/<int:pk>/', ExportJobDetailView.as_view(), name='export-job-detail'),
+    path('api/export/jobs/<int:pk>/download/', ExportJobDownloadView.as_view(), name='export-job-download'),
 
     # Alerts
     path('api/alerts/budget/', BudgetAlertsView.as_view(), name='budget-alerts'),